@@ -1,10 +1,15 @@
 """Overture STAC - Generate STAC catalogs for Overture Maps public releases."""
 
-from importlib.metadata import version
-
 from overture_stac.overture_stac import OvertureRelease
 from overture_stac.registry_manifest import RegistryManifest
 
-__version__ = version("overture-stac")
-
 __all__ = ["OvertureRelease", "RegistryManifest"]
+
+
+def __getattr__(name: str):
+    # Resolved on first use; importlib.metadata is slow to import.
+    if name == "__version__":
+        from importlib.metadata import version
+
+        return version("overture-stac")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,85 @@
+"""Hive-partitioned stac-geoparquet dataset spanning every published release."""
+
+from __future__ import annotations
+
+import logging
+
+from overture_stac.lazy import lazy_import
+from overture_stac.writer import CatalogWriter
+
+fs = lazy_import("pyarrow.fs")
+pystac = lazy_import("pystac")
+stac_geoparquet = lazy_import("stac_geoparquet")
+
+ALL_RELEASES_DIRNAME = "all_releases"
+
+
+def partition_path(release: str, collection: str) -> str:
+    """Path of one (release, collection) partition file, relative to the root."""
+    return f"{ALL_RELEASES_DIRNAME}/release={release}/collection={collection}/part-0.parquet"
+
+
+def write_release_partitions(
+    writer: CatalogWriter,
+    release: str,
+    type_collections: dict[str, list[pystac.Item]],
+) -> int:
+    """
+    Write one partition per collection of ``release`` under ``all_releases/``.
+
+    Partitions of other releases are left alone, and the writer skips any
+    partition whose content matches the previous build, so adding a release
+    touches only its own files.
+
+    Returns:
+        int: Number of partitions queued
+    """
+    written = 0
+    for collection, items in sorted(type_collections.items()):
+        if not items:
+            continue
+        writer.write_parquet(
+            partition_path(release, collection),
+            stac_geoparquet.arrow.parse_stac_items_to_arrow(items),
+        )
+        written += 1
+    return written
+
+
+def prune_release_partitions(
+    writer: CatalogWriter, release_ids: list[str]
+) -> list[str]:
+    """
+    Remove the partitions of releases no longer in ``release_ids``.
+
+    Returns:
+        list: Release ids whose partitions were removed
+    """
+    logger = logging.getLogger("pystac")
+
+    # Partitions on disk, plus those only known from the previous run's hashes.
+    partitions = {
+        rel_path.split("/")[1]
+        for rel_path in writer.previous_hashes or {}
+        if rel_path.startswith(f"{ALL_RELEASES_DIRNAME}/release=")
+    }
+    root = writer.path(ALL_RELEASES_DIRNAME)
+    if writer.filesystem.get_file_info(root).type == fs.FileType.Directory:
+        partitions.update(
+            info.path.rstrip("/").split("/")[-1]
+            for info in writer.filesystem.get_file_info(fs.FileSelector(root))
+            if info.type == fs.FileType.Directory
+        )
+
+    current = set(release_ids)
+    pruned = []
+    for name in sorted(partitions):
+        release = name.removeprefix("release=")
+        if name == release or release in current:
+            continue
+        writer.remove_dir(f"{ALL_RELEASES_DIRNAME}/{name}")
+        pruned.append(release)
+
+    if pruned:
+        logger.info(f"Pruned {ALL_RELEASES_DIRNAME} partitions of {pruned}")
+    return pruned
@@ -0,0 +1,70 @@
+"""Per-type build checkpoints so an interrupted release build can resume."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from typing import Optional
+
+from overture_stac.lazy import lazy_import
+from overture_stac.writer import OBJECT_STORE_TYPES, CatalogWriter
+
+fs = lazy_import("pyarrow.fs")
+
+CHECKPOINTS_DIRNAME = ".checkpoints"
+
+
+class CheckpointStore:
+    """
+    Gzipped JSON checkpoints at ``<base_path>/<theme>/<type>.json.gz``.
+
+    Each checkpoint appears atomically: local files are written to a
+    temporary sibling and renamed into place, and object stores only expose
+    an object once its upload completes. The store only holds a filesystem
+    and a path, so it can be handed to worker processes.
+    """
+
+    def __init__(self, filesystem: fs.FileSystem, base_path: str):
+        self.filesystem = filesystem
+        self.base_path = base_path.rstrip("/")
+
+    @classmethod
+    def for_release(cls, writer: CatalogWriter, release: str) -> "CheckpointStore":
+        """Checkpoints of ``release``, kept under the writer's output root."""
+        return cls(writer.filesystem, writer.path(f"{CHECKPOINTS_DIRNAME}/{release}"))
+
+    def path(self, theme: str, type_name: str) -> str:
+        return f"{self.base_path}/{theme}/{type_name}.json.gz"
+
+    def load(self, theme: str, type_name: str) -> Optional[dict]:
+        """Return the checkpoint for ``theme``/``type_name``, or None if absent."""
+        path = self.path(theme, type_name)
+        if self.filesystem.get_file_info(path).type != fs.FileType.File:
+            return None
+        with self.filesystem.open_input_stream(path, compression=None) as f:
+            return json.loads(gzip.decompress(f.read()))
+
+    def save(self, theme: str, type_name: str, payload: dict) -> None:
+        """Atomically write the checkpoint for ``theme``/``type_name``."""
+        path = self.path(theme, type_name)
+        data = gzip.compress(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8"), mtime=0
+        )
+        if self.filesystem.type_name in OBJECT_STORE_TYPES:
+            with self.filesystem.open_output_stream(path, compression=None) as f:
+                f.write(data)
+            return
+
+        self.filesystem.create_dir(path.rsplit("/", 1)[0], recursive=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with self.filesystem.open_output_stream(tmp_path, compression=None) as f:
+            f.write(data)
+        self.filesystem.move(tmp_path, path)
+
+    def clear(self) -> None:
+        """Delete every checkpoint in this store, once the build has been saved."""
+        if self.filesystem.get_file_info(self.base_path).type == fs.FileType.Directory:
+            self.filesystem.delete_dir(self.base_path)
+            logging.getLogger("pystac").info(f"Cleared checkpoints in {self.base_path}")
@@ -1,36 +1,668 @@
 """Command-line interface for generating STAC catalogs."""
 
+from __future__ import annotations
+
 import argparse
+import json
+import os
 import re
-from pathlib import Path
-
-import pyarrow.fs as fs
-import pystac
+import sys
+from typing import Optional
 
+from overture_stac.all_releases import prune_release_partitions
+from overture_stac.checkpoint import CHECKPOINTS_DIRNAME
+from overture_stac.consistency import (
+    CONSISTENCY_READ_WORKERS,
+    check_release,
+    list_saved_releases,
+    log_consistency,
+)
+from overture_stac.diff import add_changes_link, changeset_document, diff_releases
+from overture_stac.discovery import Discovery
+from overture_stac.item_pages import DEFAULT_ITEM_PAGE_SIZE
+from overture_stac.lazy import lazy_import
 from overture_stac.overture_stac import (
+    EXECUTORS,
+    FOOTER_FETCH_WORKERS,
+    OUTPUT_PROFILES,
+    ROW_GROUP_INDEX_MODES,
     OvertureRelease,
     build_root_catalog,
     link_neighbor_releases,
-    list_release_ids,
+    make_worker_pool,
+)
+from overture_stac.pgstac_export import PGSTAC_EXPORT_FORMATS
+from overture_stac.pipeline import PIPELINE_STAGES
+from overture_stac.query import ASSET_HREF_FIELDS, collections_href, query_collections
+from overture_stac.sharding import (
+    load_plan,
+    make_plan,
+    merge_partials,
+    parse_shard,
+    run_shard,
+    write_plan,
+)
+from overture_stac.tile_index import MAX_TILE_INDEX_ZOOM
+from overture_stac.validate import (
+    ValidationReport,
+    log_report,
+    validate_catalog,
+    validate_output,
+    validate_records,
+    vendor_schemas,
 )
-from overture_stac.registry_manifest import RegistryManifest
+from overture_stac.writer import (
+    PRECOMPRESS_ENCODINGS,
+    CatalogWriter,
+    is_object_store_uri,
+    load_previous_hashes,
+    resolve_output,
+)
+
+fs = lazy_import("pyarrow.fs")
 
 PROD_ROOT_HREF = "https://stac.overturemaps.org"
 REGISTRY_S3_PATH = "s3://overturemaps-us-west-2/registry"
 
 
-def main():
-    """Main entry point for the CLI."""
+def query(argv: list[str]) -> None:
+    """`gen-stac query`: print the hrefs of fragments intersecting a bbox."""
+    parser = argparse.ArgumentParser(
+        prog="gen-stac query",
+        description=(
+            "Print the hrefs of a release's fragments that intersect a bbox, "
+            "read from its collections.parquet."
+        ),
+    )
+    parser.add_argument(
+        "--bbox",
+        nargs=4,
+        type=float,
+        required=True,
+        metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
+        help="Area of interest in WGS84 degrees",
+    )
+    parser.add_argument(
+        "--type",
+        nargs="+",
+        default=None,
+        help="Only return fragments of these Overture types (e.g. building)",
+    )
+    parser.add_argument(
+        "--release",
+        type=str,
+        required=True,
+        help="Release to query (e.g. 2026-05-20.0)",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        default=PROD_ROOT_HREF,
+        help=(
+            "Root of the generated catalog: a local directory, pyarrow filesystem "
+            f"URI or HTTP(S) URL (default: {PROD_ROOT_HREF})"
+        ),
+    )
+    parser.add_argument(
+        "--asset",
+        choices=sorted(ASSET_HREF_FIELDS),
+        default="aws",
+        help="Which href to print: aws/azure HTTPS or the s3:// URI (default: aws)",
+    )
+    args = parser.parse_args(argv)
+
+    xmin, ymin, xmax, ymax = args.bbox
+    if xmin > xmax or ymin > ymax:
+        parser.error(
+            "--bbox must be XMIN YMIN XMAX YMAX with XMIN <= XMAX, YMIN <= YMAX"
+        )
+
+    result = query_collections(
+        collections_href(args.catalog, args.release),
+        args.bbox,
+        types=args.type,
+        asset=args.asset,
+    )
+    sys.stdout.write("".join(f"{href}\n" for href in result.column("href").to_pylist()))
+
+
+def diff(argv: list[str]) -> None:
+    """`gen-stac diff`: summarize what changed between two releases."""
     parser = argparse.ArgumentParser(
-        description="Generate a STAC Index for Overture Maps Data from the public release bucket."
+        prog="gen-stac diff",
+        description=(
+            "Join two releases' collections.parquet by collection and id and "
+            "print a per-type summary of added, removed and changed fragments."
+        ),
+    )
+    parser.add_argument("release_a", help="Older release (e.g. 2026-04-15.0)")
+    parser.add_argument("release_b", help="Newer release (e.g. 2026-05-20.0)")
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        default=PROD_ROOT_HREF,
+        help=(
+            "Root of the generated catalog: a local directory, pyarrow filesystem "
+            f"URI or HTTP(S) URL (default: {PROD_ROOT_HREF})"
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Also write the full changeset (per-fragment row and bbox changes) as JSON",
+    )
+    args = parser.parse_args(argv)
+
+    changes, summary = diff_releases(
+        collections_href(args.catalog, args.release_a),
+        collections_href(args.catalog, args.release_b),
     )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                changeset_document(args.release_a, args.release_b, changes, summary),
+                f,
+            )
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
 
+
+def _add_output_args(parser: argparse.ArgumentParser) -> None:
+    """Options for where and how the catalog is written, shared with `merge`."""
     parser.add_argument(
         "--output",
         type=str,
         default="public_releases",
-        help="Output path for Catalog",
+        help=(
+            "Output path for Catalog. Either a local directory or a pyarrow "
+            "filesystem URI (e.g. s3://bucket/prefix) to write to directly."
+        ),
+    )
+    parser.add_argument(
+        "--root-href",
+        type=str,
+        default=PROD_ROOT_HREF,
+        help=(
+            "Public root URL the catalog will be hosted at, used to build absolute "
+            f"'self' links (default: {PROD_ROOT_HREF}). Override for staging/testing, "
+            "e.g. https://staging.overturemaps.org/stac/pr/123."
+        ),
+    )
+    parser.add_argument(
+        "--tile-index-zooms",
+        nargs="+",
+        type=int,
+        default=None,
+        help=(
+            "Write a static quadkey index (<release>/tiles/<zoom>/<quadkey>.json) "
+            "mapping each tile to the fragments covering it, per type, at these "
+            f"zoom levels (1-{MAX_TILE_INDEX_ZOOM}, e.g. 2 4 6; default: off)"
+        ),
+    )
+    parser.add_argument(
+        "--item-page-size",
+        type=int,
+        default=None,
+        help=(
+            "Also write each collection's items as paginated FeatureCollections "
+            "(<collection>/items/page-N.json, linked by next/prev) of up to this "
+            f"many items, like a static STAC API /items (e.g. {DEFAULT_ITEM_PAGE_SIZE}; "
+            "default: off)"
+        ),
+    )
+    parser.add_argument(
+        "--pgstac-export",
+        choices=sorted(PGSTAC_EXPORT_FORMATS),
+        default=None,
+        help=(
+            "Also stream each release's collections and items into "
+            "<release>/pgstac/collections.ndjson and items.ndjson for "
+            "'pypgstac load', plain or zstd-compressed (.ndjson.zst) "
+            "(default: off)"
+        ),
     )
+    parser.add_argument(
+        "--all-releases",
+        action="store_true",
+        default=False,
+        help=(
+            "Also maintain all_releases/, a Hive-partitioned stac-geoparquet "
+            "dataset (release=/collection=) spanning every current release"
+        ),
+    )
+    parser.add_argument(
+        "--changes",
+        action="store_true",
+        default=False,
+        help=(
+            "Write <release>/changes.json against the previous release's published "
+            "collections.parquet under --root-href and link it from the release catalog"
+        ),
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        default=False,
+        help=(
+            "Validate every catalog, collection and item written against the "
+            "vendored JSON schemas, on --workers processes, and exit with an "
+            "error if any is invalid (see gen-stac validate)"
+        ),
+    )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        default=16,
+        help="Number of concurrent output file writes/uploads (default: 16)",
+    )
+    parser.add_argument(
+        "--precompress",
+        nargs="+",
+        choices=sorted(PRECOMPRESS_ENCODINGS),
+        default=[],
+        help=(
+            "Also write precompressed sidecars (.gz / .br) for every JSON output. "
+            "On object stores they carry the matching Content-Encoding metadata."
+        ),
+    )
+    parser.add_argument(
+        "--previous-hashes",
+        type=str,
+        default=None,
+        help=(
+            "Path or URL of a prior run's content-hashes.json. Files whose content "
+            "hash matches are left out of changed-paths.txt even when --output "
+            "starts empty (e.g. https://stac.overturemaps.org/content-hashes.json). "
+            "Required when --output is an object store, which is never read back."
+        ),
+    )
+
+
+def _check_output_args(parser: argparse.ArgumentParser, args) -> None:
+    if args.tile_index_zooms and not all(
+        1 <= zoom <= MAX_TILE_INDEX_ZOOM for zoom in args.tile_index_zooms
+    ):
+        parser.error(f"--tile-index-zooms must be between 1 and {MAX_TILE_INDEX_ZOOM}")
+    if args.item_page_size is not None and args.item_page_size < 1:
+        parser.error("--item-page-size must be at least 1")
+    if is_object_store_uri(args.output) and not args.previous_hashes:
+        parser.error("--previous-hashes is required when --output is an object store")
+
+
+def _make_writer(args) -> CatalogWriter:
+    return CatalogWriter(
+        args.output,
+        max_workers=args.upload_workers,
+        precompress=tuple(args.precompress),
+        previous_hashes=(
+            load_previous_hashes(args.previous_hashes) if args.previous_hashes else None
+        ),
+    )
+
+
+def _validate_release_args(parser: argparse.ArgumentParser, args) -> None:
+    if args.release and not args.schema_version:
+        parser.error("--schema-version is required when --release is provided")
+
+    if args.release and not re.fullmatch(r"\d{4}-\d{2}-\d{2}\.\d+", args.release):
+        parser.error("--release must be in format YYYY-MM-DD.N (e.g. 2026-05-20.0)")
+
+    if args.schema_version and not re.fullmatch(r"\d+\.\d+\.\d+", args.schema_version):
+        parser.error("--schema-version must be in format X.Y.Z (e.g. 1.17.0)")
+
+
+def _parse_stage_concurrency(
+    parser: argparse.ArgumentParser, values: list[str]
+) -> dict[str, int]:
+    """Parse ``--stage-concurrency`` ``STAGE=N`` values into workers per stage."""
+    concurrency = {}
+    for value in values:
+        stage, _, workers = value.partition("=")
+        if stage not in PIPELINE_STAGES[1:] or not workers.isdigit() or workers == "0":
+            parser.error(
+                f"--stage-concurrency expects STAGE=N with N >= 1 and STAGE one of "
+                f"{', '.join(PIPELINE_STAGES[1:])}, got {value!r}"
+            )
+        concurrency[stage] = int(workers)
+    return concurrency
+
+
+def plan(argv: list[str]) -> None:
+    """`gen-stac plan`: list fragments once and split the build into shards."""
+    parser = argparse.ArgumentParser(
+        prog="gen-stac plan",
+        description=(
+            "List every type's fragments and write a plan that splits them into "
+            "balanced shards for `gen-stac run --shard i/N`."
+        ),
+    )
+    parser.add_argument(
+        "--shards", type=int, required=True, help="Number of shards (N)"
+    )
+    parser.add_argument(
+        "--plan",
+        type=str,
+        required=True,
+        help="Where to write the plan: a local path or pyarrow filesystem URI",
+    )
+    parser.add_argument(
+        "--release",
+        type=str,
+        default=None,
+        help="Release to plan (e.g. 2026-05-20.0). When omitted, all releases are planned.",
+    )
+    parser.add_argument(
+        "--schema-version",
+        type=str,
+        default=None,
+        help="Schema version for the release (e.g. 1.17.0). Required when --release is provided.",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        default=False,
+        help="Only plan the first 3 fragments of each type",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=OUTPUT_PROFILES,
+        default="full",
+        help="Output profile (default: full)",
+    )
+    parser.add_argument(
+        "--row-group-index",
+        choices=ROW_GROUP_INDEX_MODES,
+        default=None,
+        help="Record per-row-group bboxes, see gen-stac --help (default: off)",
+    )
+    args = parser.parse_args(argv)
+    _validate_release_args(parser, args)
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+
+    filesystem = fs.S3FileSystem(anonymous=True, region="us-west-2")
+    discovery = Discovery(filesystem, release=args.release)
+    release_ids = discovery.release_ids
+    if args.release:
+        releases = [
+            {
+                "release": args.release,
+                "schema": args.schema_version,
+                "title": f"{args.release} Overture Release",
+                "latest": False,
+            }
+        ]
+    else:
+        releases = [
+            {
+                "release": release,
+                "schema": None,
+                "title": (
+                    f"{release} Overture Release"
+                    if idx > 0
+                    else "Latest Overture Release"
+                ),
+                "latest": idx == 0,
+            }
+            for idx, release in enumerate(release_ids)
+        ]
+
+    write_plan(
+        args.plan,
+        make_plan(
+            releases,
+            args.shards,
+            filesystem,
+            release_ids,
+            registry={
+                "path": REGISTRY_S3_PATH,
+                "manifest": discovery.registry_manifest,
+            },
+            discovery=discovery,
+            full=not args.release,
+            debug=args.debug,
+            profile=args.profile,
+            row_group_index=args.row_group_index,
+        ),
+    )
+
+
+def run(argv: list[str]) -> None:
+    """`gen-stac run`: build one shard of a plan into partials."""
+    parser = argparse.ArgumentParser(
+        prog="gen-stac run",
+        description="Build one shard of a `gen-stac plan` and write its partials.",
+    )
+    parser.add_argument(
+        "--plan", type=str, required=True, help="Plan written by gen-stac plan"
+    )
+    parser.add_argument(
+        "--shard",
+        type=str,
+        required=True,
+        metavar="I/N",
+        help="Which shard to build, 0-based (e.g. 0/8)",
+    )
+    parser.add_argument(
+        "--partials",
+        type=str,
+        required=True,
+        help=(
+            "Where shards write their partials, shared by all shards: a local "
+            "directory or pyarrow filesystem URI (e.g. s3://bucket/partials)"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=FOOTER_FETCH_WORKERS,
+        help=f"Threads to read footers on (default: {FOOTER_FETCH_WORKERS})",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        index, count = parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+    build_plan = load_plan(args.plan)
+    if count != build_plan["shards"]:
+        parser.error(f"--shard N must match the plan's {build_plan['shards']} shards")
+
+    partials_filesystem, partials_path = resolve_output(args.partials)
+    run_shard(
+        build_plan,
+        index,
+        partials_filesystem,
+        partials_path,
+        fs.S3FileSystem(anonymous=True, region="us-west-2"),
+        args.workers,
+    )
+
+
+def merge(argv: list[str]) -> None:
+    """`gen-stac merge`: assemble the catalog from every shard's partials."""
+    parser = argparse.ArgumentParser(
+        prog="gen-stac merge",
+        description=(
+            "Assemble the release catalogs, manifest.geojson and "
+            "collections.parquet from the partials of every shard of a plan."
+        ),
+    )
+    parser.add_argument(
+        "--plan", type=str, required=True, help="Plan written by gen-stac plan"
+    )
+    parser.add_argument(
+        "--partials",
+        type=str,
+        required=True,
+        help="Where the shards wrote their partials",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of --validate processes (default: one per CPU)",
+    )
+    _add_output_args(parser)
+    args = parser.parse_args(argv)
+    _check_output_args(parser, args)
+
+    root_href = args.root_href.rstrip("/")
+    partials_filesystem, partials_path = resolve_output(args.partials)
+    merge_partials(
+        load_plan(args.plan),
+        partials_filesystem,
+        partials_path,
+        _make_writer(args),
+        root_href,
+        tile_index_zooms=args.tile_index_zooms,
+        item_page_size=args.item_page_size,
+        pgstac_export=args.pgstac_export,
+        all_releases=args.all_releases,
+        changes=args.changes,
+    )
+    if args.validate:
+        # The releases are assembled one at a time, so validate what was written
+        _exit_on_invalid(validate_output(args.output, args.workers))
+
+
+def _exit_on_invalid(report: ValidationReport) -> None:
+    """Log a validation report, exiting with an error if anything was invalid."""
+    log_report(report)
+    if report.errors:
+        sys.exit(1)
+
+
+def validate(argv: list[str]) -> None:
+    """`gen-stac validate`: validate every STAC object of a catalog, offline."""
+    parser = argparse.ArgumentParser(
+        prog="gen-stac validate",
+        description=(
+            "Validate every catalog, collection and item under a catalog "
+            "against the vendored STAC core and extension JSON schemas, in "
+            "parallel and without network access."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="public_releases",
+        help="Catalog to validate: a local directory or pyarrow filesystem URI",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of validation processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=50,
+        help="Most errors to print (default: 50)",
+    )
+    parser.add_argument(
+        "--update-schemas",
+        metavar="SCHEMA_DIR",
+        type=str,
+        default=None,
+        help=(
+            "Download the schemas into SCHEMA_DIR instead, then exit; "
+            "src/overture_stac/schemas in a checkout"
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    if args.update_schemas:
+        for path in vendor_schemas(args.update_schemas):
+            sys.stdout.write(f"{path}\n")
+        return
+
+    report = validate_output(args.output, args.workers)
+    log_report(report, args.max_errors)
+    if report.errors:
+        sys.exit(1)
+
+
+def check(argv: list[str]) -> None:
+    """`gen-stac check`: cross-check each release's outputs against each other."""
+    parser = argparse.ArgumentParser(
+        prog="gen-stac check",
+        description=(
+            "Check that the item JSON, manifest.geojson and collections.parquet "
+            "of each release list the same fragments with the same bboxes, row "
+            "counts and paths, and that each collection's table:row_count is "
+            "the sum of its items' num_rows."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="public_releases",
+        help="Catalog to check: a local directory or pyarrow filesystem URI",
+    )
+    parser.add_argument(
+        "--release",
+        action="append",
+        default=None,
+        help="Release to check; repeat for several (default: every release)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=CONSISTENCY_READ_WORKERS,
+        help=(
+            "Threads reading item and collection files "
+            f"(default: {CONSISTENCY_READ_WORKERS})"
+        ),
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=50,
+        help="Most discrepancies to print per release (default: 50)",
+    )
+    args = parser.parse_args(argv)
+
+    releases = args.release or list_saved_releases(args.output)
+    if not releases:
+        parser.error(f"No releases found under {args.output}")
+
+    consistent = True
+    for release in releases:
+        report = check_release(args.output, release, args.workers)
+        log_consistency(report, args.max_errors)
+        consistent = consistent and report.discrepancies.num_rows == 0
+    if not consistent:
+        sys.exit(1)
+
+
+SUBCOMMANDS = {
+    "query": query,
+    "diff": diff,
+    "plan": plan,
+    "run": run,
+    "merge": merge,
+    "validate": validate,
+    "check": check,
+}
+
+
+def main(argv: Optional[list[str]] = None):
+    """Main entry point for the CLI."""
+    argv = sys.argv[1:] if argv is None else argv
+    # Subcommands are dispatched by name so `gen-stac --output ...` keeps working.
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Generate a STAC Index for Overture Maps Data from the public release bucket.",
+        epilog=(
+            f"Other commands: {', '.join(SUBCOMMANDS)} (see gen-stac <command> --help)."
+        ),
+    )
+    _add_output_args(parser)
 
     parser.add_argument(
         "--debug",
@@ -46,6 +678,29 @@ def main():
         help="Number of parallel workers (default: 4)",
     )
 
+    parser.add_argument(
+        "--executor",
+        choices=EXECUTORS,
+        default="processes",
+        help=(
+            "Run themes on a process pool, or in one process on threads or "
+            "asyncio tasks that share one S3 filesystem and fetch footers on a "
+            "bounded thread pool, or as a staged asyncio pipeline "
+            "(default: processes)"
+        ),
+    )
+
+    parser.add_argument(
+        "--stage-concurrency",
+        nargs="+",
+        default=[],
+        metavar="STAGE=N",
+        help=(
+            "Workers per stage of --executor pipeline, e.g. footers=64 render=2 "
+            f"(stages: {', '.join(PIPELINE_STAGES[1:])})"
+        ),
+    )
+
     parser.add_argument(
         "--release",
         type=str,
@@ -61,102 +716,190 @@ def main():
     )
 
     parser.add_argument(
-        "--root-href",
-        type=str,
-        default=PROD_ROOT_HREF,
+        "--profile",
+        choices=OUTPUT_PROFILES,
+        default="full",
         help=(
-            "Public root URL the catalog will be hosted at, used to build absolute "
-            f"'self' links (default: {PROD_ROOT_HREF}). Override for staging/testing, "
-            "e.g. https://staging.overturemaps.org/stac/pr/123."
+            "Output profile. 'compact' declares storage schemes and shared asset "
+            "metadata once per collection instead of on every item (default: full)"
+        ),
+    )
+
+    parser.add_argument(
+        "--row-group-index",
+        choices=ROW_GROUP_INDEX_MODES,
+        default=None,
+        help=(
+            "Record per-row-group bboxes and row offsets from the footer's bbox "
+            "statistics, either as a 'row_groups' item property or in a "
+            "row-groups.parquet index per release (default: off)"
+        ),
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help=(
+            "Reuse the per-type checkpoints an interrupted build left under "
+            f"--output ({CHECKPOINTS_DIRNAME}/<release>/) instead of rebuilding "
+            "those types"
         ),
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Normalize to no trailing slash so downstream f"{root_href}/..." hrefs
     # always join with exactly one slash, regardless of user input.
     root_href = args.root_href.rstrip("/")
 
-    if args.release and not args.schema_version:
-        parser.error("--schema-version is required when --release is provided")
+    _validate_release_args(parser, args)
+    _check_output_args(parser, args)
 
-    if args.release and not re.fullmatch(r"\d{4}-\d{2}-\d{2}\.\d+", args.release):
-        parser.error("--release must be in format YYYY-MM-DD.N (e.g. 2026-05-20.0)")
+    stage_concurrency = _parse_stage_concurrency(parser, args.stage_concurrency)
 
-    if args.schema_version and not re.fullmatch(r"\d+\.\d+\.\d+", args.schema_version):
-        parser.error("--schema-version must be in format X.Y.Z (e.g. 1.17.0)")
+    output = args.output
+    writer = _make_writer(args)
 
-    output = Path(args.output)
-    output.mkdir(parents=True, exist_ok=True)
+    # Release ids, PMTiles and the registry manifest are looked up concurrently
+    # from here on, while the build starts listing.
+    filesystem = fs.S3FileSystem(anonymous=True, region="us-west-2")
+    discovery = Discovery(filesystem, release=args.release)
 
     if args.release:
         this_release = OvertureRelease(
             release=args.release,
             schema=args.schema_version,
             output=output,
+            filesystem=filesystem,
+            discovery=discovery,
             debug=args.debug,
+            writer=writer,
+            profile=args.profile,
+            row_group_index=args.row_group_index,
+            tile_index_zooms=args.tile_index_zooms,
+            item_page_size=args.item_page_size,
+            pgstac_export=args.pgstac_export,
+            all_releases=args.all_releases,
+            checkpoint=True,
+            resume=args.resume,
         )
         title = f"{args.release} Overture Release"
-        this_release.build_release_catalog(title=title, max_workers=args.workers)
-        release_ids = list_release_ids(this_release.filesystem)
+        this_release.build_release_catalog(
+            title=title,
+            max_workers=args.workers,
+            executor=args.executor,
+            stage_concurrency=stage_concurrency,
+        )
+        release_ids = discovery.release_ids
         link_neighbor_releases(
             this_release.release_catalog,
             release_ids,
             root_href,
         )
-        this_release.release_catalog.normalize_hrefs(f"{root_href}/{args.release}/")
-        this_release.release_catalog.save(
-            catalog_type=pystac.CatalogType.ABSOLUTE_PUBLISHED,
-            dest_href=str(output / args.release),
-        )
+        if args.changes:
+            add_changes_link(this_release, release_ids, root_href)
+        this_release.save(root_href)
+        if args.validate:
+            report = validate_catalog(this_release.release_catalog, args.workers)
+        if args.all_releases:
+            prune_release_partitions(writer, release_ids)
 
         # Refresh root so `latest` reflects the current bucket.
-        build_root_catalog(
+        root_catalog = build_root_catalog(
             output=output,
             root_href=root_href,
             release_ids=release_ids,
             registry={
                 "path": REGISTRY_S3_PATH,
-                "manifest": RegistryManifest().create_manifest(),
+                "manifest": discovery.registry_manifest,
             },
+            writer=writer,
         )
+        # Other releases were not rebuilt, so keep their previous hashes.
+        writer.finalize(prune_missing=False)
+        if args.validate:
+            _exit_on_invalid(
+                report.combine(
+                    validate_records([("catalog.json", root_catalog.to_dict())])
+                )
+            )
         return
 
-    filesystem = fs.S3FileSystem(anonymous=True, region="us-west-2")
-    release_ids = list_release_ids(filesystem)
+    release_ids = discovery.release_ids
+    report = ValidationReport()
 
-    for idx, release in enumerate(release_ids):
-        title: str = (
-            f"{release} Overture Release" if idx > 0 else "Latest Overture Release"
-        )
+    # One pool of warm workers for every release instead of one per release.
+    pool = (
+        make_worker_pool(args.workers)
+        if args.executor == "processes" and args.workers > 1
+        else None
+    )
+    try:
+        for idx, release in enumerate(release_ids):
+            title: str = (
+                f"{release} Overture Release" if idx > 0 else "Latest Overture Release"
+            )
 
-        this_release = OvertureRelease(
-            release=release,
-            schema=None,
-            output=output,
-            debug=args.debug,
-        )
-        this_release.build_release_catalog(title=title, max_workers=args.workers)
+            this_release = OvertureRelease(
+                release=release,
+                schema=None,
+                output=output,
+                filesystem=filesystem,
+                discovery=discovery,
+                debug=args.debug,
+                writer=writer,
+                profile=args.profile,
+                row_group_index=args.row_group_index,
+                tile_index_zooms=args.tile_index_zooms,
+                item_page_size=args.item_page_size,
+                pgstac_export=args.pgstac_export,
+                all_releases=args.all_releases,
+                checkpoint=True,
+                resume=args.resume,
+            )
+            this_release.build_release_catalog(
+                title=title,
+                max_workers=args.workers,
+                pool=pool,
+                executor=args.executor,
+                stage_concurrency=stage_concurrency,
+            )
 
-        link_neighbor_releases(this_release.release_catalog, release_ids, root_href)
-        if idx == 0:
-            this_release.release_catalog.extra_fields["latest"] = True
+            link_neighbor_releases(this_release.release_catalog, release_ids, root_href)
+            if idx == 0:
+                this_release.release_catalog.extra_fields["latest"] = True
+            if args.changes:
+                add_changes_link(this_release, release_ids, root_href)
 
-        this_release.release_catalog.normalize_hrefs(f"{root_href}/{release}/")
-        this_release.release_catalog.save(
-            catalog_type=pystac.CatalogType.ABSOLUTE_PUBLISHED,
-            dest_href=str(output / release),
-        )
+            this_release.save(root_href)
+            if args.validate:
+                report = report.combine(
+                    validate_catalog(this_release.release_catalog, args.workers)
+                )
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
-    build_root_catalog(
+    if args.all_releases:
+        prune_release_partitions(writer, release_ids)
+
+    root_catalog = build_root_catalog(
         output=output,
         root_href=root_href,
         release_ids=release_ids,
         registry={
             "path": REGISTRY_S3_PATH,
-            "manifest": RegistryManifest().create_manifest(),
+            "manifest": discovery.registry_manifest,
         },
+        writer=writer,
     )
+    # Full rebuild: anything from the previous run not written again is gone.
+    writer.finalize(prune_missing=True)
+    if args.validate:
+        _exit_on_invalid(
+            report.combine(validate_records([("catalog.json", root_catalog.to_dict())]))
+        )
 
 
 if __name__ == "__main__":
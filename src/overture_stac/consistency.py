@@ -0,0 +1,434 @@
+"""Vectorized cross-checks of a release's item JSON, manifest and collections.parquet."""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple, Union
+
+from overture_stac.lazy import lazy_import
+from overture_stac.listing import iter_listing
+from overture_stac.overture_stac import BBOX_FIELDS
+from overture_stac.query import ASSET_HREF_FIELDS, collections_href, open_collections
+from overture_stac.writer import resolve_output
+
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+fs = lazy_import("pyarrow.fs")
+
+MANIFEST_FILENAME = "manifest.geojson"
+
+# Item and collection files read at once; reads are I/O bound on object stores.
+CONSISTENCY_READ_WORKERS = 32
+
+KEY_COLUMNS: tuple[str, ...] = ("collection", "id")
+CHECK_COLUMNS: tuple[str, ...] = ("rel_path", "num_rows") + BBOX_FIELDS
+
+# Each source's table suffix -> how discrepancies name it
+SOURCES: dict[str, str] = {
+    "items": "item JSON",
+    "manifest": MANIFEST_FILENAME,
+    "parquet": "collections.parquet",
+}
+
+# The item id `TypeBuilder.add` takes from a fragment's file name: the second
+# ``-``-separated part of ``part-<id>-<uuid>.zstd.parquet``.
+FRAGMENT_ID_PATTERN = r"(?:^|/)[^/-]*-(?P<id>[^/-]*)[^/]*$"
+# Scheme and host of an asset href; the rest is the fragment's rel_path.
+ASSET_HOST_PATTERN = r"^[a-z0-9]+://[^/]+/"
+
+
+class ConsistencyReport(NamedTuple):
+    """
+    Outcome of cross-checking one release.
+
+    ``counts`` is the number of fragments (or collections) each source
+    lists. ``discrepancies`` has one ``collection``, ``id``, ``check``,
+    ``detail`` row per disagreement, with a null ``id`` for collection totals.
+    """
+
+    release: str
+    counts: dict[str, int]
+    discrepancies: pa.Table
+
+
+def fragments_schema() -> pa.Schema:
+    """Columns every source is projected to before the join."""
+    return pa.schema(
+        [
+            ("collection", pa.string()),
+            ("id", pa.string()),
+            ("rel_path", pa.string()),
+            ("num_rows", pa.int64()),
+            *((name, pa.float64()) for name in BBOX_FIELDS),
+        ]
+    )
+
+
+def discrepancies_schema() -> pa.Schema:
+    return pa.schema(
+        [
+            ("collection", pa.string()),
+            ("id", pa.string()),
+            ("check", pa.string()),
+            ("detail", pa.string()),
+        ]
+    )
+
+
+def _fragments_table(columns: dict[str, list]) -> pa.Table:
+    """Build a `fragments_schema` table, leaving out columns a source lacks."""
+    schema = fragments_schema()
+    return pa.table(
+        {
+            name: values.cast(schema.field(name).type)
+            if isinstance(values, pa.Array)
+            else pa.array(values, schema.field(name).type)
+            for name, values in columns.items()
+        }
+    )
+
+
+def _bbox_columns(bboxes: list[list[float]]) -> dict[str, pa.Array]:
+    """The four bbox columns of a list of ``[xmin, ymin, xmax, ymax]`` bboxes."""
+    array = pa.array(bboxes, pa.list_(pa.float64(), len(BBOX_FIELDS)))
+    return {name: pc.list_element(array, i) for i, name in enumerate(BBOX_FIELDS)}
+
+
+def _read_json(filesystem: fs.FileSystem, path: str) -> dict:
+    with filesystem.open_input_stream(path) as f:
+        return json.loads(f.read())
+
+
+def load_manifest(filesystem: fs.FileSystem, path: str) -> pa.Table:
+    """
+    Project ``manifest.geojson`` down to the fragment columns.
+
+    The manifest has no item ids or row counts; ids are derived from each
+    ``rel_path`` the same way the items got them.
+
+    Returns:
+        pa.Table: ``collection``, ``id``, ``rel_path`` and the four bbox columns
+    """
+    features = _read_json(filesystem, path)["features"]
+    rel_paths = pa.array(
+        [feature["properties"]["rel_path"] for feature in features], pa.string()
+    )
+    return _fragments_table(
+        {
+            "collection": [feature["properties"]["ovt_type"] for feature in features],
+            "id": pc.struct_field(
+                pc.extract_regex(rel_paths, FRAGMENT_ID_PATTERN), "id"
+            ),
+            "rel_path": rel_paths,
+            **_bbox_columns([feature["bbox"] for feature in features]),
+        }
+    )
+
+
+def load_parquet(source: str) -> pa.Table:
+    """
+    Project a release's ``collections.parquet`` down to the fragment columns.
+
+    Args:
+        source: ``collections.parquet`` location, see `open_collections`
+
+    Returns:
+        pa.Table: `fragments_schema`, with ``rel_path`` taken from the aws href
+    """
+    table = open_collections(source).to_table(
+        columns={
+            "collection": pc.field("collection"),
+            "id": pc.field("id"),
+            "href": pc.field(*ASSET_HREF_FIELDS["aws"]),
+            "num_rows": pc.field("num_rows"),
+            **{name: pc.field("bbox", name) for name in BBOX_FIELDS},
+        }
+    )
+    rel_paths = pc.replace_substring_regex(table["href"], ASSET_HOST_PATTERN, "")
+    table = table.drop_columns(["href"]).append_column("rel_path", rel_paths)
+    return table.select(fragments_schema().names).cast(fragments_schema())
+
+
+def load_item_files(
+    filesystem: fs.FileSystem,
+    release_dir: str,
+    workers: int = CONSISTENCY_READ_WORKERS,
+) -> tuple[pa.Table, pa.Table]:
+    """
+    Read every item and type collection JSON file of a release.
+
+    Items are ``<theme>/<type>/<id>/<id>.json`` and type collections
+    ``<theme>/<type>/collection.json`` below ``release_dir``; once listed, the
+    files are fetched on ``workers`` threads.
+
+    Returns:
+        tuple: The items as a `fragments_schema` table, and the collections
+        as ``collection``, ``row_count`` (``table:row_count``) and
+        ``features``, which debug builds leave null
+    """
+    item_paths = []
+    collection_paths = []
+    for page in iter_listing(filesystem, release_dir, recursive=True):
+        for info in page:
+            if info.type != fs.FileType.File:
+                continue
+            parts = info.path[len(release_dir) + 1 :].split("/")
+            if len(parts) == 4 and parts[3] == f"{parts[2]}.json":
+                item_paths.append(info.path)
+            elif len(parts) == 3 and parts[2] == "collection.json":
+                collection_paths.append(info.path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        items = list(pool.map(lambda path: _read_json(filesystem, path), item_paths))
+        collections = list(
+            pool.map(lambda path: _read_json(filesystem, path), collection_paths)
+        )
+
+    hrefs = pa.array([item["assets"]["aws"]["href"] for item in items], pa.string())
+    items_table = _fragments_table(
+        {
+            "collection": [item.get("collection") for item in items],
+            "id": [item["id"] for item in items],
+            "rel_path": pc.replace_substring_regex(hrefs, ASSET_HOST_PATTERN, ""),
+            "num_rows": [item["properties"].get("num_rows") for item in items],
+            **_bbox_columns([item["bbox"] for item in items]),
+        }
+    )
+    collections_table = pa.table(
+        {
+            "collection": pa.array(
+                [collection["id"] for collection in collections], pa.string()
+            ),
+            "row_count": pa.array(
+                [collection.get("table:row_count") for collection in collections],
+                pa.int64(),
+            ),
+            "features": pa.array(
+                [collection.get("features") for collection in collections],
+                pa.int64(),
+            ),
+        }
+    )
+    return items_table, collections_table
+
+
+def _discrepancies(
+    table: pa.Table, mask: pa.ChunkedArray, check: str, detail
+) -> pa.Table:
+    """Rows of ``table`` where ``mask`` holds, as `discrepancies_schema` rows."""
+    rows = table.filter(pc.fill_null(mask, False))
+    if isinstance(detail, str):
+        detail = pa.repeat(pa.scalar(detail), rows.num_rows)
+    else:
+        detail = detail(rows)
+    return pa.table(
+        {
+            "collection": rows["collection"],
+            "id": rows["id"] if "id" in rows.column_names else pa.nulls(rows.num_rows),
+            "check": pa.repeat(pa.scalar(check), rows.num_rows),
+            "detail": detail,
+        }
+    ).cast(discrepancies_schema())
+
+
+def _duplicates(table: pa.Table, source: str) -> pa.Table:
+    counts = table.group_by(list(KEY_COLUMNS)).aggregate([([], "count_all")])
+    return _discrepancies(
+        counts,
+        pc.greater(counts["count_all"], 1),
+        "duplicate",
+        lambda rows: pc.binary_join_element_wise(
+            pc.cast(rows["count_all"], pa.string()), f" times in {SOURCES[source]}", ""
+        ),
+    )
+
+
+def _suffixed(table: pa.Table, suffix: str) -> pa.Table:
+    return table.rename_columns(
+        [
+            f"{name}_{suffix}" if name in CHECK_COLUMNS else name
+            for name in table.column_names
+        ]
+    ).append_column(f"in_{suffix}", pa.repeat(pa.scalar(True), table.num_rows))
+
+
+def _mismatch_detail(column: str, a: str, b: str):
+    def detail(rows: pa.Table) -> pa.ChunkedArray:
+        return pc.binary_join_element_wise(
+            f"{column}: ",
+            pc.cast(rows[f"{column}_{a}"], pa.string()),
+            f" in {SOURCES[a]}, ",
+            pc.cast(rows[f"{column}_{b}"], pa.string()),
+            f" in {SOURCES[b]}",
+            "",
+        )
+
+    return detail
+
+
+def compare_sources(
+    items: pa.Table, manifest: pa.Table, parquet: pa.Table, collections: pa.Table
+) -> pa.Table:
+    """
+    Join the three fragment listings by ``collection`` and ``id`` and compare.
+
+    Every fragment must be in all three sources, once, with the same
+    ``rel_path`` and bbox, and the same ``num_rows`` in the items and the
+    parquet (the manifest has none). Each type collection's
+    ``table:row_count`` (and ``features``, when set) must be the sum of its
+    items' ``num_rows``.
+
+    Returns:
+        pa.Table: The discrepancies, see `ConsistencyReport`
+    """
+    tables = {"items": items, "manifest": manifest, "parquet": parquet}
+    parts = [_duplicates(table, source) for source, table in tables.items()]
+
+    joined = _suffixed(items, "items")
+    for source in ("manifest", "parquet"):
+        joined = joined.join(
+            _suffixed(tables[source], source),
+            keys=list(KEY_COLUMNS),
+            join_type="full outer",
+        )
+
+    for source, name in SOURCES.items():
+        parts.append(
+            _discrepancies(
+                joined,
+                pc.invert(pc.fill_null(joined[f"in_{source}"], False)),
+                "missing",
+                f"not in {name}",
+            )
+        )
+    # Fragments missing from a source have nulls there, which never mismatch.
+    for column in CHECK_COLUMNS:
+        for other in ("manifest", "parquet"):
+            if column not in tables[other].column_names:
+                continue
+            parts.append(
+                _discrepancies(
+                    joined,
+                    pc.not_equal(
+                        joined[f"{column}_items"], joined[f"{column}_{other}"]
+                    ),
+                    "bbox" if column in BBOX_FIELDS else column,
+                    _mismatch_detail(column, "items", other),
+                )
+            )
+
+    totals = items.group_by("collection").aggregate([("num_rows", "sum")])
+    totals = collections.append_column(
+        "in_collections", pa.repeat(pa.scalar(True), collections.num_rows)
+    ).join(totals, keys="collection", join_type="full outer")
+    item_rows = pc.fill_null(totals["num_rows_sum"], 0)
+    for field, column in (("table:row_count", "row_count"), ("features", "features")):
+        parts.append(
+            _discrepancies(
+                totals,
+                pc.not_equal(totals[column], item_rows),
+                "row_count",
+                lambda rows, field=field, column=column: pc.binary_join_element_wise(
+                    f"{field} ",
+                    pc.cast(rows[column], pa.string()),
+                    ", items sum to ",
+                    pc.cast(pc.fill_null(rows["num_rows_sum"], 0), pa.string()),
+                    "",
+                ),
+            )
+        )
+    in_collections = pc.fill_null(totals["in_collections"], False)
+    parts.append(
+        _discrepancies(
+            totals,
+            pc.and_(in_collections, pc.is_null(totals["row_count"])),
+            "row_count",
+            "no table:row_count in collection.json",
+        )
+    )
+    parts.append(
+        _discrepancies(
+            totals,
+            pc.invert(in_collections),
+            "missing",
+            "items without a collection.json",
+        )
+    )
+
+    return pa.concat_tables(parts).sort_by(
+        [(name, "ascending") for name in ("collection", "id", "check")]
+    )
+
+
+def check_release(
+    output: Union[str, Path], release: str, workers: int = CONSISTENCY_READ_WORKERS
+) -> ConsistencyReport:
+    """
+    Cross-check a saved release's item JSON, manifest and ``collections.parquet``.
+
+    Args:
+        output: Root of the catalog, a local directory or filesystem URI
+        release: Release version string
+        workers: Threads reading item and collection files
+
+    Returns:
+        ConsistencyReport: The fragments each source lists and every
+        disagreement between them
+    """
+    filesystem, base_path = resolve_output(output)
+    release_dir = f"{base_path}/{release}"
+    items, collections = load_item_files(filesystem, release_dir, workers)
+    manifest = load_manifest(filesystem, f"{release_dir}/{MANIFEST_FILENAME}")
+    parquet = load_parquet(collections_href(str(output), release))
+    return ConsistencyReport(
+        release,
+        {
+            "items": items.num_rows,
+            "manifest": manifest.num_rows,
+            "parquet": parquet.num_rows,
+            "collections": collections.num_rows,
+        },
+        compare_sources(items, manifest, parquet, collections),
+    )
+
+
+def list_saved_releases(output: Union[str, Path]) -> list[str]:
+    """Releases under ``output`` with a manifest, newest first."""
+    filesystem, base_path = resolve_output(output)
+    candidates = [
+        info.base_name
+        for page in iter_listing(filesystem, base_path)
+        for info in page
+        if info.type == fs.FileType.Directory
+    ]
+    manifests = filesystem.get_file_info(
+        [f"{base_path}/{name}/{MANIFEST_FILENAME}" for name in candidates]
+    )
+    return sorted(
+        (
+            name
+            for name, info in zip(candidates, manifests, strict=True)
+            if info.type == fs.FileType.File
+        ),
+        reverse=True,
+    )
+
+
+def log_consistency(report: ConsistencyReport, max_errors: int = 50) -> None:
+    """Log a summary of ``report`` and up to ``max_errors`` discrepancies."""
+    logger = logging.getLogger("pystac")
+    discrepancies = report.discrepancies.to_pylist()
+    for row in discrepancies[:max_errors]:
+        target = "/".join(
+            name for name in (report.release, row["collection"], row["id"]) if name
+        )
+        logger.error(f"{target}: {row['check']}: {row['detail']}")
+    if len(discrepancies) > max_errors:
+        logger.error(f"... and {len(discrepancies) - max_errors} more discrepancies")
+    counts = ", ".join(f"{count} {source}" for source, count in report.counts.items())
+    logger.info(
+        f"{report.release}: checked {counts}: {len(discrepancies)} discrepancies"
+    )
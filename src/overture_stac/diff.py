@@ -0,0 +1,235 @@
+"""Fragment-level changesets between two releases' ``collections.parquet``."""
+
+from __future__ import annotations
+
+import logging
+from typing import Union
+
+from overture_stac.lazy import lazy_import
+from overture_stac.overture_stac import BBOX_FIELDS, OvertureRelease
+from overture_stac.query import collections_href, open_collections
+from overture_stac.writer import CatalogWriter
+
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+ds = lazy_import("pyarrow.dataset")
+pystac = lazy_import("pystac")
+
+CHANGES_FILENAME = "changes.json"
+DIFF_COLUMNS = ("num_rows",) + BBOX_FIELDS
+
+
+def load_fragments(source: Union[str, pa.Table]) -> pa.Table:
+    """
+    Project a release's items down to what the diff compares.
+
+    Args:
+        source: ``collections.parquet`` location (see `open_collections`) or an
+            in-memory stac-geoparquet table
+
+    Returns:
+        pa.Table: ``collection``, ``id``, ``num_rows`` and the four bbox columns
+    """
+    dataset = (
+        ds.dataset(source) if isinstance(source, pa.Table) else open_collections(source)
+    )
+    return dataset.to_table(
+        columns={
+            "collection": pc.field("collection"),
+            "id": pc.field("id"),
+            "num_rows": pc.field("num_rows"),
+            **{name: pc.field("bbox", name) for name in BBOX_FIELDS},
+        }
+    )
+
+
+def _suffixed(table: pa.Table, suffix: str) -> pa.Table:
+    return table.rename_columns(
+        [
+            f"{name}_{suffix}" if name in DIFF_COLUMNS else name
+            for name in table.column_names
+        ]
+    ).append_column(f"in_{suffix}", pa.repeat(pa.scalar(True), table.num_rows))
+
+
+def diff_releases(
+    source_a: Union[str, pa.Table], source_b: Union[str, pa.Table]
+) -> tuple[pa.Table, dict[str, dict]]:
+    """
+    Join two releases by ``collection`` and ``id`` and classify every fragment.
+
+    Args:
+        source_a: The older release, see `load_fragments`
+        source_b: The newer release, see `load_fragments`
+
+    Returns:
+        tuple: The changeset (one row per added, removed or changed fragment,
+        with ``change``, row counts, ``row_delta``, both bboxes and
+        ``bbox_changed``) and a per-collection summary of item/row counts
+    """
+    a = _suffixed(load_fragments(source_a), "a")
+    b = _suffixed(load_fragments(source_b), "b")
+    joined = a.join(b, keys=["collection", "id"], join_type="full outer")
+
+    in_a = pc.fill_null(joined["in_a"], False)
+    in_b = pc.fill_null(joined["in_b"], False)
+    bbox_changed = pc.fill_null(
+        pc.or_(
+            pc.or_(
+                pc.not_equal(joined["xmin_a"], joined["xmin_b"]),
+                pc.not_equal(joined["ymin_a"], joined["ymin_b"]),
+            ),
+            pc.or_(
+                pc.not_equal(joined["xmax_a"], joined["xmax_b"]),
+                pc.not_equal(joined["ymax_a"], joined["ymax_b"]),
+            ),
+        ),
+        False,
+    )
+    rows_a = pc.fill_null(joined["num_rows_a"], 0)
+    rows_b = pc.fill_null(joined["num_rows_b"], 0)
+    row_delta = pc.subtract(rows_b, rows_a)
+    changed = pc.and_(
+        pc.and_(in_a, in_b),
+        pc.or_(bbox_changed, pc.not_equal(row_delta, 0)),
+    )
+    change = pc.if_else(
+        pc.invert(in_a),
+        "added",
+        pc.if_else(pc.invert(in_b), "removed", pc.if_else(changed, "changed", None)),
+    )
+
+    full = joined.drop_columns(["in_a", "in_b"]).append_column("change", change)
+    full = full.append_column("row_delta", row_delta)
+    full = full.append_column("bbox_changed", bbox_changed)
+    full = full.append_column("rows_a", rows_a).append_column("rows_b", rows_b)
+    full = full.append_column("in_a", in_a).append_column("in_b", in_b)
+
+    summary_table = full.group_by("collection").aggregate(
+        [
+            ("in_a", "sum"),
+            ("in_b", "sum"),
+            ("rows_a", "sum"),
+            ("rows_b", "sum"),
+        ]
+    )
+    full = full.filter(pc.is_valid(full["change"]))
+    counts = full.group_by(["collection", "change"]).aggregate([("id", "count")])
+
+    summary: dict[str, dict] = {}
+    for row in summary_table.to_pylist():
+        summary[row["collection"]] = {
+            "items_a": row["in_a_sum"],
+            "items_b": row["in_b_sum"],
+            "rows_a": row["rows_a_sum"],
+            "rows_b": row["rows_b_sum"],
+            "row_delta": row["rows_b_sum"] - row["rows_a_sum"],
+            "added": 0,
+            "removed": 0,
+            "changed": 0,
+        }
+    for row in counts.to_pylist():
+        summary[row["collection"]][row["change"]] = row["id_count"]
+
+    changes = full.select(
+        ["collection", "id", "change", "num_rows_a", "num_rows_b", "row_delta"]
+        + [f"{name}_a" for name in BBOX_FIELDS]
+        + [f"{name}_b" for name in BBOX_FIELDS]
+        + ["bbox_changed"]
+    ).sort_by([("collection", "ascending"), ("id", "ascending")])
+    return changes, dict(sorted(summary.items()))
+
+
+def changeset_document(
+    release_a: str, release_b: str, changes: pa.Table, summary: dict[str, dict]
+) -> dict:
+    """Render a changeset as a compact JSON-serializable document."""
+    records = []
+    for row in changes.to_pylist():
+        record = {
+            "collection": row["collection"],
+            "id": row["id"],
+            "change": row["change"],
+        }
+        if row["row_delta"]:
+            record["num_rows"] = [row["num_rows_a"], row["num_rows_b"]]
+        if row["bbox_changed"] or row["change"] != "changed":
+            record["bbox"] = [
+                None
+                if row["change"] == "added"
+                else [row[f"{name}_a"] for name in BBOX_FIELDS],
+                None
+                if row["change"] == "removed"
+                else [row[f"{name}_b"] for name in BBOX_FIELDS],
+            ]
+        records.append(record)
+    return {"from": release_a, "to": release_b, "summary": summary, "changes": records}
+
+
+def write_release_changes(
+    writer: CatalogWriter,
+    catalog: pystac.Catalog,
+    previous_release: str,
+    current: pa.Table,
+    previous_source: str,
+    root_href: str,
+) -> bool:
+    """
+    Write ``<release>/changes.json`` against the previous release and link it.
+
+    ``catalog`` is the release catalog, whose id is the release. A previous
+    release that can't be read (e.g. not yet published under ``root_href``)
+    is logged and skipped, leaving the catalog without the link.
+
+    Args:
+        writer: Output writer
+        catalog: The release catalog to add a ``changes`` link to
+        previous_release: Id of the release to diff against
+        current: This release's stac-geoparquet table
+        previous_source: Location of the previous ``collections.parquet``
+        root_href: Public root URL of the catalog
+
+    Returns:
+        bool: Whether the changeset was written
+    """
+    logger = logging.getLogger("pystac")
+    try:
+        changes, summary = diff_releases(previous_source, current)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"Couldn't diff {catalog.id} against {previous_release}: {e}")
+        return False
+
+    writer.write_json(
+        f"{catalog.id}/{CHANGES_FILENAME}",
+        changeset_document(previous_release, catalog.id, changes, summary),
+    )
+    catalog.add_link(
+        pystac.Link(
+            rel="changes",
+            target=f"{root_href.rstrip('/')}/{catalog.id}/{CHANGES_FILENAME}",
+            media_type="application/json",
+            title=f"Changes since {previous_release}",
+        )
+    )
+    logger.info(
+        f"{catalog.id}: {changes.num_rows} fragments changed since {previous_release}"
+    )
+    return True
+
+
+def add_changes_link(
+    release: OvertureRelease, release_ids: list[str], root_href: str
+) -> None:
+    """Diff ``release`` against the next older published release, if any."""
+    try:
+        previous = release_ids[release_ids.index(release.release) + 1]
+    except (ValueError, IndexError):
+        return
+    write_release_changes(
+        release.writer,
+        release.release_catalog,
+        previous,
+        release.collections_table,
+        collections_href(root_href, previous),
+        root_href,
+    )
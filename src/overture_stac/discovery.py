@@ -0,0 +1,78 @@
+"""Startup lookups of a build, run concurrently and cached for the invocation."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from overture_stac.lazy import lazy_import
+from overture_stac.overture_stac import (
+    discover_all_pmtiles,
+    discover_pmtiles,
+    list_release_ids,
+)
+from overture_stac.registry_manifest import RegistryManifest
+
+fs = lazy_import("pyarrow.fs")
+
+
+class Discovery:
+    """
+    The release ids, PMTiles and registry manifest of one invocation.
+
+    None of these depend on each other or on the release being built, so
+    they are all started at once on a small thread pool when the object is
+    created, and each result is only waited for where it is first needed.
+    Every later use gets the same result, so each lookup runs once per
+    invocation however many releases are built.
+
+    Args:
+        filesystem: S3 filesystem for the release and PMTiles listings
+        release: The one release being built. Only its PMTiles are looked
+            up; without it, the PMTiles of every release are discovered in
+            one batched listing.
+        registry: Whether to build the registry manifest
+    """
+
+    def __init__(
+        self,
+        filesystem: fs.FileSystem,
+        release: Optional[str] = None,
+        registry: bool = True,
+    ) -> None:
+        self.filesystem = filesystem
+        self.release = release
+        pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="discovery")
+        self._release_ids = pool.submit(list_release_ids, filesystem)
+        self._pmtiles = (
+            pool.submit(lambda: {release: discover_pmtiles(filesystem, release)})
+            if release is not None
+            else pool.submit(discover_all_pmtiles, filesystem)
+        )
+        self._registry_manifest = (
+            pool.submit(lambda: RegistryManifest().create_manifest())
+            if registry
+            else None
+        )
+        # Lets the submitted lookups finish without holding the pool open
+        pool.shutdown(wait=False)
+
+    @property
+    def release_ids(self) -> list[str]:
+        """Published release ids, newest first, see `list_release_ids`."""
+        return self._release_ids.result()
+
+    @property
+    def registry_manifest(self) -> list:
+        """The registry manifest, see `RegistryManifest.create_manifest`."""
+        if self._registry_manifest is None:
+            raise ValueError("This discovery was created without the registry")
+        return self._registry_manifest.result()
+
+    def pmtiles(self, release: str) -> dict[str, str]:
+        """PMTiles files of ``release``, by base name."""
+        pmtiles = self._pmtiles.result()
+        if release not in pmtiles and self.release is not None:
+            # Not the release this discovery was made for
+            pmtiles[release] = discover_pmtiles(self.filesystem, release)
+        return pmtiles.get(release, {})
@@ -0,0 +1,120 @@
+"""Parquet footers read with one speculative tail read per file."""
+
+from __future__ import annotations
+
+from overture_stac.lazy import lazy_import
+
+pa = lazy_import("pyarrow")
+ds = lazy_import("pyarrow.dataset")
+fs = lazy_import("pyarrow.fs")
+pq = lazy_import("pyarrow.parquet")
+
+# Bytes read from the end of a file in the first request. Most footers fit;
+# larger ones take exactly one more read.
+FOOTER_TAIL_BYTES = 64 * 1024
+
+PARQUET_MAGIC = b"PAR1"
+
+
+def read_range(
+    filesystem: fs.FileSystem, path: str, size: int, offset: int, length: int
+) -> pa.Buffer:
+    """
+    Read ``length`` bytes at ``offset`` of ``path``, a file of ``size`` bytes.
+
+    A fragment made with the listed size opens the file from a `FileInfo`
+    that already has it, so on S3 there is no HEAD request before the ranged
+    GET; `FileSystem.open_input_file` only takes a path and would make one.
+    The read goes through ``filesystem``, with its connection pool,
+    endpoint, credentials and retries.
+    """
+    fragment = ds.ParquetFileFormat().make_fragment(
+        path, filesystem=filesystem, file_size=size
+    )
+    with fragment.open() as f:
+        f.seek(offset)
+        return f.read_buffer(length)
+
+
+def read_footer(
+    filesystem: fs.FileSystem,
+    path: str,
+    size: int,
+    tail_bytes: int = FOOTER_TAIL_BYTES,
+) -> tuple[pq.FileMetaData, int]:
+    """
+    Read the footer of the Parquet file ``path`` of ``size`` bytes.
+
+    The last ``tail_bytes`` are read speculatively. Only when the footer is
+    larger than that is it read again, whole. The metadata is parsed from a
+    slice of the read buffer, without copying it.
+
+    Args:
+        filesystem: Filesystem holding the file
+        path: Path of the file, ``bucket/key`` on S3
+        size: Size of the file, from the listing
+        tail_bytes: How much to read in the first request
+
+    Returns:
+        tuple: The file's `pyarrow.parquet.FileMetaData`, and the number of
+        read requests it took
+
+    Raises:
+        OSError: If the file does not end like a Parquet file
+    """
+    # Leading magic, footer length and trailing magic
+    if size < 2 * len(PARQUET_MAGIC) + 4:
+        raise OSError(f"{path} is too small to be a Parquet file")
+
+    length = min(tail_bytes, size)
+    tail = read_range(filesystem, path, size, size - length, length)
+    requests = 1
+
+    trailer = tail.slice(tail.size - 8).to_pybytes()
+    if trailer[4:] != PARQUET_MAGIC:
+        raise OSError(f"{path} does not end with the Parquet magic bytes")
+    footer_length = int.from_bytes(trailer[:4], "little") + len(trailer)
+    if footer_length > size:
+        raise OSError(f"{path} has a footer larger than the file")
+
+    if footer_length > tail.size:
+        tail = read_range(filesystem, path, size, size - footer_length, footer_length)
+        requests += 1
+
+    footer = tail.slice(tail.size - footer_length)
+    return pq.read_metadata(pa.BufferReader(footer)), requests
+
+
+class ParquetFooter:
+    """
+    A listed Parquet file whose footer is read with `read_footer`.
+
+    Stands in for a `pyarrow.dataset.ParquetFileFragment` wherever only its
+    footer is used: `path`, `metadata`, `num_row_groups` and
+    `ensure_complete_metadata`. ``requests`` counts the reads the footer took.
+    """
+
+    def __init__(self, filesystem: fs.FileSystem, path: str, size: int) -> None:
+        self.filesystem = filesystem
+        self.path = path
+        self.size = size
+        self.requests = 0
+        self._metadata = None
+
+    def ensure_complete_metadata(self) -> None:
+        if self._metadata is None:
+            self._metadata, self.requests = read_footer(
+                self.filesystem, self.path, self.size
+            )
+
+    @property
+    def metadata(self) -> pq.FileMetaData:
+        self.ensure_complete_metadata()
+        return self._metadata
+
+    @property
+    def num_row_groups(self) -> int:
+        return self.metadata.num_row_groups
+
+    def __repr__(self) -> str:
+        return f"<ParquetFooter {self.path}>"
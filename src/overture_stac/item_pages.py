@@ -0,0 +1,127 @@
+"""Static paginated ``items`` pages per collection, like a STAC API ``/items``."""
+
+from __future__ import annotations
+
+import math
+
+from overture_stac.lazy import lazy_import
+from overture_stac.writer import CatalogWriter
+
+pystac = lazy_import("pystac")
+
+ITEM_PAGES_DIRNAME = "items"
+DEFAULT_ITEM_PAGE_SIZE = 100
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+
+
+def page_name(page: int) -> str:
+    """File name of the 1-based page ``page``."""
+    return f"page-{page}.json"
+
+
+def page_count(num_items: int, page_size: int) -> int:
+    """Pages needed for ``num_items``; an empty collection still gets one page."""
+    return max(1, math.ceil(num_items / page_size))
+
+
+def add_items_link(collection: pystac.Collection) -> None:
+    """
+    Link ``collection`` to its first items page, as ``rel="items"``.
+
+    Must be called once its hrefs are normalized and before it is saved.
+    """
+    collection_dir = collection.get_self_href().rsplit("/", 1)[0]
+    collection.add_link(
+        pystac.Link(
+            rel="items",
+            target=f"{collection_dir}/{ITEM_PAGES_DIRNAME}/{page_name(1)}",
+            media_type=GEOJSON_MEDIA_TYPE,
+            title="Items",
+        )
+    )
+
+
+def write_item_pages(
+    writer: CatalogWriter,
+    collection: pystac.Collection,
+    rel_dir: str,
+    page_size: int = DEFAULT_ITEM_PAGE_SIZE,
+) -> int:
+    """
+    Write ``collection``'s items as ``<rel_dir>/items/page-N.json`` pages.
+
+    Each page is a FeatureCollection of up to ``page_size`` items, in the
+    order the collection links them, with ``next``/``prev`` links between
+    pages and ``numberMatched``/``numberReturned`` counts, so a client pages
+    through a whole type in a few requests instead of one per item.
+
+    Args:
+        writer: Writer the catalog is saved with
+        collection: A saved collection, so its items have their final hrefs
+        rel_dir: Directory of the collection's ``collection.json``, relative
+            to the writer's root
+        page_size: Items per page
+
+    Returns:
+        int: Number of pages queued
+    """
+    if page_size < 1:
+        raise ValueError(f"Item page size must be at least 1: {page_size}")
+
+    items = list(collection.get_items())
+    collection_href = collection.get_self_href()
+    pages_href = f"{collection_href.rsplit('/', 1)[0]}/{ITEM_PAGES_DIRNAME}"
+    root = collection.get_root()
+    pages = page_count(len(items), page_size)
+
+    for page in range(1, pages + 1):
+        features = [
+            item.to_dict() for item in items[(page - 1) * page_size : page * page_size]
+        ]
+        links = [
+            {
+                "rel": "self",
+                "href": f"{pages_href}/{page_name(page)}",
+                "type": GEOJSON_MEDIA_TYPE,
+            },
+            {
+                "rel": "collection",
+                "href": collection_href,
+                "type": "application/json",
+            },
+        ]
+        if root is not None:
+            links.append(
+                {
+                    "rel": "root",
+                    "href": root.get_self_href(),
+                    "type": "application/json",
+                }
+            )
+        if page > 1:
+            links.append(
+                {
+                    "rel": "prev",
+                    "href": f"{pages_href}/{page_name(page - 1)}",
+                    "type": GEOJSON_MEDIA_TYPE,
+                }
+            )
+        if page < pages:
+            links.append(
+                {
+                    "rel": "next",
+                    "href": f"{pages_href}/{page_name(page + 1)}",
+                    "type": GEOJSON_MEDIA_TYPE,
+                }
+            )
+        writer.write_json(
+            f"{rel_dir}/{ITEM_PAGES_DIRNAME}/{page_name(page)}",
+            {
+                "type": "FeatureCollection",
+                "features": features,
+                "numberMatched": len(items),
+                "numberReturned": len(features),
+                "links": links,
+            },
+        )
+    return pages
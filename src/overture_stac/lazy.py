@@ -0,0 +1,26 @@
+"""Deferred imports, so `gen-stac --help` and worker start-up skip pyarrow and pystac."""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is only imported on first attribute access."""
+
+    def __getattr__(self, name: str):
+        module = importlib.import_module(self.__name__)
+        # Later lookups hit the copied attributes and never come back here.
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Return module ``name``, importing it only when an attribute is first used.
+
+    Use it in place of ``import pyarrow.dataset as ds`` for heavy third-party
+    modules; annotations that name them need ``from __future__ import
+    annotations`` so they are not evaluated at import time either.
+    """
+    return sys.modules.get(name) or LazyModule(name)
@@ -0,0 +1,118 @@
+"""Paginated listings that yield each page as soon as it arrives."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+from overture_stac.lazy import lazy_import
+
+fs = lazy_import("pyarrow.fs")
+
+T = TypeVar("T")
+
+# Pages the background lister may run ahead of its consumer, see `buffered`.
+LISTING_QUEUE_PAGES = 8
+
+
+def key_order(info: fs.FileInfo) -> str:
+    """Sort key that puts a directory where its contents' object keys are."""
+    if info.type == fs.FileType.Directory:
+        return f"{info.path}/"
+    return info.path
+
+
+def iter_listing(
+    filesystem: fs.FileSystem, path: str, recursive: bool = False
+) -> Iterator[list[fs.FileInfo]]:
+    """
+    List ``path`` one page at a time, in key order.
+
+    `FileSystem.get_file_info` only returns once the whole selection is
+    listed, and pyarrow has no paginated listing call, so a recursive listing
+    is split up: ``path`` itself is listed first, then each directory in it
+    is listed recursively as its own page. A consumer can start on the first
+    directory while the rest are still being listed (see `buffered`). Every
+    request goes through ``filesystem``, with its endpoint, credentials and
+    retries.
+
+    Args:
+        filesystem: Filesystem to list
+        path: Directory to list, ``bucket/prefix`` on S3
+        recursive: Whether to list everything below ``path``
+
+    Yields:
+        list: The `pyarrow.fs.FileInfo` of each entry in one page. In a
+        recursive listing each directory directly in ``path`` starts its own
+        page, so empty directories are listed too.
+    """
+    path = path.replace("s3://", "").rstrip("/")
+    entries = sorted(filesystem.get_file_info(fs.FileSelector(path)), key=key_order)
+    if not recursive:
+        yield entries
+        return
+
+    files = []
+    for info in entries:
+        if info.type != fs.FileType.Directory:
+            files.append(info)
+            continue
+        if files:
+            yield files
+            files = []
+        yield [
+            info,
+            *sorted(
+                filesystem.get_file_info(fs.FileSelector(info.path, recursive=True)),
+                key=key_order,
+            ),
+        ]
+    if files:
+        yield files
+
+
+def buffered(iterable: Iterable[T], maxsize: int = LISTING_QUEUE_PAGES) -> Iterator[T]:
+    """
+    Iterate ``iterable`` on a background thread, through a bounded queue.
+
+    The producer keeps fetching while the consumer works on what it has
+    already got, but stops ``maxsize`` items ahead of it. An exception in the
+    producer is re-raised in the consumer.
+    """
+    items: queue.Queue = queue.Queue(maxsize)
+    done = object()
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as exc:
+            put((done, exc))
+        else:
+            put((done, None))
+
+    thread = threading.Thread(target=produce, name="lister", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exc = items.get()
+            if exc is not None:
+                raise exc
+            if item is done:
+                return
+            yield item
+    finally:
+        # Lets the producer exit if the consumer stops early
+        stop.set()
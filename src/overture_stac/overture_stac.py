@@ -1,40 +1,435 @@
+from __future__ import annotations
+
+import asyncio
+import functools
 import json
 import logging
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-
-import pyarrow.dataset as ds
-import pyarrow.fs as fs
-import pystac
-import stac_geoparquet
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional, Union
+
+from overture_stac.all_releases import write_release_partitions
+from overture_stac.checkpoint import CheckpointStore
+from overture_stac.footer import ParquetFooter
+from overture_stac.item_pages import add_items_link, write_item_pages
+from overture_stac.lazy import lazy_import
+from overture_stac.listing import buffered, iter_listing
+from overture_stac.pgstac_export import PGSTAC_EXPORT_FORMATS, write_pgstac_export
+from overture_stac.tile_index import MAX_TILE_INDEX_ZOOM, write_tile_index
+from overture_stac.writer import CatalogWriter
+
+if TYPE_CHECKING:
+    from overture_stac.discovery import Discovery
+
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+ds = lazy_import("pyarrow.dataset")
+fs = lazy_import("pyarrow.fs")
+pystac = lazy_import("pystac")
+stac_geoparquet = lazy_import("stac_geoparquet")
 
 ITEM_STAC_EXTENSIONS: list[str] = [
     "https://stac-extensions.github.io/storage/v2.0.0/schema.json",
     "https://stac-extensions.github.io/alternate-assets/v1.2.0/schema.json",
 ]
 
+STORAGE_EXTENSION: str = ITEM_STAC_EXTENSIONS[0]
+TABLE_EXTENSION: str = "https://stac-extensions.github.io/table/v1.2.0/schema.json"
+
+# "full" repeats the storage schemes and shared asset metadata on every item;
+# "compact" declares them once per collection (`storage:schemes` and
+# `item_assets`) so items only carry what varies per fragment.
+OUTPUT_PROFILES: tuple[str, ...] = ("full", "compact")
+
+# Where per-row-group bboxes go when requested: on each item as a
+# `row_groups` property, or in one `row-groups.parquet` index per release.
+ROW_GROUP_INDEX_MODES: tuple[str, ...] = ("properties", "sidecar")
+
+# How themes run: on a process pool (see `make_worker_pool`), or in this
+# process on threads or asyncio tasks. The in-process modes share one
+# filesystem and fetch footers on a bounded thread pool, since the work is
+# mostly waiting on S3 and pyarrow releases the GIL for its I/O. "pipeline"
+# runs fragments through asyncio stages instead, see
+# `overture_stac.pipeline.ReleasePipeline`.
+EXECUTORS: tuple[str, ...] = ("processes", "threads", "async", "pipeline")
+FOOTER_FETCH_WORKERS = 32
+# Footers requested ahead of the fragment being turned into an item.
+FOOTER_QUEUE_DEPTH = 2 * FOOTER_FETCH_WORKERS
+ROW_GROUPS_FILENAME: str = "row-groups.parquet"
+
+# Each release's PMTiles are at `<PMTILES_ROOT>/<release>/<name>.pmtiles`.
+PMTILES_ROOT: str = "overturemaps-extras-us-west-2/tiles"
+
+# Leaf columns of Overture's `bbox` struct, in xmin/ymin/xmax/ymax order.
+BBOX_FIELDS: tuple[str, ...] = ("xmin", "ymin", "xmax", "ymax")
+BBOX_COLUMNS: tuple[str, ...] = tuple(f"bbox.{name}" for name in BBOX_FIELDS)
+# Per-column-chunk footer fields summed into each collection's table:columns
+COLUMN_CHUNK_FIELDS: tuple[str, ...] = (
+    "column",
+    "compressed_bytes",
+    "uncompressed_bytes",
+    "values",
+    "nulls",
+)
+
+
+STORAGE_SCHEMES: dict[str, dict] = {
+    "aws": {
+        "type": "aws-s3",
+        "platform": "https://{bucket}.s3.{region}.amazonaws.com",
+        "bucket": "overturemaps-us-west-2",
+        "region": "us-west-2",
+        "requester_pays": False,
+    },
+    "azure": {
+        "type": "ms-azure",
+        "platform": "https://{account}.blob.core.windows.net",
+        "account": "overturemapswestus2",
+        "requester_pays": False,
+    },
+}
+
+# Asset fields that are identical on every item, keyed by asset key.
+ITEM_ASSET_DEFINITIONS: dict[str, dict] = {
+    "aws": {
+        "type": "application/vnd.apache.parquet",
+        "title": "GeoParquet on AWS S3",
+        "description": (
+            "Zstd-compressed GeoParquet in the overturemaps-us-west-2 "
+            "bucket, served over HTTPS."
+        ),
+        "roles": ["data"],
+    },
+    "azure": {
+        "type": "application/vnd.apache.parquet",
+        "title": "GeoParquet on Azure Blob Storage",
+        "description": (
+            "Zstd-compressed GeoParquet in the overturemapswestus2 "
+            "storage account (West US 2), served over HTTPS."
+        ),
+        "roles": ["data"],
+    },
+}
+
+
+class ThemeResult(NamedTuple):
+    """Everything `process_theme_worker` produces for one theme."""
+
+    theme_catalog: pystac.Catalog
+    manifest_items: list[dict]
+    type_collections: dict[str, list[pystac.Item]]
+    theme_name: str
+    stats: dict[str, int]
+    row_groups: Optional[list[dict]] = None
+
+
+def schema_key(parquet_schema) -> str:
+    """
+    Text of a Parquet schema: every column's name, repetition and types.
+
+    pyarrow starts ``str(ParquetSchema)`` with the object's repr, which holds
+    its address, so that line is dropped to make equal schemas equal keys.
+    """
+    text = str(parquet_schema)
+    if text.startswith("<"):
+        text = text.partition("\n")[2]
+    return text
+
+
+class SchemaInterner:
+    """Convert each distinct fragment schema of a type to Arrow only once.
+
+    Fragments are keyed by the text of their Parquet schema (`schema_key`),
+    which is cheap to produce and, unlike the ``ARROW:schema`` footer blob,
+    does not embed the per-file ``geo`` bbox. The first fragment's schema is
+    the reference; fragments that differ from it are collected in ``drifted``.
+    """
+
+    def __init__(self) -> None:
+        self.schemas: dict[str, pa.Schema] = {}
+        self.reference: Optional[pa.Schema] = None
+        self.drifted: list[str] = []
+        self._reference_key: Optional[str] = None
+        self._bbox_columns: dict[str, Optional[tuple[int, ...]]] = {}
+        self._leaf_paths: dict[str, tuple[str, ...]] = {}
+
+    def intern(self, fragment) -> pa.Schema:
+        """Return the Arrow schema of ``fragment``, converting it on first sight."""
+        parquet_schema = fragment.metadata.schema
+        key = schema_key(parquet_schema)
+        schema = self.schemas.get(key)
+        if schema is None:
+            schema = parquet_schema.to_arrow_schema()
+            self.schemas[key] = schema
+
+        if self._reference_key is None:
+            self._reference_key = key
+            self.reference = schema
+        elif key != self._reference_key:
+            self.drifted.append(fragment.path)
+        return schema
+
+    def leaf_paths(self, fragment) -> tuple[str, ...]:
+        """Dotted path of each leaf column in ``fragment``, e.g. ``bbox.xmin``."""
+        parquet_schema = fragment.metadata.schema
+        key = schema_key(parquet_schema)
+        if key not in self._leaf_paths:
+            self._leaf_paths[key] = tuple(
+                parquet_schema.column(i).path for i in range(len(parquet_schema))
+            )
+        return self._leaf_paths[key]
+
+    def bbox_columns(self, fragment) -> Optional[tuple[int, ...]]:
+        """Leaf column indices of ``BBOX_COLUMNS`` in ``fragment``, or None."""
+        key = schema_key(fragment.metadata.schema)
+        if key not in self._bbox_columns:
+            paths = self.leaf_paths(fragment)
+            self._bbox_columns[key] = (
+                tuple(paths.index(name) for name in BBOX_COLUMNS)
+                if all(name in paths for name in BBOX_COLUMNS)
+                else None
+            )
+        return self._bbox_columns[key]
+
+
+def row_group_bboxes(
+    metadata, bbox_columns: Optional[tuple[int, ...]], file_bbox: list[float]
+) -> list[dict]:
+    """
+    Per-row-group row offsets and bboxes from a fragment's footer.
+
+    Each bbox is the min of ``bbox.xmin``/``bbox.ymin`` and the max of
+    ``bbox.xmax``/``bbox.ymax`` over the row group, taken from the column
+    chunk statistics. Row groups without those statistics fall back to the
+    file-level ``file_bbox``.
+
+    Args:
+        metadata: The fragment's ``pyarrow.parquet.FileMetaData``
+        bbox_columns: Leaf column indices of ``BBOX_COLUMNS``, or None
+        file_bbox: The file-level bbox from the ``geo`` metadata
+
+    Returns:
+        list: One ``{"row_offset", "num_rows", "bbox"}`` dict per row group
+    """
+    row_groups = []
+    row_offset = 0
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        bbox = list(file_bbox)
+        if bbox_columns is not None:
+            stats = [row_group.column(j).statistics for j in bbox_columns]
+            if all(s is not None and s.has_min_max for s in stats):
+                bbox = [stats[0].min, stats[1].min, stats[2].max, stats[3].max]
+        row_groups.append(
+            {"row_offset": row_offset, "num_rows": row_group.num_rows, "bbox": bbox}
+        )
+        row_offset += row_group.num_rows
+    return row_groups
+
+
+@functools.cache
+def row_groups_schema() -> pa.Schema:
+    """Schema of ``row-groups.parquet``; built on first use so pyarrow loads lazily."""
+    return pa.schema(
+        [
+            ("collection", pa.string()),
+            ("id", pa.string()),
+            ("rel_path", pa.string()),
+            ("row_group", pa.int32()),
+            ("row_offset", pa.int64()),
+            ("num_rows", pa.int64()),
+            (
+                "bbox",
+                pa.struct([(name, pa.float64()) for name in BBOX_FIELDS]),
+            ),
+        ]
+    )
+
+
+def row_groups_table(records: list[dict]) -> pa.Table:
+    """Build the ``row-groups.parquet`` index, sorted by collection, id and row group."""
+    records = sorted(records, key=lambda r: (r["collection"], r["id"], r["row_group"]))
+    rows = [
+        {
+            **record,
+            "bbox": dict(zip(BBOX_FIELDS, record["bbox"], strict=True)),
+        }
+        for record in records
+    ]
+    return pa.Table.from_pylist(rows, schema=row_groups_schema())
+
+
+def column_chunk_stats(metadata, leaf_paths: tuple[str, ...]) -> dict[str, list]:
+    """
+    Sizes and null counts of every column chunk in a fragment's footer.
+
+    Null counts of nested leaves (``names.primary``, list elements) don't
+    count rows of their top-level column, so they are left out.
+
+    Args:
+        metadata: The fragment's ``pyarrow.parquet.FileMetaData``
+        leaf_paths: Path of each leaf column, see `SchemaInterner.leaf_paths`
+
+    Returns:
+        dict: Parallel ``column`` (top-level name), ``compressed_bytes``,
+        ``uncompressed_bytes``, ``values`` and ``nulls`` lists, one entry per
+        column chunk; ``nulls`` is None where it isn't known
+    """
+    chunks: dict[str, list] = {name: [] for name in COLUMN_CHUNK_FIELDS}
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j, path in enumerate(leaf_paths):
+            column = row_group.column(j)
+            stats = column.statistics
+            chunks["column"].append(path.split(".", 1)[0])
+            chunks["compressed_bytes"].append(column.total_compressed_size)
+            chunks["uncompressed_bytes"].append(column.total_uncompressed_size)
+            chunks["values"].append(column.num_values)
+            chunks["nulls"].append(
+                stats.null_count
+                if "." not in path and stats is not None and stats.has_null_count
+                else None
+            )
+    return chunks
+
+
+def aggregate_column_stats(chunks: dict[str, list]) -> dict[str, dict]:
+    """
+    Total the column chunks of a type per top-level column.
+
+    Args:
+        chunks: Concatenated `column_chunk_stats` of the type's fragments
+
+    Returns:
+        dict: Column name -> ``compressed_bytes``, ``uncompressed_bytes``,
+        ``values`` and ``nulls`` summed over every chunk; ``nulls`` is None
+        unless every chunk of the column has a null count
+    """
+    if not chunks["column"]:
+        return {}
+    table = pa.table(
+        {
+            "column": pa.array(chunks["column"], pa.string()),
+            **{
+                name: pa.array(chunks[name], pa.int64())
+                for name in COLUMN_CHUNK_FIELDS[1:]
+            },
+        }
+    )
+    totals = table.group_by("column").aggregate(
+        [
+            ("compressed_bytes", "sum"),
+            ("uncompressed_bytes", "sum"),
+            ("values", "sum"),
+            ("nulls", "sum"),
+            ("nulls", "count", pc.CountOptions(mode="only_null")),
+        ]
+    )
+    return {
+        row["column"]: {
+            "compressed_bytes": row["compressed_bytes_sum"],
+            "uncompressed_bytes": row["uncompressed_bytes_sum"],
+            "values": row["values_sum"],
+            "nulls": row["nulls_sum"] if row["nulls_count"] == 0 else None,
+        }
+        for row in totals.to_pylist()
+    }
+
+
+def combine_column_stats(stats: list[dict[str, dict]]) -> dict[str, dict]:
+    """Sum the `aggregate_column_stats` of several chunks of one type."""
+    combined: dict[str, dict] = {}
+    for chunk_stats in stats:
+        for column, totals in chunk_stats.items():
+            if column not in combined:
+                combined[column] = dict(totals)
+                continue
+            total = combined[column]
+            for key in ("compressed_bytes", "uncompressed_bytes", "values"):
+                total[key] += totals[key]
+            total["nulls"] = (
+                None
+                if total["nulls"] is None or totals["nulls"] is None
+                else total["nulls"] + totals["nulls"]
+            )
+    return combined
+
+
+def table_column(column: dict, stats: Optional[dict]) -> dict:
+    """
+    A ``table:columns`` entry with the column's footprint across the type.
+
+    ``compressed_bytes`` is what a scan projecting the column reads, and
+    ``null_fraction`` is only set for flat columns whose every chunk has a
+    null count.
+    """
+    entry = dict(column)
+    if stats:
+        entry["compressed_bytes"] = stats["compressed_bytes"]
+        entry["uncompressed_bytes"] = stats["uncompressed_bytes"]
+        if stats["nulls"] is not None and stats["values"]:
+            entry["null_fraction"] = round(stats["nulls"] / stats["values"], 6)
+    return entry
+
+
+def item_json_size(item: pystac.Item) -> int:
+    """Size in bytes of ``item`` serialized as JSON, links excluded."""
+    return len(json.dumps(item.to_dict(include_self_link=False, transform_hrefs=False)))
+
+
+def compact_item(item: pystac.Item) -> None:
+    """Drop the fields the compact profile declares on the collection instead."""
+    item.properties.pop("storage:schemes", None)
+    for key, asset in item.assets.items():
+        if key not in ITEM_ASSET_DEFINITIONS:
+            continue
+        asset.media_type = None
+        asset.title = None
+        asset.description = None
+        asset.roles = None
+
 
 def list_release_ids(filesystem: fs.S3FileSystem) -> list[str]:
     """Return currently-published release ids from the public bucket, newest-first."""
-    info = filesystem.get_file_info(fs.FileSelector("overturemaps-us-west-2/release"))
-    return sorted((r.path.split("/")[-1] for r in info), reverse=True)
+    return sorted(
+        (
+            info.path.split("/")[-1]
+            for page in iter_listing(filesystem, "overturemaps-us-west-2/release")
+            for info in page
+        ),
+        reverse=True,
+    )
 
 
 def build_root_catalog(
-    output: Path,
+    output: Union[Path, str],
     root_href: str,
     release_ids: list[str],
     registry: Optional[dict] = None,
+    writer: Optional[CatalogWriter] = None,
 ) -> pystac.Catalog:
     """Write the root 'Overture Releases' catalog to ``output/catalog.json``.
 
     Function sorts ``release_ids`` lexicographically (release ids are
-    YYYY-MM-DD.N) and marks the newest as ``latest``.
+    YYYY-MM-DD.N) and marks the newest as ``latest``. When ``writer`` is
+    given the file goes through it instead (``output`` is then its root), so
+    an unchanged root is left untouched.
     """
     root = root_href.rstrip("/")
-    output.mkdir(parents=True, exist_ok=True)
+    if writer is None:
+        output = Path(output)
+        output.mkdir(parents=True, exist_ok=True)
+        dest_href = str(output / "catalog.json")
+    else:
+        dest_href = writer.href("catalog.json")
 
     release_ids = sorted(release_ids, reverse=True)
 
@@ -65,7 +460,11 @@ def build_root_catalog(
         catalog.extra_fields["registry"] = registry
 
     catalog.set_self_href(f"{root}/catalog.json")
-    catalog.save_object(include_self_link=True, dest_href=str(output / "catalog.json"))
+    catalog.save_object(
+        include_self_link=True,
+        dest_href=dest_href,
+        stac_io=writer.stac_io if writer is not None else None,
+    )
     return catalog
 
 
@@ -126,41 +525,414 @@ TYPE_LICENSE_MAP: dict[str, str] = {
 }
 
 
-def process_theme_worker(
-    theme_path: str,
-    release_path: str,
-    s3_region: str,
-    debug: bool,
+class TypeResult(NamedTuple):
+    """Items and metadata built for one type; the unit that is checkpointed."""
+
+    type_name: str
+    items: list[pystac.Item]
+    manifest_items: list[dict]
+    stats: dict[str, int]
+    row_groups: list[dict]
+    columns: list[dict]
+    geoparquet_version: Optional[str]
+    column_stats: dict[str, dict]
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form, see `from_dict`."""
+        return {
+            "type_name": self.type_name,
+            "items": [
+                item.to_dict(include_self_link=False, transform_hrefs=False)
+                for item in self.items
+            ],
+            "manifest_items": self.manifest_items,
+            "stats": self.stats,
+            "row_groups": self.row_groups,
+            "columns": self.columns,
+            "geoparquet_version": self.geoparquet_version,
+            "column_stats": self.column_stats,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "TypeResult":
+        return cls(
+            type_name=d["type_name"],
+            items=[pystac.Item.from_dict(item) for item in d["items"]],
+            manifest_items=d["manifest_items"],
+            stats=d["stats"],
+            row_groups=d["row_groups"],
+            columns=d["columns"],
+            geoparquet_version=d["geoparquet_version"],
+            column_stats=d["column_stats"],
+        )
+
+
+class TypeBuilder:
+    """
+    Builds a type's STAC items and manifest features one fragment at a time.
+
+    Fragments must be added in listing order, with their footers fetched;
+    the first one is the reference the others' schemas are compared with.
+    """
+
+    def __init__(
+        self,
+        type_name: str,
+        total_fragments: int,
+        release_datetime: datetime,
+        profile: str = "full",
+        row_group_index: Optional[str] = None,
+    ) -> None:
+        self.logger = logging.getLogger("pystac")
+        self.type_name = type_name
+        self.total_fragments = total_fragments
+        self.release_datetime = release_datetime
+        self.profile = profile
+        self.row_group_index = row_group_index
+
+        self.count = 0
+        self.first_path: Optional[str] = None
+        self.items: list[pystac.Item] = []
+        self.manifest_items: list[dict] = []
+        self.row_group_records: list[dict] = []
+        self.column_chunks: dict[str, list] = {name: [] for name in COLUMN_CHUNK_FIELDS}
+        self.stats = {
+            "items": 0,
+            "item_bytes": 0,
+            "item_bytes_full": 0,
+            "schemas": 0,
+            "schema_drift_fragments": 0,
+            "footer_requests": 0,
+        }
+        self.schemas = SchemaInterner()
+        self.geoparquet_version: Optional[str] = None
+
+    def add(self, fragment) -> None:
+        """Build the item and manifest feature of the next fragment."""
+        if self.first_path is None:
+            self.first_path = fragment.path
+        self.schemas.intern(fragment)
+        for name, values in column_chunk_stats(
+            fragment.metadata, self.schemas.leaf_paths(fragment)
+        ).items():
+            self.column_chunks[name].extend(values)
+
+        # Create STAC item from fragment
+        filename = fragment.path.split("/")[-1]
+        rel_path = ("/").join(fragment.path.split("/")[1:])
+
+        # Log progress every 10 fragments
+        if self.count % 10 == 0 or self.count == self.total_fragments - 1:
+            self.logger.info(
+                f" [ {fragment.path.split('/')[-2]} : {self.count + 1}/{self.total_fragments} fragments ]"
+            )
+
+        # Build bbox from metadata; the geo bbox is per file, so it is
+        # read straight from the footer rather than the interned schema
+        geo = json.loads(fragment.metadata.metadata[b"geo"])
+        if self.count == 0:
+            self.geoparquet_version = geo.get("version")
+        xmin, ymin, xmax, ymax = geo.get("columns").get("geometry").get("bbox")
+
+        geojson_bbox_geometry = {
+            "type": "Polygon",
+            "coordinates": [
+                [
+                    [xmin, ymin],
+                    [xmax, ymin],
+                    [xmax, ymax],
+                    [xmin, ymax],
+                    [xmin, ymin],
+                ]
+            ],
+        }
+
+        num_rows = fragment.metadata.num_rows
+
+        item_id = filename.split("-")[1]
+        stac_item = pystac.Item(
+            id=item_id,
+            geometry=geojson_bbox_geometry,
+            bbox=[xmin, ymin, xmax, ymax],
+            properties={
+                "num_rows": num_rows,
+                "num_row_groups": fragment.num_row_groups,
+                "storage:schemes": STORAGE_SCHEMES,
+            },
+            datetime=self.release_datetime,
+            stac_extensions=list(ITEM_STAC_EXTENSIONS),
+        )
+
+        if self.row_group_index is not None:
+            row_groups = row_group_bboxes(
+                fragment.metadata,
+                self.schemas.bbox_columns(fragment),
+                [xmin, ymin, xmax, ymax],
+            )
+            if self.row_group_index == "properties":
+                stac_item.properties["row_groups"] = row_groups
+            else:
+                self.row_group_records.extend(
+                    {
+                        "collection": self.type_name,
+                        "id": item_id,
+                        "rel_path": rel_path,
+                        "row_group": i,
+                        **row_group,
+                    }
+                    for i, row_group in enumerate(row_groups)
+                )
+
+        self.manifest_items.append(
+            {
+                "type": "Feature",
+                "properties": {
+                    "ovt_type": self.type_name,
+                    "rel_path": rel_path,
+                },
+                "geometry": geojson_bbox_geometry,
+                "bbox": [xmin, ymin, xmax, ymax],
+            }
+        )
+
+        # Add assets
+        stac_item.add_asset(
+            key="aws",
+            asset=pystac.Asset(
+                href=f"https://overturemaps-us-west-2.s3.us-west-2.amazonaws.com/{rel_path}",
+                media_type=ITEM_ASSET_DEFINITIONS["aws"]["type"],
+                title=ITEM_ASSET_DEFINITIONS["aws"]["title"],
+                description=ITEM_ASSET_DEFINITIONS["aws"]["description"],
+                roles=list(ITEM_ASSET_DEFINITIONS["aws"]["roles"]),
+                extra_fields={
+                    "storage:refs": ["aws"],
+                    "alternate:name": "HTTPS",
+                    "alternate": {
+                        "s3": {
+                            "href": f"s3://{fragment.path}",
+                            "alternate:name": "S3",
+                            "description": "Access the files via regular Amazon AWS S3 tooling.",
+                            "roles": ["data"],
+                        }
+                    },
+                },
+            ),
+        )
+        stac_item.add_asset(
+            key="azure",
+            asset=pystac.Asset(
+                href=f"https://overturemapswestus2.blob.core.windows.net/{rel_path}",
+                media_type=ITEM_ASSET_DEFINITIONS["azure"]["type"],
+                title=ITEM_ASSET_DEFINITIONS["azure"]["title"],
+                description=ITEM_ASSET_DEFINITIONS["azure"]["description"],
+                roles=list(ITEM_ASSET_DEFINITIONS["azure"]["roles"]),
+                extra_fields={"storage:refs": ["azure"]},
+            ),
+        )
+
+        if self.profile == "compact":
+            # Measured only here, where they show what the profile saves
+            self.stats["item_bytes_full"] += item_json_size(stac_item)
+            compact_item(stac_item)
+            self.stats["item_bytes"] += item_json_size(stac_item)
+        self.stats["items"] += 1
+        # Only counted for footers read by `read_footer`
+        if isinstance(fragment, ParquetFooter):
+            self.stats["footer_requests"] += fragment.requests
+
+        self.items.append(stac_item)
+        self.count += 1
+
+    def result(self) -> TypeResult:
+        """The finished type, once every fragment has been added."""
+        self.stats["schemas"] += len(self.schemas.schemas)
+        self.stats["schema_drift_fragments"] += len(self.schemas.drifted)
+        if self.schemas.drifted:
+            self.logger.warning(
+                f"Schema drift in {self.type_name}: {len(self.schemas.drifted)} of "
+                f"{self.total_fragments} fragments differ from the schema of "
+                f"{self.first_path} (first: {self.schemas.drifted[0]})"
+            )
+
+        reference = self.schemas.reference
+        return TypeResult(
+            type_name=self.type_name,
+            items=self.items,
+            manifest_items=self.manifest_items,
+            stats=self.stats,
+            row_groups=self.row_group_records,
+            columns=[
+                {"name": field.name, "type": str(field.type)} for field in reference
+            ]
+            if reference is not None
+            else [],
+            geoparquet_version=self.geoparquet_version,
+            column_stats=aggregate_column_stats(self.column_chunks),
+        )
+
+
+def process_type(
+    type_name: str,
+    fragments: list,
     release_datetime: datetime,
-    release: str,
-    available_pmtiles: dict[str, str],
-) -> tuple[pystac.Catalog, list[dict], dict[str, list[pystac.Item]], str]:
+    profile: str = "full",
+    row_group_index: Optional[str] = None,
+    footer_pool: Optional[Executor] = None,
+) -> TypeResult:
     """
-    Worker function to process a single theme independently.
+    Build a STAC item and manifest feature for each of a type's fragments.
 
-    This function runs in a separate process and returns all results
-    instead of mutating shared state.
+    Only footer metadata already fetched with the fragments is read.
 
     Args:
-        theme_path: Path to the theme directory
-        release_path: S3 path to the release
-        s3_region: AWS region
-        debug: Debug mode flag
+        type_name: Overture type, e.g. ``building``
+        fragments: The type's Parquet fragments
         release_datetime: Release datetime
+        profile: Output profile, one of `OUTPUT_PROFILES`
+        row_group_index: Where to record per-row-group bboxes, one of
+            `ROW_GROUP_INDEX_MODES`, or None to skip them
+        footer_pool: Thread pool to fetch footers on ahead of the fragment
+            being processed, see `prefetch_footers`; when omitted they are
+            read one by one
+
+    Returns:
+        TypeResult: items, manifest features, stats and schema metadata
+    """
+    builder = TypeBuilder(
+        type_name, len(fragments), release_datetime, profile, row_group_index
+    )
+    if footer_pool is not None:
+        fragments = prefetch_footers(fragments, footer_pool)
+    for fragment in fragments:
+        builder.add(fragment)
+    return builder.result()
+
+
+def build_type_collection(
+    result: TypeResult, debug: bool = False, profile: str = "full"
+) -> pystac.Collection:
+    """
+    Build a type's collection from its items.
+
+    Args:
+        result: The type's `TypeResult`
+        debug: Debug mode flag; leaves out the ``features`` count
+        profile: Output profile, one of `OUTPUT_PROFILES`
+
+    Returns:
+        pystac.Collection: The collection, with the items added
+    """
+    type_name = result.type_name
+    items = result.items
+    total_row_count = sum(i.properties["num_rows"] for i in items)
+
+    type_collection = pystac.Collection(
+        id=type_name,
+        title=type_name,
+        description=f"Overture's {type_name} collection",
+        extent=pystac.Extent(
+            # A type with no fragments yet still gets a (whole-world) extent
+            spatial=pystac.SpatialExtent(
+                bboxes=[i.bbox for i in items] or [[-180.0, -90.0, 180.0, 90.0]]
+            ),
+            temporal=pystac.TemporalExtent(intervals=[[None, None]]),
+        ),
+        license=TYPE_LICENSE_MAP.get(type_name),
+    )
+
+    # Licenses with multiple SPDXs must be marked as "other" and include a link to the license details
+    if TYPE_LICENSE_MAP.get(type_name) == "other":
+        type_collection.add_link(
+            pystac.Link(
+                rel="license",
+                target="https://docs.overturemaps.org/attribution/",
+                title="Overture Maps Attribution and Licensing",
+            )
+        )
+
+    type_collection.add_items(items)
+
+    if items:
+        row_counts = [i.properties["num_rows"] for i in items]
+        row_group_counts = [i.properties["num_row_groups"] for i in items]
+        type_collection.summaries = pystac.Summaries(
+            {
+                "num_rows": pystac.RangeSummary(
+                    minimum=min(row_counts), maximum=max(row_counts)
+                ),
+                "num_row_groups": pystac.RangeSummary(
+                    minimum=min(row_group_counts), maximum=max(row_group_counts)
+                ),
+            }
+        )
+
+    type_collection.stac_extensions = [TABLE_EXTENSION]
+    type_collection.extra_fields = {
+        "table:columns": [
+            table_column(column, result.column_stats.get(column["name"]))
+            for column in result.columns
+        ],
+        "table:primary_geometry": "geometry",
+        "table:row_count": total_row_count,
+        "geoparquet:version": result.geoparquet_version,
+    }
+
+    if not debug:
+        type_collection.extra_fields["features"] = total_row_count
+
+    if profile == "compact":
+        type_collection.stac_extensions.append(STORAGE_EXTENSION)
+        type_collection.extra_fields["storage:schemes"] = STORAGE_SCHEMES
+        type_collection.extra_fields["item_assets"] = ITEM_ASSET_DEFINITIONS
+
+    return type_collection
+
+
+def combine_type_results(results: list[TypeResult]) -> TypeResult:
+    """Concatenate the results of one type's fragment chunks, in order."""
+    stats: dict[str, int] = {}
+    for result in results:
+        for key, value in result.stats.items():
+            stats[key] = stats.get(key, 0) + value
+    return TypeResult(
+        type_name=results[0].type_name,
+        items=[item for result in results for item in result.items],
+        manifest_items=[f for result in results for f in result.manifest_items],
+        stats=stats,
+        row_groups=[r for result in results for r in result.row_groups],
+        columns=next((r.columns for r in results if r.columns), []),
+        geoparquet_version=next(
+            (r.geoparquet_version for r in results if r.geoparquet_version), None
+        ),
+        column_stats=combine_column_stats([r.column_stats for r in results]),
+    )
+
+
+def assemble_theme(
+    theme_name: str,
+    type_results: list[TypeResult],
+    release: str,
+    available_pmtiles: dict[str, str],
+    debug: bool = False,
+    profile: str = "full",
+) -> ThemeResult:
+    """
+    Build a theme catalog and its type collections from per-type results.
+
+    Args:
+        theme_name: Overture theme, e.g. ``buildings``
+        type_results: One `TypeResult` per type of the theme
         release: Release version string
         available_pmtiles: Dict of available PMTiles files for this release
+        debug: Debug mode flag
+        profile: Output profile, one of `OUTPUT_PROFILES`
 
     Returns:
-        tuple: (theme_catalog, manifest_items, type_collections, theme_name)
+        ThemeResult: theme catalog, manifest items, items per type, theme
+        name, item size and schema stats, and row-group index records
     """
     logger = logging.getLogger("pystac")
 
-    # Create a new filesystem connection for this process
-    filesystem = fs.S3FileSystem(anonymous=True, region=s3_region)
-
-    theme_name = theme_path.split("=")[-1]
-    logger.info(f"Processing Theme: {theme_name}")
-
     theme_catalog = pystac.Catalog(
         id=theme_name,
         title=theme_name,
@@ -179,211 +951,367 @@ def process_theme_worker(
             )
         )
 
-    # Get theme types
-    theme_path_selector = fs.FileSelector(theme_path)
-    theme_types = filesystem.get_file_info(theme_path_selector)
+    manifest_items = []
+    type_collections = {}
+    row_groups = []
+    stats: dict[str, int] = {}
+    for result in type_results:
+        type_collections[result.type_name] = result.items
+        manifest_items.extend(result.manifest_items)
+        row_groups.extend(result.row_groups)
+        for key, value in result.stats.items():
+            stats[key] = stats.get(key, 0) + value
+
+        theme_catalog.add_child(
+            build_type_collection(result, debug, profile), title=result.type_name
+        )
 
-    # Local state for this theme
-    local_manifest_items = []
-    local_type_collections = {}
+    return ThemeResult(
+        theme_catalog, manifest_items, type_collections, theme_name, stats, row_groups
+    )
 
-    for theme_type in theme_types:
-        type_name = theme_type.path.split("=")[-1]
-        logger.info(f"Opening Type: {type_name}")
 
-        type_dataset = ds.dataset(
-            theme_type.path, filesystem=filesystem, format="parquet"
-        )
+# Imported once by the forkserver, so every pool worker forks with them loaded.
+WORKER_PRELOAD_MODULES: tuple[str, ...] = (
+    "pyarrow.dataset",
+    "pyarrow.fs",
+    "pyarrow.parquet",
+    "pystac",
+    "stac_geoparquet",
+    "overture_stac.overture_stac",
+)
 
-        local_type_collections[type_name] = []
-        schema = None
-        total_row_count = 0
+# S3 clients of the current pool worker by region, set by `init_worker`.
+_worker_filesystems: dict[str, fs.FileSystem] = {}
 
-        # Get all fragments
-        all_fragments = list(type_dataset.get_fragments())
-        if debug:
-            all_fragments = all_fragments[:3]
 
-        total_fragments: int = len(all_fragments)
+def init_worker(s3_region: str, filesystem: Optional[fs.FileSystem] = None) -> None:
+    """Pool initializer: set up the worker's filesystem once for its lifetime."""
+    _worker_filesystems[s3_region] = (
+        filesystem
+        if filesystem is not None
+        else fs.S3FileSystem(anonymous=True, region=s3_region)
+    )
 
-        for idx, fragment in enumerate(all_fragments):
-            schema = fragment.metadata.schema.to_arrow_schema()
 
-            # Create STAC item from fragment
-            filename = fragment.path.split("/")[-1]
-            rel_path = ("/").join(fragment.path.split("/")[1:])
+def worker_filesystem(s3_region: str) -> fs.FileSystem:
+    """The pool worker's long-lived S3 filesystem, or a new one outside a pool."""
+    filesystem = _worker_filesystems.get(s3_region)
+    if filesystem is None:
+        filesystem = fs.S3FileSystem(anonymous=True, region=s3_region)
+    return filesystem
 
-            # Log progress every 10 fragments
-            if idx % 10 == 0 or idx == total_fragments - 1:
-                logger.info(
-                    f" [ {fragment.path.split('/')[-2]} : {idx + 1}/{total_fragments} fragments ]"
-                )
 
-            # Build bbox from metadata
-            geo = json.loads(schema.metadata[b"geo"].decode("utf-8"))
-            xmin, ymin, xmax, ymax = geo.get("columns").get("geometry").get("bbox")
-
-            geojson_bbox_geometry = {
-                "type": "Polygon",
-                "coordinates": [
-                    [
-                        [xmin, ymin],
-                        [xmax, ymin],
-                        [xmax, ymax],
-                        [xmin, ymax],
-                        [xmin, ymin],
-                    ]
-                ],
-            }
+def make_worker_pool(
+    max_workers: int,
+    s3_region: str = "us-west-2",
+    filesystem: Optional[fs.FileSystem] = None,
+) -> ProcessPoolExecutor:
+    """
+    Create a process pool of warm workers that can be shared across releases.
 
-            num_rows = fragment.metadata.num_rows
-            total_row_count += num_rows
-
-            stac_item = pystac.Item(
-                id=filename.split("-")[1],
-                geometry=geojson_bbox_geometry,
-                bbox=[xmin, ymin, xmax, ymax],
-                properties={
-                    "num_rows": num_rows,
-                    "num_row_groups": fragment.num_row_groups,
-                    "storage:schemes": {
-                        "aws": {
-                            "type": "aws-s3",
-                            "platform": "https://{bucket}.s3.{region}.amazonaws.com",
-                            "bucket": "overturemaps-us-west-2",
-                            "region": "us-west-2",
-                            "requester_pays": False,
-                        },
-                        "azure": {
-                            "type": "ms-azure",
-                            "platform": "https://{account}.blob.core.windows.net",
-                            "account": "overturemapswestus2",
-                            "requester_pays": False,
-                        },
-                    },
-                },
-                datetime=release_datetime,
-                stac_extensions=list(ITEM_STAC_EXTENSIONS),
-            )
+    Workers are forked from a forkserver that has already imported
+    `WORKER_PRELOAD_MODULES`, so they skip interpreter start-up and imports,
+    and each keeps one S3 filesystem (and its connection pool) for its whole
+    lifetime. Platforms without forkserver fall back to spawn.
 
-            local_manifest_items.append(
-                {
-                    "type": "Feature",
-                    "properties": {
-                        "ovt_type": type_name,
-                        "rel_path": rel_path,
-                    },
-                    "geometry": geojson_bbox_geometry,
-                    "bbox": [xmin, ymin, xmax, ymax],
-                }
-            )
+    Args:
+        max_workers: Number of worker processes
+        s3_region: AWS region of the workers' S3 filesystem
+        filesystem: Filesystem to give every worker instead of a new
+            anonymous S3 one
 
-            # Add assets
-            stac_item.add_asset(
-                key="aws",
-                asset=pystac.Asset(
-                    href=f"https://overturemaps-us-west-2.s3.us-west-2.amazonaws.com/{rel_path}",
-                    media_type="application/vnd.apache.parquet",
-                    title="GeoParquet on AWS S3",
-                    description=(
-                        "Zstd-compressed GeoParquet in the overturemaps-us-west-2 "
-                        "bucket, served over HTTPS."
-                    ),
-                    roles=["data"],
-                    extra_fields={
-                        "storage:refs": ["aws"],
-                        "alternate:name": "HTTPS",
-                        "alternate": {
-                            "s3": {
-                                "href": f"s3://{fragment.path}",
-                                "alternate:name": "S3",
-                                "description": "Access the files via regular Amazon AWS S3 tooling.",
-                                "roles": ["data"],
-                            }
-                        },
-                    },
-                ),
-            )
-            stac_item.add_asset(
-                key="azure",
-                asset=pystac.Asset(
-                    href=f"https://overturemapswestus2.blob.core.windows.net/{rel_path}",
-                    media_type="application/vnd.apache.parquet",
-                    title="GeoParquet on Azure Blob Storage",
-                    description=(
-                        "Zstd-compressed GeoParquet in the overturemapswestus2 "
-                        "storage account (West US 2), served over HTTPS."
-                    ),
-                    roles=["data"],
-                    extra_fields={"storage:refs": ["azure"]},
-                ),
-            )
+    Returns:
+        ProcessPoolExecutor: The pool; shut it down when done
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(list(WORKER_PRELOAD_MODULES))
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(s3_region, filesystem),
+    )
 
-            local_type_collections[type_name].append(stac_item)
 
-        # Create type collection
-        type_collection = pystac.Collection(
-            id=type_name,
-            title=type_name,
-            description=f"Overture's {type_name} collection",
-            extent=pystac.Extent(
-                spatial=pystac.SpatialExtent(
-                    bboxes=[i.bbox for i in local_type_collections[type_name]]
-                ),
-                temporal=pystac.TemporalExtent(intervals=[[None, None]]),
-            ),
-            license=TYPE_LICENSE_MAP.get(type_name),
-        )
+def iter_release_themes(
+    filesystem: fs.FileSystem, release_path: str
+) -> Iterator[tuple[str, dict[str, list[tuple[str, int]]]]]:
+    """
+    List a release and yield it theme by theme, each as soon as it is listed.
 
-        # Licenses with multiple SPDXs must be marked as "other" and include a link to the license details
-        if TYPE_LICENSE_MAP.get(type_name) == "other":
-            type_collection.add_link(
-                pystac.Link(
-                    rel="license",
-                    target="https://docs.overturemaps.org/attribution/",
-                    title="Overture Maps Attribution and Licensing",
-                )
-            )
+    This replaces listing the release, then each theme, then each type
+    (again, for `pyarrow.dataset` discovery), which costs several dependent
+    LIST round trips per type. The release directory is listed, then each
+    theme one page per type directory (see `iter_listing`), on a background
+    thread that runs ahead of the consumer (see `buffered`). A theme is
+    yielded when the last of its own pages is in, so its types can be
+    processed while the following themes are still being listed. Sizes are
+    kept so each footer takes a single tail read, see `make_fragments`.
 
-        type_collection.add_items(local_type_collections[type_name])
-
-        items = local_type_collections[type_name]
-        if items:
-            row_counts = [i.properties["num_rows"] for i in items]
-            row_group_counts = [i.properties["num_row_groups"] for i in items]
-            type_collection.summaries = pystac.Summaries(
-                {
-                    "num_rows": pystac.RangeSummary(
-                        minimum=min(row_counts), maximum=max(row_counts)
-                    ),
-                    "num_row_groups": pystac.RangeSummary(
-                        minimum=min(row_group_counts), maximum=max(row_group_counts)
-                    ),
-                }
-            )
+    Args:
+        filesystem: Filesystem holding the release
+        release_path: Path of the release directory, with or without s3://
 
-        type_collection.stac_extensions = [
-            "https://stac-extensions.github.io/table/v1.2.0/schema.json"
+    Yields:
+        tuple: A theme directory path, and its type name -> sorted
+        ``(path, size)`` data files
+    """
+    base = release_path.replace("s3://", "").rstrip("/")
+
+    def list_themes() -> Iterator[tuple[str, dict[str, list[tuple[str, int]]]]]:
+        theme_paths = [
+            info.path
+            for page in iter_listing(filesystem, base)
+            for info in page
+            if info.type == fs.FileType.Directory
         ]
-        type_collection.extra_fields = {
-            "table:columns": (
-                [{"name": name} for name in schema.names] if schema is not None else []
-            ),
-            "table:primary_geometry": "geometry",
-            "table:row_count": total_row_count,
-            "geoparquet:version": (
-                json.loads(schema.metadata[b"geo"]).get("version")
-                if schema is not None
-                else None
-            ),
+        for theme_path in theme_paths:
+            types: dict[str, list[tuple[str, int]]] = {}
+            for page in iter_listing(filesystem, theme_path, recursive=True):
+                for info in page:
+                    parts = info.path[len(theme_path) + 1 :].split("/")
+                    type_name = parts[0].split("=")[-1]
+                    if info.type == fs.FileType.Directory and len(parts) == 1:
+                        types.setdefault(type_name, [])
+                    elif (
+                        info.type == fs.FileType.File
+                        and len(parts) == 2
+                        # Skipped by `pyarrow.dataset` discovery too, e.g. _SUCCESS
+                        and not parts[1].startswith((".", "_"))
+                    ):
+                        types.setdefault(type_name, []).append((info.path, info.size))
+            for files in types.values():
+                files.sort()
+            yield theme_path, types
+
+    yield from buffered(list_themes())
+
+
+def list_release_tree(
+    filesystem: fs.FileSystem, release_path: str
+) -> tuple[list[str], dict[str, dict[str, list[tuple[str, int]]]]]:
+    """
+    List a whole release and parse it into a tree, see `iter_release_themes`.
+
+    Args:
+        filesystem: Filesystem holding the release
+        release_path: Path of the release directory, with or without s3://
+
+    Returns:
+        tuple: The theme directory paths, and theme name -> type name ->
+        sorted ``(path, size)`` data files
+    """
+    theme_paths: list[str] = []
+    tree: dict[str, dict[str, list[tuple[str, int]]]] = {}
+    for theme_path, types in iter_release_themes(filesystem, release_path):
+        theme_paths.append(theme_path)
+        tree[theme_path.split("=")[-1]] = types
+    return sorted(theme_paths), tree
+
+
+def make_fragments(
+    filesystem: fs.FileSystem, files: list[tuple[str, int]]
+) -> list[ParquetFooter]:
+    """
+    Wrap listed ``(path, size)`` files for their footers.
+
+    Each footer then costs one tail read, see `read_footer`, instead of
+    the size lookup and footer-length read a dataset fragment may need.
+    """
+    return [ParquetFooter(filesystem, path, size) for path, size in files]
+
+
+def prefetch_footers(
+    fragments: Iterable, pool: Executor, depth: int = FOOTER_QUEUE_DEPTH
+) -> Iterator:
+    """
+    Yield ``fragments`` in order, with their footers read ahead on ``pool``.
+
+    At most ``depth`` footer reads are queued at a time, so the first
+    fragments can be processed while later footers are still in flight.
+    """
+    pending: deque = deque()
+    for fragment in fragments:
+        pending.append((fragment, pool.submit(fragment.ensure_complete_metadata)))
+        if len(pending) >= depth:
+            done, future = pending.popleft()
+            future.result()
+            yield done
+    while pending:
+        done, future = pending.popleft()
+        future.result()
+        yield done
+
+
+def process_theme_worker(
+    theme_path: str,
+    release_path: str,
+    s3_region: str,
+    debug: bool,
+    release_datetime: datetime,
+    release: str,
+    available_pmtiles: dict[str, str],
+    profile: str = "full",
+    row_group_index: Optional[str] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+    resume: bool = False,
+    filesystem: Optional[fs.FileSystem] = None,
+    footer_pool: Optional[Executor] = None,
+    type_files: Optional[dict[str, list[tuple[str, int]]]] = None,
+) -> ThemeResult:
+    """
+    Worker function to process a single theme independently.
+
+    This function runs in a separate process and returns all results
+    instead of mutating shared state.
+
+    Args:
+        theme_path: Path to the theme directory
+        release_path: S3 path to the release
+        s3_region: AWS region
+        debug: Debug mode flag
+        release_datetime: Release datetime
+        release: Release version string
+        available_pmtiles: Dict of available PMTiles files for this release
+        profile: Output profile, one of `OUTPUT_PROFILES`
+        row_group_index: Where to record per-row-group bboxes, one of
+            `ROW_GROUP_INDEX_MODES`, or None to skip them
+        checkpoints: Where to checkpoint each finished type
+        resume: Load types that already have a checkpoint instead of
+            rebuilding them
+        filesystem: Filesystem shared with other themes in this process;
+            defaults to the worker's own, see `worker_filesystem`
+        footer_pool: Thread pool to fetch each type's footers on
+            concurrently, see `prefetch_footers`; when omitted they are read
+            one by one
+        type_files: The theme's ``(path, size)`` files per type from
+            `iter_release_themes`; when omitted the theme and its types are
+            listed here
+
+    Returns:
+        ThemeResult: theme catalog, manifest items, items per type, theme
+        name, item size and schema stats, and row-group index records
+    """
+    logger = logging.getLogger("pystac")
+
+    # The worker's long-lived connection, see `init_worker`
+    if filesystem is None:
+        filesystem = worker_filesystem(s3_region)
+
+    theme_name = theme_path.split("=")[-1]
+    logger.info(f"Processing Theme: {theme_name}")
+
+    if type_files is None:
+        # Not listed up front (see `iter_release_themes`), so list the theme here
+        theme_types = {
+            info.path.split("=")[-1]: info.path
+            for page in iter_listing(filesystem, theme_path)
+            for info in page
         }
+    else:
+        theme_types = dict.fromkeys(type_files)
+
+    type_results = []
+    for type_name, type_path in theme_types.items():
+        checkpoint = (
+            checkpoints.load(theme_name, type_name)
+            if checkpoints is not None and resume
+            else None
+        )
+        if checkpoint is not None:
+            logger.info(f"Resuming Type from checkpoint: {type_name}")
+            result = TypeResult.from_dict(checkpoint)
+        else:
+            logger.info(f"Opening Type: {type_name}")
+            if type_files is not None:
+                files = type_files[type_name]
+                all_fragments = make_fragments(
+                    filesystem, files[:3] if debug else files
+                )
+            else:
+                type_dataset = ds.dataset(
+                    type_path, filesystem=filesystem, format="parquet"
+                )
+
+                # Get all fragments
+                all_fragments = list(type_dataset.get_fragments())
+                if debug:
+                    all_fragments = all_fragments[:3]
+            result = process_type(
+                type_name,
+                all_fragments,
+                release_datetime,
+                profile,
+                row_group_index,
+                footer_pool=footer_pool,
+            )
+            if checkpoints is not None:
+                checkpoints.save(theme_name, type_name, result.to_dict())
+        type_results.append(result)
+
+    return assemble_theme(
+        theme_name, type_results, release, available_pmtiles, debug, profile
+    )
+
+
+def discover_pmtiles(filesystem: fs.FileSystem, release: str) -> dict[str, str]:
+    """
+    Discover available PMTiles files for ``release``.
 
-        if not debug:
-            type_collection.extra_fields["features"] = total_row_count
+    Returns:
+        dict: Mapping of base names (without .pmtiles) to full S3 paths
+    """
+    logger = logging.getLogger("pystac")
+    pmtiles_path: str = f"{PMTILES_ROOT}/{release}"
+    available_pmtiles: dict[str, str] = {}
 
-        theme_catalog.add_child(type_collection, title=type_name)
+    try:
+        for page in iter_listing(filesystem, pmtiles_path):
+            for file_info in page:
+                if file_info.path.endswith(".pmtiles"):
+                    filename = file_info.path.split("/")[-1]
+                    base_name = filename.replace(".pmtiles", "")
+                    available_pmtiles[base_name] = file_info.path
+                    logger.debug(f"Found PMTiles: {filename}")
 
-    return (theme_catalog, local_manifest_items, local_type_collections, theme_name)
+        logger.info(
+            f"Discovered {len(available_pmtiles)} PMTiles files for release {release}"
+        )
+    except Exception as e:
+        logger.warning(f"Couldn't find PMTiles for release: {release}: {e}")
+
+    return available_pmtiles
+
+
+def discover_all_pmtiles(filesystem: fs.FileSystem) -> dict[str, dict[str, str]]:
+    """
+    Discover the PMTiles files of every release in one recursive listing.
+
+    Returns:
+        dict: Release id -> base names (without .pmtiles) -> full S3 paths;
+        releases without PMTiles are missing
+    """
+    logger = logging.getLogger("pystac")
+    pmtiles: dict[str, dict[str, str]] = {}
+
+    try:
+        for page in iter_listing(filesystem, PMTILES_ROOT, recursive=True):
+            for file_info in page:
+                parts = file_info.path[len(PMTILES_ROOT) + 1 :].split("/")
+                if len(parts) == 2 and parts[1].endswith(".pmtiles"):
+                    release, filename = parts
+                    base_name = filename.replace(".pmtiles", "")
+                    pmtiles.setdefault(release, {})[base_name] = file_info.path
+
+        logger.info(f"Discovered PMTiles files for {len(pmtiles)} releases")
+    except Exception as e:
+        logger.warning(f"Couldn't list PMTiles under {PMTILES_ROOT}: {e}")
+
+    return pmtiles
 
 
 class OvertureRelease:
@@ -395,11 +1323,43 @@ class OvertureRelease:
         self,
         release: str,
         schema: str,
-        output: Path,
+        output: Union[Path, str],
         s3_release_path: str = "s3://overturemaps-us-west-2/release",
         s3_region: str = "us-west-2",
         debug: bool = False,
+        writer: Optional[CatalogWriter] = None,
+        profile: str = "full",
+        row_group_index: Optional[str] = None,
+        tile_index_zooms: Optional[tuple[int, ...]] = None,
+        item_page_size: Optional[int] = None,
+        pgstac_export: Optional[str] = None,
+        all_releases: bool = False,
+        checkpoint: bool = False,
+        resume: bool = False,
+        available_pmtiles: Optional[dict[str, str]] = None,
+        filesystem: Optional[fs.FileSystem] = None,
+        discovery: Optional[Discovery] = None,
     ):
+        if profile not in OUTPUT_PROFILES:
+            raise ValueError(f"Unknown output profile: {profile}")
+        if row_group_index is not None and row_group_index not in ROW_GROUP_INDEX_MODES:
+            raise ValueError(f"Unknown row group index mode: {row_group_index}")
+        if tile_index_zooms and not all(
+            1 <= zoom <= MAX_TILE_INDEX_ZOOM for zoom in tile_index_zooms
+        ):
+            raise ValueError(
+                f"Tile index zooms must be between 1 and {MAX_TILE_INDEX_ZOOM}"
+            )
+        if item_page_size is not None and item_page_size < 1:
+            raise ValueError(f"Item page size must be at least 1: {item_page_size}")
+        if pgstac_export is not None and pgstac_export not in PGSTAC_EXPORT_FORMATS:
+            raise ValueError(f"Unknown pgstac export format: {pgstac_export}")
+        self.profile = profile
+        self.row_group_index = row_group_index
+        self.tile_index_zooms = tile_index_zooms
+        self.item_page_size = item_page_size
+        self.pgstac_export = pgstac_export
+        self.all_releases = all_releases
         self.debug = debug
         if self.debug:
             self.logger.setLevel(logging.DEBUG)
@@ -407,18 +1367,56 @@ class OvertureRelease:
         self.release = release
         self.schema = schema
         self.release_path = f"{s3_release_path}/{self.release}"
-        self.filesystem = fs.S3FileSystem(anonymous=True, region=s3_region)
+        # Any pyarrow filesystem holding the release; anonymous S3 by default
+        self.filesystem = (
+            filesystem
+            if filesystem is not None
+            else fs.S3FileSystem(anonymous=True, region=s3_region)
+        )
 
         self.manifest_items = []
         self.type_collections = {}
-
-        self.output = Path(output, self.release)
-        self.output.mkdir(parents=True, exist_ok=True)
+        self.row_groups: list[dict] = []
+        self.theme_paths: list[str] = []
+        self.release_tree: dict[str, dict[str, list[tuple[str, int]]]] = {}
+        self.stats: dict[str, int] = {}
+        # Per-stage counters of the last "pipeline" build, see `ReleasePipeline`
+        self.pipeline_metrics: dict[str, dict] = {}
+
+        # ``output`` may be a local path or an object store URI (s3://...).
+        self.writer = writer if writer is not None else CatalogWriter(output)
+
+        # Per-type checkpoints under the output root; --resume reuses them.
+        self.resume = resume
+        self.checkpoints = (
+            CheckpointStore.for_release(self.writer, release)
+            if checkpoint or resume
+            else None
+        )
 
         self.release_datetime = datetime.strptime(release.split(".")[0], "%Y-%m-%d")
 
-        # Discover available PMTiles for this release
-        self.available_pmtiles = self._get_available_pmtiles()
+        # PMTiles of this release, unless already known (e.g. from a build
+        # plan); otherwise looked up on first use, see `available_pmtiles`
+        self.discovery = discovery
+        self._available_pmtiles = available_pmtiles
+
+    @property
+    def available_pmtiles(self) -> dict[str, str]:
+        """
+        PMTiles files of this release, by base name.
+
+        They are first needed when the first theme is dispatched, so the
+        lookup overlaps with listing the release. With a ``discovery`` they
+        come from its invocation-wide lookup instead.
+        """
+        if self._available_pmtiles is None:
+            self._available_pmtiles = (
+                self.discovery.pmtiles(self.release)
+                if self.discovery is not None
+                else self._get_available_pmtiles()
+            )
+        return self._available_pmtiles
 
     def _get_available_pmtiles(self) -> dict[str, str]:
         """
@@ -427,29 +1425,7 @@ class OvertureRelease:
         Returns:
             dict: Mapping of base names (without .pmtiles) to full S3 paths
         """
-        pmtiles_path: str = f"overturemaps-extras-us-west-2/tiles/{self.release}"
-        available_pmtiles: dict[str, str] = {}
-
-        try:
-            pmtiles_selector = fs.FileSelector(pmtiles_path)
-            pmtiles_files = self.filesystem.get_file_info(pmtiles_selector)
-
-            for file_info in pmtiles_files:
-                if file_info.path.endswith(".pmtiles"):
-                    filename = file_info.path.split("/")[-1]
-                    base_name = filename.replace(".pmtiles", "")
-                    available_pmtiles[base_name] = file_info.path
-                    self.logger.debug(f"Found PMTiles: {filename}")
-
-            self.logger.info(
-                f"Discovered {len(available_pmtiles)} PMTiles files for release {self.release}"
-            )
-        except Exception as e:
-            self.logger.warning(
-                f"Couldn't find PMTiles for release: {self.release}: {e}"
-            )
-
-        return available_pmtiles
+        return discover_pmtiles(self.filesystem, self.release)
 
     def make_release_catalog(self, title: Optional[str]) -> None:
         self.logger.info(
@@ -468,89 +1444,320 @@ class OvertureRelease:
             "schema:tag": f"https://github.com/OvertureMaps/schema/releases/tag/v{self.schema}",
         }
 
-    def get_release_themes(self) -> None:
-        release_path_selector = fs.FileSelector(self.release_path.replace("s3://", ""))
-        self.themes = self.filesystem.get_file_info(release_path_selector)
+    def get_release_themes(self) -> Iterator[str]:
+        """
+        Yield each theme path as soon as the release listing has all of it.
 
-    def build_release_catalog(self, title: str, max_workers: int = 4) -> None:
+        The release is listed once, see `iter_release_themes`, and
+        `theme_paths` and `release_tree` fill up as the themes arrive.
+        """
+        self.theme_paths, self.release_tree = [], {}
+        for theme_path, types in iter_release_themes(
+            self.filesystem, self.release_path
+        ):
+            self.theme_paths.append(theme_path)
+            self.release_tree[theme_path.split("=")[-1]] = types
+            yield theme_path
+
+    def build_release_catalog(
+        self,
+        title: str,
+        max_workers: int = 4,
+        pool: Optional[Executor] = None,
+        executor: str = "processes",
+        stage_concurrency: Optional[dict[str, int]] = None,
+    ) -> None:
         """
         Build release catalog using parallel processing.
 
         Args:
             title: Title for the release catalog
             max_workers: Number of parallel workers (default: 4)
+            pool: Worker pool to run themes on, e.g. one `make_worker_pool`
+                shared by every release of the run. When omitted, a pool of
+                ``max_workers`` is created for this release.
+            executor: How to run themes, one of `EXECUTORS`. ``pool`` only
+                applies to ``processes``.
+            stage_concurrency: Workers per stage of the ``pipeline``
+                executor, which uses them instead of ``max_workers``
         """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+
         self.make_release_catalog(title=title)
-        self.get_release_themes()
+        if executor == "pipeline":
+            # Imported here: the pipeline module builds on this one
+            from overture_stac.pipeline import ReleasePipeline
+
+            self.logger.info("Processing the release as a staged pipeline...")
+            pipeline = ReleasePipeline(self, stage_concurrency)
+            results = asyncio.run(pipeline.run())
+            self.pipeline_metrics = {
+                stage: metrics.to_dict() for stage, metrics in pipeline.metrics.items()
+            }
+            self.write_results(results)
+            return
 
-        theme_paths = [theme.path for theme in self.themes]
+        # Themes are dispatched while the rest of the release is still listed
+        theme_paths = self.get_release_themes()
         s3_region = "us-west-2"
 
         # Process themes
-        if max_workers <= 1:
-            self.logger.info("Processing themes sequentially (in-process)...")
-            results = []
-            for theme_path in theme_paths:
-                results.append(
-                    process_theme_worker(
-                        theme_path,
-                        self.release_path,
-                        s3_region,
-                        self.debug,
-                        self.release_datetime,
-                        self.release,
-                        self.available_pmtiles,
+        if executor != "processes":
+            self.logger.info(
+                f"Processing themes on {executor} in-process, {max_workers} at a time..."
+            )
+            with ThreadPoolExecutor(
+                max_workers=FOOTER_FETCH_WORKERS, thread_name_prefix="footers"
+            ) as footer_pool:
+                if executor == "threads":
+                    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as threads:
+                        results = self._run_themes(
+                            threads, theme_paths, s3_region, footer_pool
+                        )
+                else:
+                    results = asyncio.run(
+                        self._run_themes_async(
+                            theme_paths, s3_region, max_workers, footer_pool
+                        )
                     )
+        elif pool is not None:
+            self.logger.info("Processing themes in parallel on the shared pool...")
+            results = self._run_themes(pool, theme_paths, s3_region)
+        elif max_workers <= 1:
+            self.logger.info("Processing themes sequentially (in-process)...")
+            results = [
+                process_theme_worker(
+                    **self._worker_kwargs(theme_path, s3_region),
+                    filesystem=self.filesystem,
                 )
+                for theme_path in theme_paths
+            ]
         else:
             self.logger.info(
                 f"Processing themes in parallel with {max_workers} workers..."
             )
-            results = []
-            with ProcessPoolExecutor(max_workers=max_workers) as executor:
-                future_to_theme = {
-                    executor.submit(
-                        process_theme_worker,
-                        theme_path,
-                        self.release_path,
-                        s3_region,
-                        self.debug,
-                        self.release_datetime,
-                        self.release,
-                        self.available_pmtiles,
-                    ): theme_path
-                    for theme_path in theme_paths
-                }
-
-                for future in as_completed(future_to_theme):
-                    theme_path = future_to_theme[future]
-                    try:
-                        results.append(future.result())
-                    except Exception as exc:
-                        self.logger.error(
-                            f"Theme {theme_path} generated an exception: {exc}"
-                        )
-                        raise
+            with make_worker_pool(max_workers, s3_region, self.filesystem) as workers:
+                results = self._run_themes(workers, theme_paths, s3_region)
+
+        self.write_results(results)
+
+    def _worker_kwargs(self, theme_path: str, s3_region: str) -> dict:
+        """`process_theme_worker` arguments for one theme, except the executor's."""
+        return {
+            "theme_path": theme_path,
+            "release_path": self.release_path,
+            "s3_region": s3_region,
+            "debug": self.debug,
+            "release_datetime": self.release_datetime,
+            "release": self.release,
+            "available_pmtiles": self.available_pmtiles,
+            "profile": self.profile,
+            "row_group_index": self.row_group_index,
+            "checkpoints": self.checkpoints,
+            "resume": self.resume,
+            "type_files": self.release_tree.get(theme_path.split("=")[-1]),
+        }
 
-        for theme_catalog, manifest_items, type_collections, theme_name in results:
-            self.logger.info(f"Merging results for theme: {theme_name}")
-            self.release_catalog.add_child(child=theme_catalog, title=theme_name)
-            self.manifest_items.extend(manifest_items)
-            self.type_collections.update(type_collections)
+    def _run_themes(
+        self,
+        executor: Executor,
+        theme_paths: Iterable[str],
+        s3_region: str,
+        footer_pool: Optional[Executor] = None,
+    ) -> list[ThemeResult]:
+        """
+        Run `process_theme_worker` for every theme on ``executor``.
+
+        Each theme is submitted as soon as ``theme_paths`` yields it. With a
+        ``footer_pool`` the themes run in this process, so they share this
+        release's filesystem.
+        """
+        shared = (
+            {"filesystem": self.filesystem, "footer_pool": footer_pool}
+            if footer_pool is not None
+            else {}
+        )
+        future_to_theme = {
+            executor.submit(
+                process_theme_worker,
+                **self._worker_kwargs(theme_path, s3_region),
+                **shared,
+            ): theme_path
+            for theme_path in theme_paths
+        }
+
+        results = []
+        for future in as_completed(future_to_theme):
+            theme_path = future_to_theme[future]
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                self.logger.error(f"Theme {theme_path} generated an exception: {exc}")
+                raise
+        return results
+
+    async def _run_themes_async(
+        self,
+        theme_paths: Iterator[str],
+        s3_region: str,
+        max_workers: int,
+        footer_pool: Executor,
+    ) -> list[ThemeResult]:
+        """
+        Run every theme as an asyncio task, at most ``max_workers`` at once.
+
+        ``theme_paths`` is advanced on a thread, so the event loop keeps
+        running the themes already started while the listing continues.
+        """
+        limit = asyncio.Semaphore(max(max_workers, 1))
+
+        async def run(theme_path: str) -> ThemeResult:
+            async with limit:
+                return await asyncio.to_thread(
+                    process_theme_worker,
+                    **self._worker_kwargs(theme_path, s3_region),
+                    filesystem=self.filesystem,
+                    footer_pool=footer_pool,
+                )
 
-            theme_path_dir = Path(self.output, theme_name)
-            theme_path_dir.mkdir(parents=True, exist_ok=True)
+        tasks = []
+        while (
+            theme_path := await asyncio.to_thread(next, theme_paths, None)
+        ) is not None:
+            tasks.append(asyncio.create_task(run(theme_path)))
+        return list(await asyncio.gather(*tasks))
 
-        # Write outputs
-        with open(f"{self.output}/manifest.geojson", "w") as f:
-            json.dump({"type": "FeatureCollection", "features": self.manifest_items}, f)
+    def write_results(self, results: list[ThemeResult]) -> None:
+        """
+        Add theme results to the release catalog and write the release outputs.
+
+        Themes finish in whatever order the executor runs them, so they are
+        merged by name, as `merge_partials` does; an unchanged release is then
+        written byte for byte the same on every run.
+
+        Args:
+            results: One `ThemeResult` per theme, in any order
+        """
+        for result in sorted(results, key=lambda result: result.theme_name):
+            self.logger.info(f"Merging results for theme: {result.theme_name}")
+            self.release_catalog.add_child(
+                child=result.theme_catalog, title=result.theme_name
+            )
+            self.manifest_items.extend(result.manifest_items)
+            self.type_collections.update(result.type_collections)
+            self.row_groups.extend(result.row_groups or [])
+            for key, value in result.stats.items():
+                self.stats[key] = self.stats.get(key, 0) + value
+
+        self.log_stats()
+
+        # Write outputs; both are streamed so object stores get multipart uploads.
+        self.writer.write_json_stream(
+            f"{self.release}/manifest.geojson",
+            {"type": "FeatureCollection", "features": self.manifest_items},
+        )
+
+        if self.tile_index_zooms:
+            tiles = write_tile_index(
+                self.writer, self.release, self.manifest_items, self.tile_index_zooms
+            )
+            self.logger.info(
+                f"Indexed {len(self.manifest_items)} fragments into {tiles} tiles "
+                f"at zooms {sorted(self.tile_index_zooms)}"
+            )
 
         # Write GeoParquet Collections
         all_items = []
         for _ovt_type, items in self.type_collections.items():
             all_items += items
 
-        stac_geoparquet.arrow.to_parquet(
-            table=stac_geoparquet.arrow.parse_stac_items_to_arrow(all_items),
-            output_path=f"{self.output}/collections.parquet",
+        # Materialized (not a one-shot reader) so --changes can diff it too.
+        self.collections_table = stac_geoparquet.arrow.parse_stac_items_to_arrow(
+            all_items
+        ).read_all()
+        self.writer.write_parquet(
+            f"{self.release}/collections.parquet", self.collections_table
         )
+
+        if self.all_releases:
+            write_release_partitions(self.writer, self.release, self.type_collections)
+
+        if self.row_group_index == "sidecar":
+            self.writer.write_parquet(
+                f"{self.release}/{ROW_GROUPS_FILENAME}",
+                row_groups_table(self.row_groups),
+                stac=False,
+            )
+
+    def log_stats(self) -> None:
+        """Log this run's stats, including what the output profile saved."""
+        items = self.stats.get("items", 0)
+        item_bytes = self.stats.get("item_bytes", 0)
+        full_bytes = self.stats.get("item_bytes_full", 0)
+        if full_bytes:
+            reduction = 100 * (full_bytes - item_bytes) / full_bytes
+            self.logger.info(
+                f"Run stats for {self.release}: {items} items, {item_bytes:,} bytes "
+                f"of item JSON ({self.profile} profile, {reduction:.1f}% smaller "
+                "than full)"
+            )
+        else:
+            self.logger.info(
+                f"Run stats for {self.release}: {items} items ({self.profile} profile)"
+            )
+        footer_requests = self.stats.get("footer_requests", 0)
+        if footer_requests and items:
+            self.logger.info(
+                f"Footer reads for {self.release}: {footer_requests} requests, "
+                f"{footer_requests / items:.2f} per fragment"
+            )
+        drifted = self.stats.get("schema_drift_fragments", 0)
+        if drifted:
+            self.logger.warning(
+                f"{drifted} fragments in {self.release} differ from their type's "
+                "first schema; see the per-type warnings above"
+            )
+
+    def save(self, root_href: str) -> None:
+        """
+        Normalize hrefs under ``root_href`` and write the release catalog.
+
+        With an ``item_page_size``, each type collection's items are also
+        written as paginated `overture_stac.item_pages` FeatureCollections,
+        linked from the collection as ``rel="items"``. With a
+        ``pgstac_export``, the collections and items are also streamed into
+        NDJSON for pgstac, see `write_pgstac_export`.
+        """
+        self.release_catalog.normalize_hrefs(f"{root_href}/{self.release}/")
+        collections = list(self.release_catalog.get_all_collections())
+        if self.item_page_size is not None:
+            for collection in collections:
+                add_items_link(collection)
+        self.writer.save_catalog(
+            self.release_catalog,
+            catalog_type=pystac.CatalogType.ABSOLUTE_PUBLISHED,
+            rel_dir=self.release,
+        )
+        if self.pgstac_export is not None:
+            write_pgstac_export(
+                self.writer, self.release, collections, self.pgstac_export
+            )
+        if self.item_page_size is not None:
+            pages = 0
+            for collection in collections:
+                rel_dir = collection.get_self_href()[len(root_href) + 1 :]
+                pages += write_item_pages(
+                    self.writer,
+                    collection,
+                    rel_dir.rsplit("/", 1)[0],
+                    self.item_page_size,
+                )
+            self.logger.info(
+                f"Wrote {pages} item pages of up to {self.item_page_size} items "
+                f"for {len(collections)} collections of {self.release}"
+            )
+        if self.checkpoints is not None:
+            # Only drop the checkpoints once every output has been written.
+            self.writer.flush()
+            self.checkpoints.clear()
@@ -0,0 +1,86 @@
+"""Bulk newline-delimited JSON export of a release, ready for pgstac's loader."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Iterable, Iterator, Optional
+
+from overture_stac.lazy import lazy_import
+from overture_stac.writer import CatalogWriter
+
+pystac = lazy_import("pystac")
+
+PGSTAC_DIRNAME = "pgstac"
+# --pgstac-export value -> (file suffix, pyarrow codec)
+PGSTAC_EXPORT_FORMATS: dict[str, tuple[str, Optional[str]]] = {
+    "ndjson": (".ndjson", None),
+    "zstd": (".ndjson.zst", "zstd"),
+}
+
+
+def export_paths(release: str, export_format: str) -> tuple[str, str]:
+    """``(collections, items)`` export paths of ``release``, relative to the root."""
+    suffix = PGSTAC_EXPORT_FORMATS[export_format][0]
+    return (
+        f"{release}/{PGSTAC_DIRNAME}/collections{suffix}",
+        f"{release}/{PGSTAC_DIRNAME}/items{suffix}",
+    )
+
+
+def collection_record(collection: pystac.Collection) -> dict:
+    """
+    ``collection`` as pgstac stores it.
+
+    pgstac finds a collection's items through their ``collection`` field, so
+    the per-item ``item`` links are dropped.
+    """
+    record = collection.to_dict()
+    record["links"] = [link for link in record["links"] if link["rel"] != "item"]
+    return record
+
+
+def iter_item_records(collections: Iterable[pystac.Collection]) -> Iterator[dict]:
+    """Every item of ``collections``, in link order, as in its item file."""
+    for collection in collections:
+        for item in collection.get_items():
+            yield item.to_dict()
+
+
+def write_pgstac_export(
+    writer: CatalogWriter,
+    release: str,
+    collections: list[pystac.Collection],
+    export_format: str = "ndjson",
+) -> list[Future]:
+    """
+    Stream ``release``'s collections and items as NDJSON for pgstac.
+
+    Writes ``<release>/pgstac/collections.ndjson`` and
+    ``<release>/pgstac/items.ndjson`` (``.ndjson.zst`` when zstd-compressed),
+    one JSON document per line, which is what ``pypgstac load collections``
+    and ``pypgstac load items`` read. Every item carries its ``collection``
+    id, so a release loads with one sequential read of each file.
+
+    Args:
+        writer: Writer the catalog is saved with
+        release: Release version string
+        collections: Saved type collections, so every href is final
+        export_format: One of `PGSTAC_EXPORT_FORMATS`
+
+    Returns:
+        list: The queued uploads, see `CatalogWriter.write_ndjson_stream`
+    """
+    if export_format not in PGSTAC_EXPORT_FORMATS:
+        raise ValueError(f"Unknown pgstac export format: {export_format}")
+    compression = PGSTAC_EXPORT_FORMATS[export_format][1]
+    collections_path, items_path = export_paths(release, export_format)
+    return [
+        writer.write_ndjson_stream(
+            collections_path,
+            (collection_record(collection) for collection in collections),
+            compression=compression,
+        ),
+        writer.write_ndjson_stream(
+            items_path, iter_item_records(collections), compression=compression
+        ),
+    ]
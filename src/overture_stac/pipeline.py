@@ -0,0 +1,379 @@
+"""Asyncio release build in stages connected by bounded queues."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+from overture_stac.overture_stac import (
+    FOOTER_FETCH_WORKERS,
+    ThemeResult,
+    TypeBuilder,
+    TypeResult,
+    assemble_theme,
+    make_fragments,
+)
+
+if TYPE_CHECKING:
+    from overture_stac.overture_stac import OvertureRelease
+
+# In order: list the release, read each fragment's footer, render its item,
+# then checkpoint each finished type and assemble each finished theme. The
+# listing is one paged listing, so it always runs alone.
+PIPELINE_STAGES: tuple[str, ...] = ("list", "footers", "render", "write")
+DEFAULT_STAGE_CONCURRENCY: dict[str, int] = {
+    "list": 1,
+    "footers": FOOTER_FETCH_WORKERS,
+    "render": 4,
+    "write": 2,
+}
+# Capacity of each stage's input queue. A full queue holds back the stage
+# before it, so at most this many fragments wait between two stages.
+PIPELINE_QUEUE_SIZE = 2 * FOOTER_FETCH_WORKERS
+# Fragments of one type that may be in flight past the next one to render.
+# Footers finish out of order and the rest wait for it, so this bounds how
+# many a slow footer holds in memory.
+PIPELINE_REORDER_WINDOW = 2 * FOOTER_FETCH_WORKERS
+
+
+class StageMetrics:
+    """Counters of one pipeline stage and the queue that feeds it."""
+
+    def __init__(self, concurrency: int, queue_size: int) -> None:
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.processed = 0
+        self.busy_seconds = 0.0
+        # Time the stage's workers waited for input
+        self.idle_seconds = 0.0
+        # Time the previous stage waited for room in this stage's queue
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    def sample_depth(self, depth: int) -> None:
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    @property
+    def mean_queue_depth(self) -> float:
+        return self._depth_total / self._depth_samples if self._depth_samples else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "idle_seconds": round(self.idle_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "queue_size": self.queue_size,
+            "max_queue_depth": self.max_queue_depth,
+            "mean_queue_depth": round(self.mean_queue_depth, 2),
+        }
+
+
+class StageQueue:
+    """Bounded `asyncio.Queue` that records its depth and waits in ``metrics``."""
+
+    def __init__(self, metrics: StageMetrics) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(metrics.queue_size)
+        self.metrics = metrics
+
+    async def put(self, item) -> None:
+        start = time.perf_counter()
+        await self.queue.put(item)
+        self.metrics.blocked_seconds += time.perf_counter() - start
+        self.metrics.sample_depth(self.queue.qsize())
+
+    async def get(self):
+        start = time.perf_counter()
+        item = await self.queue.get()
+        self.metrics.idle_seconds += time.perf_counter() - start
+        return item
+
+    def task_done(self) -> None:
+        self.queue.task_done()
+
+    async def join(self) -> None:
+        await self.queue.join()
+
+
+class _ThemeJob:
+    """A theme whose types are in flight."""
+
+    def __init__(self, name: str, type_names: list[str]) -> None:
+        self.name = name
+        self.type_names = type_names
+        self.results: dict[str, TypeResult] = {}
+
+
+class _TypeJob:
+    """A type whose fragments are in flight, rendered in listing order."""
+
+    def __init__(
+        self,
+        theme: _ThemeJob,
+        builder: Optional[TypeBuilder],
+        result: Optional[TypeResult] = None,
+        window: int = PIPELINE_REORDER_WINDOW,
+    ) -> None:
+        self.theme = theme
+        self.builder = builder
+        # Set up front for types resumed from a checkpoint
+        self.result = result
+        self.ready: dict[int, object] = {}
+        self.next_index = 0
+        self.rendering = False
+        # Taken for each fragment listed, given back as each one is rendered
+        self.window = asyncio.Semaphore(window)
+
+
+class ReleasePipeline:
+    """
+    Build a release's themes as a pipeline of asyncio stages.
+
+    Each fragment goes through the stages in `PIPELINE_STAGES`, which are
+    connected by bounded queues of `PIPELINE_QUEUE_SIZE`. Every stage runs
+    its own number of workers, and the blocking work (listing pages,
+    footer reads, rendering items, writing checkpoints) runs on threads.
+    When a stage falls behind its queue fills up and the stages before it
+    wait, so memory stays flat however large the release is. Items are
+    rendered in listing order, and at most ``reorder_window`` fragments of a
+    type are in flight at once, so one slow footer can't leave the rest of
+    its type waiting in memory. `metrics`
+    records each stage's queue depth and waits; the stage whose queue is
+    fullest is the bottleneck.
+
+    Args:
+        release: Release to build; its catalog must already be made
+        concurrency: Workers per stage, by name in `PIPELINE_STAGES`;
+            unnamed stages use `DEFAULT_STAGE_CONCURRENCY`
+        queue_size: Capacity of each stage's input queue
+        reorder_window: Fragments per type in flight ahead of rendering
+    """
+
+    def __init__(
+        self,
+        release: OvertureRelease,
+        concurrency: Optional[dict[str, int]] = None,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        reorder_window: int = PIPELINE_REORDER_WINDOW,
+    ) -> None:
+        unknown = set(concurrency or {}) - set(PIPELINE_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {', '.join(sorted(unknown))}")
+        concurrency = {**DEFAULT_STAGE_CONCURRENCY, **(concurrency or {})}
+        concurrency["list"] = 1
+
+        self.release = release
+        self.reorder_window = reorder_window
+        self.logger = logging.getLogger("pystac")
+        self.metrics = {
+            stage: StageMetrics(
+                concurrency[stage], 0 if stage == "list" else queue_size
+            )
+            for stage in PIPELINE_STAGES
+        }
+        self.results: list[ThemeResult] = []
+
+    async def run(self) -> list[ThemeResult]:
+        """Run every stage until the whole release is built."""
+        loop = asyncio.get_running_loop()
+        # Room for every stage's workers, above the default thread count
+        threads = sum(metrics.concurrency for metrics in self.metrics.values())
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=threads, thread_name_prefix="pipeline")
+        )
+
+        self.footers = StageQueue(self.metrics["footers"])
+        self.render = StageQueue(self.metrics["render"])
+        self.write = StageQueue(self.metrics["write"])
+        stages = (
+            (self._read_footers, "footers"),
+            (self._render_items, "render"),
+            (self._write_types, "write"),
+        )
+        try:
+            async with asyncio.TaskGroup() as group:
+                workers = [
+                    group.create_task(stage())
+                    for stage, name in stages
+                    for _ in range(self.metrics[name].concurrency)
+                ]
+                await self._list_release()
+                for queue in (self.footers, self.render, self.write):
+                    await queue.join()
+                for worker in workers:
+                    worker.cancel()
+        except BaseExceptionGroup as group:
+            # Surface the failure itself, as the other executors do
+            error = group.exceptions[0]
+            while isinstance(error, BaseExceptionGroup):
+                error = error.exceptions[0]
+            raise error from None
+
+        self.log_metrics()
+        return self.results
+
+    async def _list_release(self) -> None:
+        """Stage 1: queue every fragment as soon as its theme is listed."""
+        release = self.release
+        metrics = self.metrics["list"]
+        themes = release.get_release_themes()
+        while True:
+            start = time.perf_counter()
+            theme_path = await asyncio.to_thread(next, themes, None)
+            metrics.busy_seconds += time.perf_counter() - start
+            if theme_path is None:
+                return
+
+            theme_name = theme_path.split("=")[-1]
+            self.logger.info(f"Processing Theme: {theme_name}")
+            type_files = release.release_tree[theme_name]
+            theme = _ThemeJob(theme_name, list(type_files))
+            if not type_files:
+                await self._finish_theme(theme)
+
+            for type_name, files in type_files.items():
+                checkpoint = (
+                    release.checkpoints.load(theme_name, type_name)
+                    if release.checkpoints is not None and release.resume
+                    else None
+                )
+                if checkpoint is not None:
+                    self.logger.info(f"Resuming Type from checkpoint: {type_name}")
+                    job = _TypeJob(theme, None, TypeResult.from_dict(checkpoint))
+                    await self.write.put(job)
+                    continue
+
+                self.logger.info(f"Opening Type: {type_name}")
+                fragments = make_fragments(
+                    release.filesystem, files[:3] if release.debug else files
+                )
+                job = _TypeJob(
+                    theme,
+                    TypeBuilder(
+                        type_name,
+                        len(fragments),
+                        release.release_datetime,
+                        release.profile,
+                        release.row_group_index,
+                    ),
+                    window=self.reorder_window,
+                )
+                if not fragments:
+                    await self.write.put(job)
+                for index, fragment in enumerate(fragments):
+                    # Waits while the type's window is full, for the fragment
+                    # at its start to be rendered
+                    await job.window.acquire()
+                    metrics.processed += 1
+                    await self.footers.put((job, index, fragment))
+
+    async def _read_footers(self) -> None:
+        """Stage 2: fetch each fragment's footer with one ranged read."""
+        metrics = self.metrics["footers"]
+        while True:
+            job, index, fragment = await self.footers.get()
+            start = time.perf_counter()
+            await asyncio.to_thread(fragment.ensure_complete_metadata)
+            metrics.busy_seconds += time.perf_counter() - start
+            metrics.processed += 1
+            await self.render.put((job, index, fragment))
+            self.footers.task_done()
+
+    async def _render_items(self) -> None:
+        """Stage 3: build each type's items, in listing order."""
+        metrics = self.metrics["render"]
+        while True:
+            job, index, fragment = await self.render.get()
+            job.ready[index] = fragment
+            # Fragments arriving while the type is being rendered are
+            # picked up by the worker rendering it
+            if not job.rendering:
+                job.rendering = True
+                try:
+                    while job.next_index in job.ready:
+                        start = time.perf_counter()
+                        await asyncio.to_thread(
+                            job.builder.add, job.ready.pop(job.next_index)
+                        )
+                        metrics.busy_seconds += time.perf_counter() - start
+                        metrics.processed += 1
+                        job.next_index += 1
+                        job.window.release()
+                finally:
+                    job.rendering = False
+                if job.next_index == job.builder.total_fragments:
+                    await self.write.put(job)
+            self.render.task_done()
+
+    async def _write_types(self) -> None:
+        """Stage 4: checkpoint each finished type and assemble finished themes."""
+        metrics = self.metrics["write"]
+        checkpoints = self.release.checkpoints
+        while True:
+            job = await self.write.get()
+            start = time.perf_counter()
+            result = job.result
+            if result is None:
+                result = job.builder.result()
+                if checkpoints is not None:
+                    await asyncio.to_thread(
+                        checkpoints.save,
+                        job.theme.name,
+                        result.type_name,
+                        result.to_dict(),
+                    )
+            theme = job.theme
+            theme.results[result.type_name] = result
+            if len(theme.results) == len(theme.type_names):
+                await self._finish_theme(theme)
+            metrics.busy_seconds += time.perf_counter() - start
+            metrics.processed += 1
+            self.write.task_done()
+
+    async def _finish_theme(self, theme: _ThemeJob) -> None:
+        release = self.release
+        self.results.append(
+            await asyncio.to_thread(
+                assemble_theme,
+                theme.name,
+                [theme.results[type_name] for type_name in theme.type_names],
+                release.release,
+                release.available_pmtiles,
+                release.debug,
+                release.profile,
+            )
+        )
+
+    def log_metrics(self) -> None:
+        """Log each stage's counters and which stage held the others back."""
+        for stage, metrics in self.metrics.items():
+            m = metrics.to_dict()
+            self.logger.info(
+                f"Pipeline {stage}: {m['processed']} done by {m['concurrency']} "
+                f"workers, busy {m['busy_seconds']}s, idle {m['idle_seconds']}s, "
+                f"queue depth mean {m['mean_queue_depth']} / max "
+                f"{m['max_queue_depth']} of {m['queue_size']}, upstream blocked "
+                f"{m['blocked_seconds']}s"
+            )
+        bottleneck = self.bottleneck()
+        if bottleneck is not None:
+            self.logger.info(f"Pipeline bottleneck: {bottleneck}")
+
+    def bottleneck(self) -> Optional[str]:
+        """The stage whose input queue was fullest on average, if any queued."""
+        queued = {
+            stage: metrics.mean_queue_depth / metrics.queue_size
+            for stage, metrics in self.metrics.items()
+            if metrics.queue_size and metrics.processed
+        }
+        if not queued or not any(queued.values()):
+            return None
+        return max(queued, key=queued.get)
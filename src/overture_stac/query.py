@@ -0,0 +1,143 @@
+"""Vectorized bbox queries over a release's ``collections.parquet``."""
+
+from __future__ import annotations
+
+import io
+import urllib.request
+from typing import Optional
+
+from overture_stac.lazy import lazy_import
+from overture_stac.writer import resolve_output
+
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+ds = lazy_import("pyarrow.dataset")
+
+COLLECTIONS_FILENAME = "collections.parquet"
+
+# Expression for each supported asset's href in the stac-geoparquet `assets` struct.
+ASSET_HREF_FIELDS: dict[str, tuple[str, ...]] = {
+    "aws": ("assets", "aws", "href"),
+    "azure": ("assets", "azure", "href"),
+    "s3": ("assets", "aws", "alternate", "s3", "href"),
+}
+
+
+class HttpRangeFile(io.RawIOBase):
+    """Seekable read-only view of an HTTP(S) resource using Range requests.
+
+    Lets Arrow read a remote Parquet footer and only the row groups that
+    survive pruning, instead of downloading the whole file.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.position = 0
+        request = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(request, timeout=30) as response:
+            self.size = int(response.headers["Content-Length"])
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        else:
+            self.position = self.size + offset
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        end = min(self.position + len(buffer), self.size)
+        if end <= self.position:
+            return 0
+        request = urllib.request.Request(
+            self.url, headers={"Range": f"bytes={self.position}-{end - 1}"}
+        )
+        with urllib.request.urlopen(request, timeout=30) as response:
+            data = response.read()
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+def collections_href(catalog: str, release: str) -> str:
+    """Location of ``release``'s ``collections.parquet`` under ``catalog``."""
+    return f"{catalog.rstrip('/')}/{release}/{COLLECTIONS_FILENAME}"
+
+
+def open_collections(source: str) -> ds.Fragment:
+    """
+    Open a ``collections.parquet`` for filtered scans.
+
+    Args:
+        source: Local path, pyarrow filesystem URI (``s3://...``) or HTTP(S) URL
+
+    Returns:
+        ds.Fragment: The file as a single Parquet fragment
+    """
+    parquet_format = ds.ParquetFileFormat()
+    if source.startswith(("http://", "https://")):
+        return parquet_format.make_fragment(
+            pa.PythonFile(HttpRangeFile(source), mode="r")
+        )
+    filesystem, path = resolve_output(source)
+    return parquet_format.make_fragment(path, filesystem=filesystem)
+
+
+def bbox_filter(bbox: list[float]) -> pc.Expression:
+    """Expression matching items whose bbox intersects ``bbox``."""
+    xmin, ymin, xmax, ymax = bbox
+    return (
+        (pc.field("bbox", "xmax") >= xmin)
+        & (pc.field("bbox", "xmin") <= xmax)
+        & (pc.field("bbox", "ymax") >= ymin)
+        & (pc.field("bbox", "ymin") <= ymax)
+    )
+
+
+def query_collections(
+    source: str,
+    bbox: list[float],
+    types: Optional[list[str]] = None,
+    asset: str = "aws",
+) -> pa.Table:
+    """
+    Find the fragments of a release that intersect ``bbox``.
+
+    The filter runs as an Arrow expression over the bbox struct columns, so
+    row groups whose bbox/collection statistics can't match are skipped
+    without being read and no per-item Python code runs.
+
+    Args:
+        source: ``collections.parquet`` location, see `open_collections`
+        bbox: ``[xmin, ymin, xmax, ymax]`` in WGS84
+        types: Only return items of these collections (Overture types)
+        asset: Which href to return, one of `ASSET_HREF_FIELDS`
+
+    Returns:
+        pa.Table: ``collection``, ``id`` and ``href`` of every matching item
+    """
+    if asset not in ASSET_HREF_FIELDS:
+        raise ValueError(f"Unknown asset: {asset}")
+
+    expression = bbox_filter(bbox)
+    if types:
+        expression = expression & pc.field("collection").isin(types)
+
+    return open_collections(source).to_table(
+        columns={
+            "collection": pc.field("collection"),
+            "id": pc.field("id"),
+            "href": pc.field(*ASSET_HREF_FIELDS[asset]),
+        },
+        filter=expression,
+    )
@@ -1,7 +1,12 @@
+from __future__ import annotations
+
 import logging
 
-import pyarrow.dataset as ds
-import pyarrow.fs as fs
+from overture_stac.lazy import lazy_import
+from overture_stac.listing import buffered, iter_listing
+
+ds = lazy_import("pyarrow.dataset")
+fs = lazy_import("pyarrow.fs")
 
 
 class RegistryManifest:
@@ -33,18 +38,19 @@ class RegistryManifest:
         """
         self.logger.info(f"Scanning registry path: {self.registry_path}")
 
-        # Get all files in the registry directory
-        registry_selector = fs.FileSelector(self.registry_path, recursive=True)
-        all_files = self.filesystem.get_file_info(registry_selector)
+        # Listed page by page on a background thread, so the first files are
+        # read while the rest of the registry is still being listed
+        pages = buffered(
+            iter_listing(self.filesystem, self.registry_path, recursive=True)
+        )
 
         # Filter for parquet files only
-        parquet_files = [
+        parquet_files = (
             f
-            for f in all_files
+            for page in pages
+            for f in page
             if f.path.endswith(".parquet") and f.type == fs.FileType.File
-        ]
-
-        self.logger.info(f"Found {len(parquet_files)} parquet files in registry")
+        )
 
         # List to store [filename, min_id] tuples
         manifest_entries = []
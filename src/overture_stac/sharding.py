@@ -0,0 +1,368 @@
+"""Split a build into shards that run independently and merge their partials.
+
+``gen-stac plan`` lists every type's fragments once and writes a plan that
+splits them into chunks balanced across N shards. ``gen-stac run --shard
+i/N`` builds one shard's chunks and writes each as a partial `TypeResult`,
+and ``gen-stac merge`` assembles the release catalogs, ``manifest.geojson``
+and ``collections.parquet`` from the partials. Themes, types and chunks are
+merged in sorted order, so the output doesn't depend on the shard count or
+on which shard finished first.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from overture_stac.all_releases import prune_release_partitions
+from overture_stac.checkpoint import CheckpointStore
+from overture_stac.diff import add_changes_link
+from overture_stac.lazy import lazy_import
+from overture_stac.overture_stac import (
+    FOOTER_FETCH_WORKERS,
+    OUTPUT_PROFILES,
+    ROW_GROUP_INDEX_MODES,
+    OvertureRelease,
+    TypeResult,
+    assemble_theme,
+    build_root_catalog,
+    combine_type_results,
+    discover_pmtiles,
+    link_neighbor_releases,
+    list_release_tree,
+    make_fragments,
+    process_type,
+)
+from overture_stac.writer import CatalogWriter, resolve_output
+
+if TYPE_CHECKING:
+    from overture_stac.discovery import Discovery
+
+fs = lazy_import("pyarrow.fs")
+
+PLAN_VERSION = 2
+RELEASE_ROOT = "overturemaps-us-west-2/release"
+# Chunks per shard; more than one lets the greedy assignment even out types
+# of very different sizes.
+CHUNKS_PER_SHARD = 4
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a 0-based ``i/N`` shard spec into ``(i, N)``."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must be i/N, got {value!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..N-1, got {value!r}")
+    return index, count
+
+
+def assign_units(sizes: list[int], shards: int) -> list[list[int]]:
+    """
+    Greedily assign work units to shards, largest first, to balance fragments.
+
+    Returns:
+        list: Sorted unit indices for each shard
+    """
+    loads = [0] * shards
+    assignments: list[list[int]] = [[] for _ in range(shards)]
+    for unit in sorted(range(len(sizes)), key=lambda i: (-sizes[i], i)):
+        shard = min(range(shards), key=lambda s: (loads[s], s))
+        assignments[shard].append(unit)
+        loads[shard] += sizes[unit]
+    return [sorted(units) for units in assignments]
+
+
+def make_plan(
+    releases: list[dict],
+    shards: int,
+    filesystem: fs.FileSystem,
+    release_ids: list[str],
+    registry: Optional[dict] = None,
+    release_root: str = RELEASE_ROOT,
+    full: bool = False,
+    debug: bool = False,
+    profile: str = "full",
+    row_group_index: Optional[str] = None,
+    discovery: Optional[Discovery] = None,
+) -> dict:
+    """
+    List the releases' fragments and split them into shards.
+
+    Args:
+        releases: ``{"release", "schema", "title", "latest"}`` per release to build
+        shards: Number of shards
+        filesystem: Filesystem holding the releases
+        release_ids: Every published release id, newest first, for the
+            neighbor links and root catalog
+        registry: Root catalog ``registry`` field, or None
+        release_root: Path of the release directory on ``filesystem``
+        full: Whether this is a full rebuild, so the merge prunes outputs
+            that weren't written again
+        debug: Only plan the first 3 fragments of each type
+        profile: Output profile, one of `OUTPUT_PROFILES`
+        row_group_index: One of `ROW_GROUP_INDEX_MODES`, or None
+        discovery: Invocation-wide lookups to take each release's PMTiles
+            from; when omitted they are listed per release
+
+    Returns:
+        dict: The JSON-serializable plan
+    """
+    logger = logging.getLogger("pystac")
+    if shards < 1:
+        raise ValueError("Shard count must be at least 1")
+    if profile not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown output profile: {profile}")
+    if row_group_index is not None and row_group_index not in ROW_GROUP_INDEX_MODES:
+        raise ValueError(f"Unknown row group index mode: {row_group_index}")
+
+    types = []
+    plan_releases = []
+    for release in releases:
+        release_id = release["release"]
+        themes: dict[str, list[str]] = {}
+        _, tree = list_release_tree(filesystem, f"{release_root}/{release_id}")
+        for theme in sorted(tree):
+            themes[theme] = []
+            for type_name in sorted(tree[theme]):
+                paths = [list(file) for file in tree[theme][type_name]]
+                themes[theme].append(type_name)
+                types.append(
+                    (release_id, theme, type_name, paths[:3] if debug else paths)
+                )
+        plan_releases.append(
+            {
+                **release,
+                "available_pmtiles": (
+                    discovery.pmtiles(release_id)
+                    if discovery is not None
+                    else discover_pmtiles(filesystem, release_id)
+                ),
+                "themes": themes,
+            }
+        )
+
+    total = sum(len(paths) for *_, paths in types)
+    chunk_size = max(1, math.ceil(total / (shards * CHUNKS_PER_SHARD)))
+    units = []
+    for release_id, theme, type_name, paths in types:
+        # A type with no fragments is one empty chunk, so it still gets its
+        # (empty) collection, as in a single-machine build
+        starts = range(0, len(paths), chunk_size) or [0]
+        for chunk, start in enumerate(starts):
+            units.append(
+                {
+                    "release": release_id,
+                    "theme": theme,
+                    "type": type_name,
+                    "chunk": chunk,
+                    "fragments": paths[start : start + chunk_size],
+                }
+            )
+
+    assignments = assign_units([len(u["fragments"]) for u in units], shards)
+    logger.info(
+        f"Planned {total} fragments in {len(units)} chunks across {shards} shards"
+    )
+    return {
+        "version": PLAN_VERSION,
+        "shards": shards,
+        "full": full,
+        "options": {
+            "debug": debug,
+            "profile": profile,
+            "row_group_index": row_group_index,
+        },
+        "release_ids": release_ids,
+        "registry": registry,
+        "releases": plan_releases,
+        "units": units,
+        "assignments": assignments,
+    }
+
+
+def write_plan(location: str, plan: dict) -> None:
+    """Write ``plan`` to a local path or pyarrow filesystem URI."""
+    filesystem, path = resolve_output(location)
+    with filesystem.open_output_stream(path, compression=None) as f:
+        f.write(json.dumps(plan, indent=1).encode("utf-8"))
+
+
+def load_plan(location: str) -> dict:
+    """Read a plan written by `write_plan`."""
+    filesystem, path = resolve_output(location)
+    with filesystem.open_input_stream(path, compression=None) as f:
+        plan = json.loads(f.read())
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"Unsupported plan version: {plan.get('version')}")
+    return plan
+
+
+def _partial_name(unit: dict) -> str:
+    return f"{unit['type']}/{unit['chunk']:05d}"
+
+
+def _partial_store(filesystem: fs.FileSystem, base_path: str, release: str):
+    return CheckpointStore(filesystem, f"{base_path.rstrip('/')}/{release}")
+
+
+def run_shard(
+    plan: dict,
+    index: int,
+    partials_filesystem: fs.FileSystem,
+    partials_path: str,
+    filesystem: fs.FileSystem,
+    workers: int = FOOTER_FETCH_WORKERS,
+) -> int:
+    """
+    Build shard ``index`` of ``plan`` and write one partial per chunk.
+
+    Args:
+        plan: Plan from `make_plan`
+        index: 0-based shard index
+        partials_filesystem: Filesystem to write partials to
+        partials_path: Base path of the partials, shared by every shard
+        filesystem: Filesystem holding the releases' fragments
+        workers: Threads to fetch footers on, ahead of the fragment being
+            processed (see `prefetch_footers`)
+
+    Returns:
+        int: Number of chunks built
+    """
+    logger = logging.getLogger("pystac")
+    if not 0 <= index < plan["shards"]:
+        raise ValueError(f"Shard {index} is not in this {plan['shards']}-shard plan")
+
+    options = plan["options"]
+    units = [plan["units"][i] for i in plan["assignments"][index]]
+    with ThreadPoolExecutor(
+        max_workers=max(workers, 1), thread_name_prefix="footers"
+    ) as footer_pool:
+        for unit in units:
+            logger.info(
+                f"Shard {index}: {unit['release']} {unit['theme']}/{unit['type']} "
+                f"chunk {unit['chunk']} ({len(unit['fragments'])} fragments)"
+            )
+            fragments = make_fragments(filesystem, unit["fragments"])
+            result = process_type(
+                unit["type"],
+                fragments,
+                datetime.strptime(unit["release"].split(".")[0], "%Y-%m-%d"),
+                options["profile"],
+                options["row_group_index"],
+                footer_pool,
+            )
+            _partial_store(partials_filesystem, partials_path, unit["release"]).save(
+                unit["theme"], _partial_name(unit), result.to_dict()
+            )
+    return len(units)
+
+
+def merge_partials(
+    plan: dict,
+    partials_filesystem: fs.FileSystem,
+    partials_path: str,
+    writer: CatalogWriter,
+    root_href: str,
+    tile_index_zooms: Optional[tuple[int, ...]] = None,
+    item_page_size: Optional[int] = None,
+    pgstac_export: Optional[str] = None,
+    all_releases: bool = False,
+    changes: bool = False,
+) -> list[str]:
+    """
+    Assemble and write every planned release, then the root catalog.
+
+    The output options are those of a single-machine build; with
+    ``changes`` each release is diffed against the next older one published
+    under ``root_href``, see `add_changes_link`.
+
+    Raises:
+        FileNotFoundError: If a chunk's partial is missing, naming its shard
+
+    Returns:
+        list: Paths changed since the previous build, see
+        `CatalogWriter.finalize`
+    """
+    options = plan["options"]
+    unit_shards = {
+        unit: shard for shard, units in enumerate(plan["assignments"]) for unit in units
+    }
+    chunks: dict[tuple[str, str, str], list[tuple[int, int]]] = {}
+    for i, unit in enumerate(plan["units"]):
+        key = (unit["release"], unit["theme"], unit["type"])
+        chunks.setdefault(key, []).append((unit["chunk"], i))
+
+    for release in plan["releases"]:
+        release_id = release["release"]
+        store = _partial_store(partials_filesystem, partials_path, release_id)
+
+        theme_results = []
+        for theme in sorted(release["themes"]):
+            type_results = []
+            for type_name in sorted(release["themes"][theme]):
+                parts = []
+                for _, i in sorted(chunks[(release_id, theme, type_name)]):
+                    unit = plan["units"][i]
+                    partial = store.load(theme, _partial_name(unit))
+                    if partial is None:
+                        raise FileNotFoundError(
+                            f"Missing partial for {release_id} {theme}/{type_name} "
+                            f"chunk {unit['chunk']}; rerun shard "
+                            f"{unit_shards[i]}/{plan['shards']}"
+                        )
+                    parts.append(TypeResult.from_dict(partial))
+                type_results.append(combine_type_results(parts))
+            theme_results.append(
+                assemble_theme(
+                    theme,
+                    type_results,
+                    release_id,
+                    release["available_pmtiles"],
+                    options["debug"],
+                    options["profile"],
+                )
+            )
+
+        this_release = OvertureRelease(
+            release=release_id,
+            schema=release["schema"],
+            output=writer.base_path,
+            debug=options["debug"],
+            writer=writer,
+            profile=options["profile"],
+            row_group_index=options["row_group_index"],
+            tile_index_zooms=tile_index_zooms,
+            item_page_size=item_page_size,
+            pgstac_export=pgstac_export,
+            all_releases=all_releases,
+            available_pmtiles=release["available_pmtiles"],
+        )
+        this_release.make_release_catalog(title=release["title"])
+        this_release.write_results(theme_results)
+        link_neighbor_releases(
+            this_release.release_catalog, plan["release_ids"], root_href
+        )
+        if release.get("latest"):
+            this_release.release_catalog.extra_fields["latest"] = True
+        if changes:
+            add_changes_link(this_release, plan["release_ids"], root_href)
+        this_release.save(root_href)
+
+    if all_releases:
+        prune_release_partitions(writer, plan["release_ids"])
+
+    build_root_catalog(
+        output=writer.base_path,
+        root_href=root_href,
+        release_ids=plan["release_ids"],
+        registry=plan["registry"],
+        writer=writer,
+    )
+    # A full plan rebuilds everything, so drop outputs that weren't rewritten.
+    return writer.finalize(prune_missing=plan["full"])
@@ -0,0 +1,174 @@
+"""Static quadkey index mapping web-mercator tiles to the fragments covering them."""
+
+import math
+from collections import defaultdict
+from typing import Iterable, NamedTuple
+
+from overture_stac.writer import CatalogWriter
+
+TILE_INDEX_DIRNAME = "tiles"
+DEFAULT_TILE_INDEX_ZOOMS: tuple[int, ...] = (2, 4, 6)
+# Near-global fragments land in every tile, so deep zooms only multiply files.
+MAX_TILE_INDEX_ZOOM = 10
+# Fragments touching more tiles than this at a zoom are listed once in
+# index.json instead; a near-global one would cover ~10^6 tiles at zoom 10.
+MAX_FRAGMENT_TILES = 1024
+MAX_MERCATOR_LATITUDE = 85.0511287798066
+
+
+class TileIndex(NamedTuple):
+    """Fragments per tile, and those too wide to fan out to tiles."""
+
+    # {zoom: {quadkey: {type: [sorted rel_paths]}}}
+    tiles: dict[int, dict[str, dict[str, list[str]]]]
+    # {zoom: {type: [sorted rel_paths]}}, candidates for any tile of the zoom
+    wide: dict[int, dict[str, list[str]]]
+
+
+def lon_to_tile_x(lon: float, zoom: int) -> int:
+    """Column of the zoom-``zoom`` tile containing longitude ``lon``."""
+    n = 1 << zoom
+    return min(max(int((lon + 180.0) / 360.0 * n), 0), n - 1)
+
+
+def lat_to_tile_y(lat: float, zoom: int) -> int:
+    """Row of the zoom-``zoom`` tile containing latitude ``lat``."""
+    n = 1 << zoom
+    lat = min(max(lat, -MAX_MERCATOR_LATITUDE), MAX_MERCATOR_LATITUDE)
+    rad = math.radians(lat)
+    y = (1.0 - math.asinh(math.tan(rad)) / math.pi) / 2.0 * n
+    return min(max(int(y), 0), n - 1)
+
+
+def quadkey(x: int, y: int, zoom: int) -> str:
+    """Bing-style quadkey of tile ``x``/``y`` at ``zoom``."""
+    digits = []
+    for z in range(zoom, 0, -1):
+        mask = 1 << (z - 1)
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return "".join(digits)
+
+
+def tile_ranges(bbox: list[float], zoom: int) -> list[tuple[int, int, int, int]]:
+    """
+    First and last column, then first and last row, of the tiles of ``bbox``.
+
+    A bbox crossing the antimeridian (``xmin > xmax``, as GeoJSON writes it)
+    covers two ranges of columns, one on each side of it.
+    """
+    xmin, ymin, xmax, ymax = bbox
+    # Tile rows count down from the north.
+    y0, y1 = lat_to_tile_y(ymax, zoom), lat_to_tile_y(ymin, zoom)
+    x0, x1 = lon_to_tile_x(xmin, zoom), lon_to_tile_x(xmax, zoom)
+    if xmin <= xmax:
+        return [(x0, x1, y0, y1)]
+    if x1 >= x0:
+        # Both sides share a column, so every column is covered
+        return [(0, (1 << zoom) - 1, y0, y1)]
+    return [(x0, (1 << zoom) - 1, y0, y1), (0, x1, y0, y1)]
+
+
+def bbox_tile_count(bbox: list[float], zoom: int) -> int:
+    """Number of zoom-``zoom`` tiles intersecting ``bbox``, without listing them."""
+    return sum(
+        (x1 - x0 + 1) * (y1 - y0 + 1) for x0, x1, y0, y1 in tile_ranges(bbox, zoom)
+    )
+
+
+def bbox_quadkeys(bbox: list[float], zoom: int) -> Iterable[str]:
+    """Quadkeys of every zoom-``zoom`` tile intersecting ``bbox``."""
+    for x0, x1, y0, y1 in tile_ranges(bbox, zoom):
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield quadkey(x, y, zoom)
+
+
+def build_tile_index(
+    features: list[dict],
+    zooms: Iterable[int],
+    max_fragment_tiles: int = MAX_FRAGMENT_TILES,
+) -> TileIndex:
+    """
+    Map each tile touched by a fragment to that tile's fragments, per type.
+
+    A fragment touching more than ``max_fragment_tiles`` tiles at a zoom is
+    not added to each of them but listed once, as ``wide``, so the work and
+    the number of tile entries stay bounded however large its bbox is.
+
+    Args:
+        features: Manifest features, each with a ``bbox`` and ``ovt_type`` /
+            ``rel_path`` properties
+        zooms: Zoom levels to index
+        max_fragment_tiles: Most tiles a fragment is added to at one zoom
+
+    Returns:
+        TileIndex: The fragments of each tile, and the wide ones, per zoom
+    """
+    zooms = sorted(set(zooms))
+    for zoom in zooms:
+        if not 1 <= zoom <= MAX_TILE_INDEX_ZOOM:
+            raise ValueError(
+                f"Tile index zoom must be between 1 and {MAX_TILE_INDEX_ZOOM}: {zoom}"
+            )
+
+    index = TileIndex({}, {})
+    for zoom in zooms:
+        tiles: dict[str, dict[str, list[str]]] = defaultdict(lambda: defaultdict(list))
+        wide: dict[str, list[str]] = defaultdict(list)
+        for feature in features:
+            props = feature["properties"]
+            if bbox_tile_count(feature["bbox"], zoom) > max_fragment_tiles:
+                wide[props["ovt_type"]].append(props["rel_path"])
+                continue
+            for key in bbox_quadkeys(feature["bbox"], zoom):
+                tiles[key][props["ovt_type"]].append(props["rel_path"])
+        index.tiles[zoom] = {
+            key: {ovt_type: sorted(paths) for ovt_type, paths in sorted(types.items())}
+            for key, types in sorted(tiles.items())
+        }
+        index.wide[zoom] = {
+            ovt_type: sorted(paths) for ovt_type, paths in sorted(wide.items())
+        }
+    return index
+
+
+def write_tile_index(
+    writer: CatalogWriter,
+    release: str,
+    features: list[dict],
+    zooms: Iterable[int] = DEFAULT_TILE_INDEX_ZOOMS,
+) -> int:
+    """
+    Write one ``<release>/tiles/<zoom>/<quadkey>.json`` per non-empty tile.
+
+    Each file holds ``{"zoom", "quadkey", "collections": {type: [rel_path]}}``
+    so a client resolves a tile's inputs with a single small fetch; tiles no
+    fragment touches have no file. ``<release>/tiles/index.json`` lists the
+    indexed zooms and their tile counts, and under ``wide`` the fragments too
+    wide to list per tile at each zoom, which a client adds to any tile's
+    (see `build_tile_index`).
+
+    Returns:
+        int: Number of tile files queued
+    """
+    index = build_tile_index(features, zooms)
+    for zoom, tiles in index.tiles.items():
+        for key, collections in tiles.items():
+            writer.write_json(
+                f"{release}/{TILE_INDEX_DIRNAME}/{zoom}/{key}.json",
+                {"zoom": zoom, "quadkey": key, "collections": collections},
+            )
+    writer.write_json(
+        f"{release}/{TILE_INDEX_DIRNAME}/index.json",
+        {
+            "scheme": "quadkey",
+            "zooms": {str(zoom): len(tiles) for zoom, tiles in index.tiles.items()},
+            "href_template": f"{TILE_INDEX_DIRNAME}/{{zoom}}/{{quadkey}}.json",
+            "wide": {
+                str(zoom): collections
+                for zoom, collections in index.wide.items()
+                if collections
+            },
+        },
+    )
+    return sum(len(tiles) for tiles in index.tiles.values())
@@ -0,0 +1,333 @@
+"""Offline JSON-schema validation of catalog objects, in parallel across cores."""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import multiprocessing
+import urllib.request
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+from overture_stac.lazy import lazy_import
+from overture_stac.listing import iter_listing
+from overture_stac.overture_stac import ITEM_STAC_EXTENSIONS, TABLE_EXTENSION
+from overture_stac.writer import CONTENT_HASHES_FILENAME, resolve_output
+
+fastjsonschema = lazy_import("fastjsonschema")
+fs = lazy_import("pyarrow.fs")
+pystac = lazy_import("pystac")
+
+# Vendored schemas, stored under their URL: http(s)://<host>/<path> is
+# SCHEMA_DIR/<host>/<path>. `just update-schemas` refreshes the checkout's copy.
+SCHEMA_DIR = Path(__file__).parent / "schemas"
+
+STAC_VERSION = "1.1.0"
+STAC_SCHEMA_ROOT = "https://schemas.stacspec.org/v{version}"
+CORE_SCHEMAS: dict[str, str] = {
+    "Feature": "item-spec/json-schema/item.json",
+    "Collection": "collection-spec/json-schema/collection.json",
+    "Catalog": "catalog-spec/json-schema/catalog.json",
+}
+
+# Everything `vendor_schemas` fetches: the core schemas with the ones they
+# reference, and the extensions the catalog declares. Extension schemas that
+# aren't vendored yet are reported as unchecked rather than failing.
+SCHEMA_URLS: tuple[str, ...] = (
+    *(
+        f"{STAC_SCHEMA_ROOT.format(version=STAC_VERSION)}/{path}"
+        for path in (
+            *CORE_SCHEMAS.values(),
+            *(
+                f"item-spec/json-schema/{name}.json"
+                for name in (
+                    "bands",
+                    "basics",
+                    "common",
+                    "data-values",
+                    "datetime",
+                    "instrument",
+                    "licensing",
+                    "provider",
+                )
+            ),
+        )
+    ),
+    "https://geojson.org/schema/Feature.json",
+    "https://geojson.org/schema/Geometry.json",
+    # Collection summaries may be JSON schemas themselves
+    "http://json-schema.org/draft-07/schema",
+    *ITEM_STAC_EXTENSIONS,
+    TABLE_EXTENSION,
+)
+
+# Objects sent to a validation worker at once.
+VALIDATION_BATCH_SIZE = 256
+
+# Imported once by the forkserver, so validation workers fork with them loaded.
+VALIDATION_PRELOAD_MODULES: tuple[str, ...] = (
+    "fastjsonschema",
+    "overture_stac.validate",
+)
+
+
+class ValidationReport(NamedTuple):
+    """
+    Outcome of validating a set of objects.
+
+    ``errors`` holds ``(object, message)`` pairs, where ``object`` is the
+    path or id of the invalid object, with the first error per schema. A
+    core schema with no vendored copy is an error. ``unchecked`` are the
+    extension schemas objects declared that have no vendored copy, so they
+    were not checked against.
+    """
+
+    objects: int = 0
+    errors: tuple[tuple[str, str], ...] = ()
+    unchecked: frozenset[str] = frozenset()
+
+    def combine(self, other: ValidationReport) -> ValidationReport:
+        return ValidationReport(
+            self.objects + other.objects,
+            self.errors + other.errors,
+            self.unchecked | other.unchecked,
+        )
+
+
+def schema_path(url: str, schema_dir: Optional[Path] = None) -> Path:
+    """Where the vendored copy of the schema at ``url`` is stored, by default in `SCHEMA_DIR`."""
+    if schema_dir is None:
+        schema_dir = SCHEMA_DIR
+    return Path(schema_dir) / url.split("://", 1)[1].split("#", 1)[0]
+
+
+def schema_urls(obj: dict) -> list[str]:
+    """Core schema of ``obj``'s type, then the schemas of its extensions."""
+    urls = list(obj.get("stac_extensions") or [])
+    core = CORE_SCHEMAS.get(obj.get("type"))
+    if core is not None:
+        version = STAC_SCHEMA_ROOT.format(version=obj["stac_version"])
+        urls.insert(0, f"{version}/{core}")
+    return urls
+
+
+def load_schema(url: str) -> dict:
+    """
+    The vendored schema at ``url``; also resolves every ``$ref`` offline.
+
+    Raises:
+        FileNotFoundError: If it isn't vendored
+    """
+    with open(schema_path(url)) as f:
+        return json.load(f)
+
+
+@functools.cache
+def schema_validator(url: str) -> Optional[Callable[[dict], dict]]:
+    """
+    The schema at ``url`` compiled into a validating function, once per process.
+
+    `fastjsonschema` generates Python code for the schema and every schema it
+    references, which validates an item many times faster than interpreting
+    the schema does.
+
+    Returns:
+        Callable: Raises `fastjsonschema.JsonSchemaValueException` for the
+        first error in an object. None when the schema isn't vendored.
+    """
+    if not schema_path(url).is_file():
+        return None
+    return fastjsonschema.compile(
+        load_schema(url), handlers={"http": load_schema, "https": load_schema}
+    )
+
+
+def validate_object(obj: dict, name: str) -> ValidationReport:
+    """
+    Validate one STAC object against its core and extension schemas.
+
+    Args:
+        obj: The object, as parsed JSON
+        name: Path or id reported with its errors
+
+    Returns:
+        ValidationReport: For this one object; anything without a
+        ``stac_version`` is not a STAC object and counts as none
+    """
+    if "stac_version" not in obj:
+        return ValidationReport()
+    extensions = set(obj.get("stac_extensions") or ())
+    errors = []
+    unchecked = set()
+    for url in schema_urls(obj):
+        validator = schema_validator(url)
+        if validator is None and url in extensions:
+            unchecked.add(url)
+            continue
+        if validator is None:
+            errors.append((name, f"{url}: no vendored schema"))
+            continue
+        try:
+            validator(obj)
+        except fastjsonschema.JsonSchemaValueException as exc:
+            errors.append((name, f"{url}: {exc.message}"))
+    return ValidationReport(1, tuple(errors), frozenset(unchecked))
+
+
+def validate_records(records: list[tuple[str, dict]]) -> ValidationReport:
+    """Validate ``(name, object)`` pairs, see `validate_object`."""
+    report = ValidationReport()
+    for name, obj in records:
+        report = report.combine(validate_object(obj, name))
+    return report
+
+
+def validate_files(
+    filesystem: fs.FileSystem, paths: list[str], base_path: str
+) -> ValidationReport:
+    """Read and validate each of ``paths``, reported relative to ``base_path``."""
+    report = ValidationReport()
+    for path in paths:
+        name = path[len(base_path) + 1 :]
+        with filesystem.open_input_stream(path) as f:
+            try:
+                obj = json.loads(f.read())
+            except ValueError as exc:
+                report = report.combine(
+                    ValidationReport(1, ((name, f"Not valid JSON: {exc}"),))
+                )
+                continue
+        if isinstance(obj, dict):
+            report = report.combine(validate_object(obj, name))
+    return report
+
+
+def batched(iterable: Iterable, size: int = VALIDATION_BATCH_SIZE) -> Iterator[list]:
+    """Lists of up to ``size`` consecutive items of ``iterable``."""
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def run_batches(fn, batches: Iterable[tuple], workers: int) -> ValidationReport:
+    """
+    Combine ``fn(*batch)`` over every batch, on ``workers`` processes.
+
+    Batches are submitted as they are produced, at most two per worker
+    ahead of the results, so a long stream of objects is never all queued
+    at once. Each worker compiles a validator once and reuses it.
+    """
+    report = ValidationReport()
+    if workers <= 1:
+        for batch in batches:
+            report = report.combine(fn(*batch))
+        return report
+
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(list(VALIDATION_PRELOAD_MODULES))
+    else:
+        context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending: deque[Future] = deque()
+        for batch in batches:
+            pending.append(pool.submit(fn, *batch))
+            if len(pending) >= 2 * workers:
+                report = report.combine(pending.popleft().result())
+        while pending:
+            report = report.combine(pending.popleft().result())
+    return report
+
+
+def iter_catalog_records(catalog: pystac.Catalog) -> Iterator[tuple[str, dict]]:
+    """``(self href, object)`` for ``catalog`` and every catalog, collection and item below it."""
+    for parent, _, items in catalog.walk():
+        yield parent.get_self_href() or parent.id, parent.to_dict()
+        for item in items:
+            yield item.get_self_href() or item.id, item.to_dict()
+
+
+def validate_catalog(catalog: pystac.Catalog, workers: int = 1) -> ValidationReport:
+    """
+    Validate an in-memory catalog tree, e.g. a release right after it is saved.
+
+    The objects are serialized here and validated on ``workers`` processes,
+    without reading anything back from the output.
+    """
+    return run_batches(
+        validate_records,
+        ((batch,) for batch in batched(iter_catalog_records(catalog))),
+        workers,
+    )
+
+
+def validate_output(output: Union[str, Path], workers: int = 1) -> ValidationReport:
+    """
+    Validate every STAC object under a local directory or filesystem URI.
+
+    The output is listed page by page, and each batch of ``.json`` files is
+    validated as soon as it is listed. JSON that isn't a STAC object, such
+    as tile index or items pages, is read but not counted.
+    """
+    filesystem, base_path = resolve_output(output)
+
+    def paths() -> Iterator[str]:
+        for page in iter_listing(filesystem, base_path, recursive=True):
+            for info in page:
+                if (
+                    info.type == fs.FileType.File
+                    and info.path.endswith(".json")
+                    and info.path != f"{base_path}/{CONTENT_HASHES_FILENAME}"
+                ):
+                    yield info.path
+
+    return run_batches(
+        validate_files,
+        ((filesystem, batch, base_path) for batch in batched(paths())),
+        workers,
+    )
+
+
+def log_report(report: ValidationReport, max_errors: int = 50) -> None:
+    """Log a summary of ``report`` and up to ``max_errors`` of its errors."""
+    logger = logging.getLogger("pystac")
+    for url in sorted(report.unchecked):
+        logger.warning(f"No vendored schema for {url}; run just update-schemas")
+    for name, message in report.errors[:max_errors]:
+        logger.error(f"{name}: {message}")
+    if len(report.errors) > max_errors:
+        logger.error(f"... and {len(report.errors) - max_errors} more errors")
+    invalid = len({name for name, _ in report.errors})
+    logger.info(
+        f"Validated {report.objects} STAC objects: "
+        f"{invalid} invalid, {len(report.errors)} errors"
+    )
+
+
+def vendor_schemas(
+    schema_dir: Union[str, Path], urls: Iterable[str] = SCHEMA_URLS
+) -> list[Path]:
+    """
+    Download ``urls`` into ``schema_dir``, replacing the copies there.
+
+    The only step of validation that needs the network. It is run on a
+    checkout (`just update-schemas`) when the catalog starts using another
+    STAC version or extension, and the result is committed; an installed
+    package is never written to.
+
+    Returns:
+        list: The written schema files
+    """
+    written = []
+    for url in urls:
+        path = schema_path(url, schema_dir)
+        with urllib.request.urlopen(url, timeout=30) as response:
+            schema = json.load(response)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(schema, indent=2) + "\n")
+        written.append(path)
+    return written
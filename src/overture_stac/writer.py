@@ -0,0 +1,584 @@
+"""Output layer that only rewrites catalog files whose content actually changed."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional, Union
+
+from overture_stac.lazy import lazy_import
+
+pa = lazy_import("pyarrow")
+fs = lazy_import("pyarrow.fs")
+pq = lazy_import("pyarrow.parquet")
+pystac = lazy_import("pystac")
+stac_geoparquet = lazy_import("stac_geoparquet")
+stac_geoparquet_parquet = lazy_import("stac_geoparquet.arrow._to_parquet")
+
+CHANGED_PATHS_FILENAME = "changed-paths.txt"
+CONTENT_HASHES_FILENAME = "content-hashes.json"
+
+# Object stores have no real directories; creating one writes a marker object.
+OBJECT_STORE_TYPES: frozenset[str] = frozenset({"s3", "gcs", "abfs"})
+# `pyarrow.fs.FileSystem.from_uri` schemes of those filesystems
+OBJECT_STORE_SCHEMES: frozenset[str] = frozenset({"s3", "gs", "gcs", "abfs", "abfss"})
+
+STREAM_CHUNK_SIZE = 8 * 1024 * 1024
+
+# --precompress encoding -> (sidecar suffix, pyarrow codec). The encoding names
+# are the HTTP Content-Encoding values the CDN serves the sidecars with.
+PRECOMPRESS_ENCODINGS: dict[str, tuple[str, str]] = {
+    "gzip": (".gz", "gzip"),
+    "br": (".br", "brotli"),
+}
+
+# Only JSON outputs are worth precompressing; parquet is already compressed.
+PRECOMPRESS_SUFFIXES: tuple[str, ...] = (".json", ".geojson")
+
+MEDIA_TYPES: dict[str, str] = {
+    ".json": "application/json",
+    ".geojson": "application/geo+json",
+    ".ndjson": "application/x-ndjson",
+    ".zst": "application/zstd",
+    ".parquet": "application/vnd.apache.parquet",
+    ".txt": "text/plain",
+}
+
+
+def content_hash(data: bytes) -> str:
+    """Return the hex digest used to decide whether a file changed."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_previous_hashes(location: str) -> Optional[dict[str, str]]:
+    """
+    Load a prior run's ``content-hashes.json`` from a local path or http(s) URL.
+
+    Returns None (and logs a warning) when it can't be read, e.g. on the very
+    first publish, so every file is then treated as changed.
+    """
+    logger = logging.getLogger("pystac")
+    try:
+        if location.startswith(("http://", "https://")):
+            with urllib.request.urlopen(location, timeout=30) as response:
+                return json.load(response)
+        with open(location) as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Couldn't load previous content hashes from {location}: {e}")
+        return None
+
+
+def resolve_output(output: Union[str, Path]) -> tuple[fs.FileSystem, str]:
+    """
+    Resolve an ``--output`` value to ``(filesystem, base_path)``.
+
+    Plain paths map to the local filesystem; URIs such as
+    ``s3://bucket/prefix`` go through `pyarrow.fs.FileSystem.from_uri`.
+    """
+    output = str(output)
+    if "://" in output:
+        filesystem, base_path = fs.FileSystem.from_uri(output)
+        return filesystem, base_path.rstrip("/")
+    return fs.LocalFileSystem(), os.path.abspath(output)
+
+
+def is_object_store_uri(output: Union[str, Path]) -> bool:
+    """Whether an ``--output`` value resolves to an object store, without resolving it."""
+    scheme, sep, _ = str(output).partition("://")
+    return bool(sep) and scheme in OBJECT_STORE_SCHEMES
+
+
+@functools.cache
+def hashing_stac_io_class() -> type:
+    """`HashingStacIO`, defined on first use so importing this module skips pystac."""
+    from pystac.stac_io import DefaultStacIO
+
+    class HashingStacIO(DefaultStacIO):
+        """StacIO that routes every pystac write through a `CatalogWriter`."""
+
+        def __init__(self, writer: CatalogWriter):
+            super().__init__()
+            self.writer = writer
+
+        def write_text_to_href(self, href: str, txt: str) -> None:
+            self.writer.write_text(self.writer.relative_path(href), txt)
+
+    return HashingStacIO
+
+
+class _HashingStream:
+    """File-like wrapper that hashes everything written to a NativeFile.
+
+    Writes are also teed into any ``sidecars`` (in-memory compressed streams).
+    Closing it is a no-op: the NativeFile is closed by `CatalogWriter.open_stream`.
+    """
+
+    closed = False
+
+    def __init__(
+        self, stream: pa.NativeFile, sidecars: Optional[list[pa.NativeFile]] = None
+    ):
+        self.stream = stream
+        self.sidecars = sidecars or []
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        for sidecar in self.sidecars:
+            sidecar.write(data)
+        return self.stream.write(data)
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class CatalogWriter:
+    """
+    Write catalog outputs under ``root`` on any `pyarrow.fs` filesystem.
+
+    Each file's SHA-256 is compared against ``previous_hashes`` (the
+    ``content-hashes.json`` of a prior run) when it has an entry, otherwise
+    against the file already at a local destination. Object stores are never
+    read back, as that would download every object, so there a file without
+    an entry counts as changed. Identical files are left
+    untouched and everything that did change is listed in
+    ``changed-paths.txt`` by `finalize`, so the publish step only has to sync
+    and invalidate that set.
+
+    Small files are uploaded concurrently on a bounded thread pool; large
+    outputs are streamed with `open_stream`, which object stores such as
+    `pyarrow.fs.S3FileSystem` turn into multipart uploads.
+
+    With ``precompress`` (any of `PRECOMPRESS_ENCODINGS`), every JSON output
+    also gets a ``.gz``/``.br`` sidecar, compressed on the same pool. On object
+    stores the sidecars carry matching ``Content-Encoding`` metadata so a CDN
+    can serve them as-is.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        filesystem: Optional[fs.FileSystem] = None,
+        previous_hashes: Optional[dict[str, str]] = None,
+        max_workers: int = 16,
+        precompress: tuple[str, ...] = (),
+    ):
+        unknown = set(precompress) - set(PRECOMPRESS_ENCODINGS)
+        if unknown:
+            raise ValueError(f"Unsupported precompress encodings: {sorted(unknown)}")
+
+        if filesystem is None:
+            self.filesystem, self.base_path = resolve_output(root)
+        else:
+            self.filesystem, self.base_path = filesystem, str(root).rstrip("/")
+
+        # pystac only joins child/item hrefs correctly for path-like save
+        # destinations, so it always sees a POSIX path that `HashingStacIO`
+        # maps back onto this writer, whatever the filesystem.
+        self.root_href = "/" + self.base_path.lstrip("/")
+
+        self.previous_hashes = previous_hashes
+        self.precompress = tuple(precompress)
+        self.stac_io = hashing_stac_io_class()(self)
+        self.is_object_store = self.filesystem.type_name in OBJECT_STORE_TYPES
+
+        self.hashes: dict[str, str] = {}
+        self.changed: set[str] = set()
+        self.removed: set[str] = set()
+        self.unchanged: int = 0
+
+        self._lock = threading.Lock()
+        self._created_dirs: set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Bound queued uploads so buffered file contents can't pile up in memory.
+        self._slots = threading.BoundedSemaphore(max_workers * 4)
+        self._futures: list[Future] = []
+
+        self.logger = logging.getLogger("pystac")
+
+        self._make_parent_dirs(self.base_path + "/")
+
+    def path(self, rel_path: str) -> str:
+        """Filesystem path for ``rel_path``."""
+        return f"{self.base_path}/{rel_path}"
+
+    def href(self, rel_path: str) -> str:
+        """Href for ``rel_path`` as handed to pystac's save methods."""
+        return f"{self.root_href}/{rel_path}"
+
+    def relative_path(self, href: str) -> str:
+        """Map an href under `root_href` to a POSIX path relative to ``root``."""
+        return Path(os.path.abspath(href)).relative_to(self.root_href).as_posix()
+
+    def _make_parent_dirs(self, path: str) -> None:
+        if self.is_object_store:
+            return
+        parent = path.rsplit("/", 1)[0]
+        if parent in self._created_dirs:
+            return
+        self.filesystem.create_dir(parent, recursive=True)
+        with self._lock:
+            self._created_dirs.add(parent)
+
+    def _existing_hash(self, rel_path: str) -> Optional[str]:
+        path = self.path(rel_path)
+        if self.filesystem.get_file_info(path).type != fs.FileType.File:
+            return None
+
+        sha256 = hashlib.sha256()
+        with self.filesystem.open_input_stream(path, compression=None) as f:
+            while chunk := f.read(STREAM_CHUNK_SIZE):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def _previous_hash(self, rel_path: str) -> tuple[Optional[str], bool]:
+        """Return the hash to compare against and whether it came from the prior run."""
+        if self.previous_hashes is not None and rel_path in self.previous_hashes:
+            return self.previous_hashes[rel_path], True
+        if self.is_object_store:
+            return None, False
+        return self._existing_hash(rel_path), False
+
+    def _record(self, rel_path: str, digest: str, previous: Optional[str]) -> bool:
+        changed = previous != digest
+        with self._lock:
+            self.hashes[rel_path] = digest
+            if changed:
+                self.changed.add(rel_path)
+            else:
+                self.unchanged += 1
+        return changed
+
+    def _needs_write(self, rel_path: str, changed: bool, from_manifest: bool) -> bool:
+        """
+        Unchanged files are only rewritten when missing at the destination.
+
+        A fresh local output dir still needs every file. An object store that
+        the previous run published to is assumed to hold it already.
+        """
+        if changed:
+            return True
+        if not from_manifest or self.is_object_store:
+            return False
+        return self.filesystem.get_file_info(self.path(rel_path)).type != (
+            fs.FileType.File
+        )
+
+    def _metadata(self, rel_path: str, encoding: Optional[str] = None) -> dict:
+        """Object metadata for ``rel_path``; filesystems that can't store it ignore it."""
+        metadata = {}
+        if encoding is not None:
+            # A sidecar is served as its uncompressed media type.
+            rel_path = rel_path.removesuffix(PRECOMPRESS_ENCODINGS[encoding][0])
+        media_type = MEDIA_TYPES.get(os.path.splitext(rel_path)[1])
+        if media_type is not None:
+            metadata["Content-Type"] = media_type
+        if encoding is not None:
+            metadata["Content-Encoding"] = encoding
+        return metadata
+
+    def _sidecars(self, rel_path: str) -> list[tuple[str, str, str]]:
+        """``(sidecar_rel_path, encoding, codec)`` for each precompressed variant."""
+        if not rel_path.endswith(PRECOMPRESS_SUFFIXES):
+            return []
+        sidecars = []
+        for encoding in self.precompress:
+            suffix, codec = PRECOMPRESS_ENCODINGS[encoding]
+            sidecars.append((rel_path + suffix, encoding, codec))
+        return sidecars
+
+    def _write_one(
+        self, rel_path: str, data: bytes, encoding: Optional[str] = None
+    ) -> bool:
+        previous, from_manifest = self._previous_hash(rel_path)
+        changed = self._record(rel_path, content_hash(data), previous)
+
+        if self._needs_write(rel_path, changed, from_manifest):
+            path = self.path(rel_path)
+            self._make_parent_dirs(path)
+            with self.filesystem.open_output_stream(
+                path, compression=None, metadata=self._metadata(rel_path, encoding)
+            ) as f:
+                f.write(data)
+        return changed
+
+    def _write_now(self, rel_path: str, data: bytes) -> bool:
+        changed = self._write_one(rel_path, data)
+        # Sidecars are compressed in this pool task too, so files compress in
+        # parallel. Both codecs are deterministic, so unchanged input yields an
+        # unchanged sidecar hash.
+        for sidecar, encoding, codec in self._sidecars(rel_path):
+            self._write_one(
+                sidecar, pa.compress(data, codec=codec, asbytes=True), encoding
+            )
+        return changed
+
+    def _submit(self, fn, *args) -> Future:
+        self._slots.acquire()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def write_bytes(self, rel_path: str, data: bytes) -> Future:
+        """
+        Queue ``data`` for ``root/rel_path`` unless the content is unchanged.
+
+        Returns:
+            Future: Resolves to True when the content differs from the
+            previous run
+        """
+        return self._submit(self._write_now, rel_path, data)
+
+    def write_text(self, rel_path: str, text: str) -> Future:
+        return self.write_bytes(rel_path, text.encode("utf-8"))
+
+    def write_json(self, rel_path: str, obj: dict) -> Future:
+        return self.write_text(rel_path, json.dumps(obj))
+
+    @contextmanager
+    def open_stream(
+        self, rel_path: str, compression: Optional[str] = None
+    ) -> Iterator[IO[bytes]]:
+        """
+        Stream a large output straight to ``root/rel_path``.
+
+        Local filesystems write to a temporary sibling that only replaces the
+        destination when the content hash differs. Object stores upload
+        directly (as a multipart upload for large files); an identical
+        overwrite there costs nothing but the upload.
+
+        With a ``compression`` (a pyarrow codec such as ``"zstd"``), what is
+        written is compressed on the way out, and the hash covers the
+        compressed bytes, as stored.
+        """
+        path = self.path(rel_path)
+        target = path if self.is_object_store else f"{path}.tmp-{os.getpid()}"
+        self._make_parent_dirs(path)
+        previous, from_manifest = self._previous_hash(rel_path)
+
+        # Sidecars compress into memory alongside the stream and are written
+        # (and hashed) like any other file once it is complete.
+        sidecars = []
+        for sidecar, encoding, codec in self._sidecars(rel_path):
+            sink = pa.BufferOutputStream()
+            sidecars.append(
+                (sidecar, encoding, sink, pa.CompressedOutputStream(sink, codec))
+            )
+
+        with self.filesystem.open_output_stream(
+            target, compression=None, metadata=self._metadata(rel_path)
+        ) as stream:
+            hashing = _HashingStream(stream, [c for *_, c in sidecars])
+            if compression is None:
+                yield hashing
+            else:
+                compressed = pa.CompressedOutputStream(
+                    pa.PythonFile(hashing, mode="w"), compression
+                )
+                yield compressed
+                compressed.close()
+
+        changed = self._record(rel_path, hashing.sha256.hexdigest(), previous)
+        if target != path:
+            if self._needs_write(rel_path, changed, from_manifest):
+                self.filesystem.move(target, path)
+            else:
+                self.filesystem.delete_file(target)
+
+        for sidecar, encoding, sink, compressed in sidecars:
+            compressed.close()
+            self._write_one(sidecar, sink.getvalue().to_pybytes(), encoding)
+
+    def write_json_stream(self, rel_path: str, obj: dict) -> Future:
+        """Queue a large JSON document, encoded incrementally into `open_stream`."""
+
+        def upload() -> bool:
+            with self.open_stream(rel_path) as out:
+                chunks: list[str] = []
+                size = 0
+                for chunk in json.JSONEncoder().iterencode(obj):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= STREAM_CHUNK_SIZE:
+                        out.write("".join(chunks).encode("utf-8"))
+                        chunks, size = [], 0
+                out.write("".join(chunks).encode("utf-8"))
+            return rel_path in self.changed
+
+        return self._submit(upload)
+
+    def write_ndjson_stream(
+        self,
+        rel_path: str,
+        records: Iterable[dict],
+        compression: Optional[str] = None,
+    ) -> Future:
+        """
+        Queue newline-delimited JSON, one line per record, into `open_stream`.
+
+        ``records`` is consumed on the upload thread as the file is written,
+        so it can be a generator that never holds every record at once.
+        """
+
+        def upload() -> bool:
+            with self.open_stream(rel_path, compression=compression) as out:
+                lines: list[str] = []
+                size = 0
+                for record in records:
+                    line = json.dumps(record)
+                    lines.append(line)
+                    size += len(line) + 1
+                    if size >= STREAM_CHUNK_SIZE:
+                        out.write("".join(f"{line}\n" for line in lines).encode())
+                        lines, size = [], 0
+                out.write("".join(f"{line}\n" for line in lines).encode())
+            return rel_path in self.changed
+
+        return self._submit(upload)
+
+    def write_parquet(
+        self, rel_path: str, table: pa.Table, stac: bool = True
+    ) -> Future:
+        """Queue a Parquet table, encoded straight into `open_stream`.
+
+        ``table`` is written as stac-geoparquet unless ``stac`` is False, in
+        which case it is written as plain zstd-compressed Parquet.
+        """
+
+        def upload() -> bool:
+            # Read batch by batch, so a stream is never materialized
+            reader = pa.RecordBatchReader.from_stream(table)
+            schema, options = reader.schema, {"compression": "zstd"}
+            if stac:
+                # What `stac_geoparquet.arrow.to_parquet` writes, which only
+                # takes a path
+                schema = schema.with_metadata(
+                    stac_geoparquet_parquet.create_parquet_metadata(
+                        schema,
+                        schema_version=stac_geoparquet.arrow.DEFAULT_PARQUET_SCHEMA_VERSION,
+                    )
+                )
+                options = {}
+            with (
+                self.open_stream(rel_path) as out,
+                pq.ParquetWriter(out, schema, **options) as parquet,
+            ):
+                for batch in reader:
+                    parquet.write_batch(batch)
+            return rel_path in self.changed
+
+        return self._submit(upload)
+
+    def save_catalog(
+        self,
+        catalog: pystac.Catalog,
+        catalog_type: pystac.CatalogType,
+        rel_dir: str,
+    ) -> None:
+        """Save ``catalog`` and all its descendants under ``root/rel_dir``."""
+        catalog.save(
+            catalog_type=catalog_type,
+            dest_href=self.href(rel_dir),
+            stac_io=self.stac_io,
+        )
+
+    def remove_dir(self, rel_dir: str) -> list[str]:
+        """
+        Delete ``root/rel_dir`` and report every file under it as removed.
+
+        Files only known from ``previous_hashes`` (e.g. when building into a
+        fresh directory) are reported too, so the next sync and invalidation
+        drop them.
+
+        Returns:
+            list: Sorted removed paths, relative to ``root``
+        """
+        self.flush()
+        prefix = rel_dir.rstrip("/") + "/"
+        path = self.path(rel_dir.rstrip("/"))
+        removed = {p for p in self.previous_hashes or {} if p.startswith(prefix)}
+        if self.filesystem.get_file_info(path).type == fs.FileType.Directory:
+            for info in self.filesystem.get_file_info(
+                fs.FileSelector(path, recursive=True)
+            ):
+                if info.type == fs.FileType.File:
+                    removed.add(prefix + info.path[len(path) + 1 :])
+            self.filesystem.delete_dir(path)
+
+        with self._lock:
+            for rel_path in removed:
+                self.hashes.pop(rel_path, None)
+                self.changed.add(rel_path)
+            self.removed.update(removed)
+        return sorted(removed)
+
+    def flush(self) -> None:
+        """Wait for queued writes, re-raising the first failure."""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def finalize(self, prune_missing: bool = False) -> list[str]:
+        """
+        Write ``changed-paths.txt`` and ``content-hashes.json`` at ``root``.
+
+        Args:
+            prune_missing: Treat files listed in ``previous_hashes`` that were
+                not written this run as removed (a full rebuild). Otherwise
+                they are assumed untouched and carried over.
+
+        Returns:
+            list: Sorted paths that were added, modified or removed
+        """
+        self.flush()
+
+        hashes = dict(self.hashes)
+        changed = set(self.changed)
+        for rel_path, digest in (self.previous_hashes or {}).items():
+            if rel_path in hashes or rel_path in self.removed:
+                continue
+            if prune_missing:
+                changed.add(rel_path)
+            else:
+                hashes[rel_path] = digest
+
+        changed_paths = sorted(changed)
+        self.logger.info(
+            f"Wrote {len(self.changed - self.removed)} changed files, "
+            f"left {self.unchanged} unchanged, removed {len(self.removed)}"
+        )
+
+        for rel_path, text in (
+            (CHANGED_PATHS_FILENAME, "".join(f"{p}\n" for p in changed_paths)),
+            (
+                CONTENT_HASHES_FILENAME,
+                json.dumps(dict(sorted(hashes.items())), indent=0),
+            ),
+        ):
+            with self.filesystem.open_output_stream(
+                self.path(rel_path),
+                compression=None,
+                metadata=self._metadata(rel_path),
+            ) as f:
+                f.write(text.encode("utf-8"))
+
+        self._executor.shutdown()
+        return changed_paths
@@ -131,13 +131,8 @@ def build_test_catalog(
     title = f"Test Release {release}"
     overture_release.build_release_catalog(title=title, max_workers=workers)
     overture_release.release_catalog.extra_fields["latest"] = True
-    overture_release.release_catalog.normalize_hrefs(
-        f"{root_href.rstrip('/')}/{release}/"
-    )
-    overture_release.release_catalog.save(
-        catalog_type=pystac.CatalogType.ABSOLUTE_PUBLISHED,
-        dest_href=str(output_dir / release),
-    )
+    overture_release.save(root_href.rstrip("/"))
+    overture_release.writer.flush()
 
     _write_stub_release_catalog(output_dir, STUB_OLDER_RELEASE_ID, root_href)
 
@@ -0,0 +1,89 @@
+"""Unit tests for the cross-release all_releases/ dataset."""
+
+import json
+from datetime import datetime
+
+import pyarrow.dataset as ds
+import pystac
+
+from overture_stac.all_releases import (
+    ALL_RELEASES_DIRNAME,
+    partition_path,
+    prune_release_partitions,
+    write_release_partitions,
+)
+from overture_stac.writer import CONTENT_HASHES_FILENAME, CatalogWriter
+
+
+def _items(collection: str, num_rows: int) -> list[pystac.Item]:
+    item = pystac.Item(
+        id="00000",
+        geometry={
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+        },
+        bbox=[0.0, 0.0, 1.0, 1.0],
+        datetime=datetime(2026, 8, 5),
+        properties={"num_rows": num_rows},
+        collection=collection,
+    )
+    item.add_asset("aws", pystac.Asset(href="https://example.com/part-00000.parquet"))
+    return [item]
+
+
+def _build(root, release_rows: dict[str, int], previous_hashes=None) -> CatalogWriter:
+    writer = CatalogWriter(root, previous_hashes=previous_hashes)
+    for release, num_rows in release_rows.items():
+        write_release_partitions(
+            writer,
+            release,
+            {"place": _items("place", num_rows), "building": _items("building", 1)},
+        )
+    return writer
+
+
+class TestAllReleases:
+    def test_dataset_is_hive_partitioned_by_release_and_collection(self, tmp_path):
+        _build(tmp_path, {"2026-07-01.0": 10, "2026-08-05.0": 12}).finalize()
+
+        dataset = ds.dataset(tmp_path / ALL_RELEASES_DIRNAME, partitioning="hive")
+        rows = sorted(
+            (r["release"], r["collection"], r["num_rows"])
+            for r in dataset.to_table(
+                columns=["release", "collection", "num_rows"]
+            ).to_pylist()
+        )
+        assert rows == [
+            ("2026-07-01.0", "building", 1),
+            ("2026-07-01.0", "place", 10),
+            ("2026-08-05.0", "building", 1),
+            ("2026-08-05.0", "place", 12),
+        ]
+
+    def test_rebuilding_a_release_leaves_other_partitions_untouched(self, tmp_path):
+        _build(tmp_path, {"2026-07-01.0": 10, "2026-08-05.0": 12}).finalize()
+
+        writer = _build(tmp_path, {"2026-08-05.0": 13})
+        assert writer.finalize() == [partition_path("2026-08-05.0", "place")]
+
+    def test_dropped_releases_are_pruned(self, tmp_path):
+        _build(tmp_path, {"2026-07-01.0": 10, "2026-08-05.0": 12}).finalize()
+
+        writer = _build(tmp_path, {"2026-08-05.0": 12})
+        assert prune_release_partitions(writer, ["2026-08-05.0"]) == ["2026-07-01.0"]
+        changed = writer.finalize()
+
+        assert not (tmp_path / ALL_RELEASES_DIRNAME / "release=2026-07-01.0").exists()
+        assert changed == [
+            partition_path("2026-07-01.0", "building"),
+            partition_path("2026-07-01.0", "place"),
+        ]
+
+    def test_pruning_uses_previous_hashes_in_fresh_output(self, tmp_path):
+        stale = partition_path("2026-07-01.0", "place")
+        writer = _build(tmp_path, {"2026-08-05.0": 12}, previous_hashes={stale: "abc"})
+        assert prune_release_partitions(writer, ["2026-08-05.0"]) == ["2026-07-01.0"]
+        assert stale in writer.finalize(prune_missing=False)
+
+        hashes = json.loads((tmp_path / CONTENT_HASHES_FILENAME).read_text())
+        assert stale not in hashes
@@ -0,0 +1,39 @@
+"""Unit tests for per-type build checkpoints."""
+
+import pyarrow.fs as fs
+
+from overture_stac.checkpoint import CHECKPOINTS_DIRNAME, CheckpointStore
+from overture_stac.writer import CatalogWriter
+
+
+class TestCheckpointStore:
+    def test_round_trip(self, tmp_path):
+        store = CheckpointStore(fs.LocalFileSystem(), str(tmp_path))
+        store.save("buildings", "building", {"items": [1, 2, 3]})
+        assert store.load("buildings", "building") == {"items": [1, 2, 3]}
+        assert store.load("buildings", "building_part") is None
+
+    def test_writes_leave_no_temporary_files(self, tmp_path):
+        store = CheckpointStore(fs.LocalFileSystem(), str(tmp_path))
+        store.save("buildings", "building", {"a": 1})
+        store.save("buildings", "building", {"a": 2})
+        assert [p.name for p in (tmp_path / "buildings").iterdir()] == [
+            "building.json.gz"
+        ]
+        assert store.load("buildings", "building") == {"a": 2}
+
+    def test_release_store_lives_under_output_and_clears(self, tmp_path):
+        store = CheckpointStore.for_release(CatalogWriter(tmp_path), "2026-08-05.0")
+        store.save("places", "place", {})
+        assert (
+            tmp_path / CHECKPOINTS_DIRNAME / "2026-08-05.0" / "places" / "place.json.gz"
+        ).exists()
+
+        store.clear()
+        assert not (tmp_path / CHECKPOINTS_DIRNAME / "2026-08-05.0").exists()
+        store.clear()  # nothing left to clear is fine
+
+    def test_non_local_filesystem(self):
+        store = CheckpointStore(fs._MockFileSystem(), "bucket/stac/.checkpoints/r")
+        store.save("places", "place", {"ok": True})
+        assert store.load("places", "place") == {"ok": True}
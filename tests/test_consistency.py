@@ -0,0 +1,96 @@
+"""Tests for the cross-artifact consistency check."""
+
+import json
+
+import pytest
+
+from overture_stac.cli import main
+from overture_stac.consistency import check_release, list_saved_releases
+from tests.test_executors import RELEASE
+from tests.test_item_pages import build_and_save
+
+
+@pytest.fixture
+def output(tmp_path):
+    build_and_save(tmp_path, 3, None)
+    return tmp_path / "out"
+
+
+def item_path(output, item_id="00001"):
+    return output / RELEASE / "theme0" / "type0_0" / item_id / f"{item_id}.json"
+
+
+def edit_json(path, edit):
+    document = json.loads(path.read_text())
+    edit(document)
+    path.write_text(json.dumps(document))
+
+
+def discrepancies(output):
+    return [
+        (row["collection"], row["id"], row["check"])
+        for row in check_release(output, RELEASE).discrepancies.to_pylist()
+    ]
+
+
+class TestConsistency:
+    def test_consistent_release(self, output):
+        report = check_release(str(output), RELEASE)
+
+        assert report.counts == {
+            "items": 3,
+            "manifest": 3,
+            "parquet": 3,
+            "collections": 1,
+        }
+        assert report.discrepancies.num_rows == 0
+        assert list_saved_releases(output) == [RELEASE]
+
+    def test_row_counts(self, output):
+        edit_json(
+            item_path(output),
+            lambda item: item["properties"].update(num_rows=1),
+        )
+
+        assert discrepancies(output) == [
+            ("type0_0", "00001", "num_rows"),
+            ("type0_0", None, "row_count"),
+            ("type0_0", None, "row_count"),
+        ]
+        (detail,) = [
+            row["detail"]
+            for row in check_release(output, RELEASE).discrepancies.to_pylist()
+            if row["id"]
+        ]
+        assert detail.startswith("num_rows: 1 in item JSON, ")
+
+    def test_bbox_and_rel_path(self, output):
+        manifest = output / RELEASE / "manifest.geojson"
+        edit_json(
+            manifest, lambda doc: doc["features"][0]["bbox"].__setitem__(0, -180.0)
+        )
+        edit_json(
+            item_path(output),
+            lambda item: item["assets"]["aws"].update(
+                href=item["assets"]["aws"]["href"] + ".bak"
+            ),
+        )
+
+        assert discrepancies(output) == [
+            ("type0_0", "00000", "bbox"),
+            ("type0_0", "00001", "rel_path"),
+            ("type0_0", "00001", "rel_path"),
+        ]
+
+    def test_missing_item(self, output):
+        item_path(output).unlink()
+
+        assert ("type0_0", "00001", "missing") in discrepancies(output)
+
+    def test_cli_exit_status(self, output):
+        main(["check", "--output", str(output)])
+
+        item_path(output).unlink()
+        with pytest.raises(SystemExit) as exit_info:
+            main(["check", "--output", str(output), "--release", RELEASE])
+        assert exit_info.value.code == 1
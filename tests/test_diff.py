@@ -0,0 +1,157 @@
+"""Unit tests for release diffs and `gen-stac diff`."""
+
+import json
+from datetime import datetime
+
+import pystac
+import stac_geoparquet
+
+from overture_stac.cli import main
+from overture_stac.diff import changeset_document, diff_releases, write_release_changes
+from overture_stac.writer import CatalogWriter
+
+OLD, NEW = "2026-07-01.0", "2026-08-05.0"
+
+
+def _item(collection: str, item_id: str, num_rows: int, x: float = 0.0) -> pystac.Item:
+    item = pystac.Item(
+        id=item_id,
+        geometry={
+            "type": "Polygon",
+            "coordinates": [[[x, 0], [x + 1, 0], [x + 1, 1], [x, 1], [x, 0]]],
+        },
+        bbox=[x, 0.0, x + 1, 1.0],
+        datetime=datetime(2026, 8, 5),
+        properties={"num_rows": num_rows},
+        collection=collection,
+    )
+    item.add_asset("aws", pystac.Asset(href=f"https://example.com/{item_id}.parquet"))
+    return item
+
+
+def _table(items):
+    return stac_geoparquet.arrow.parse_stac_items_to_arrow(items).read_all()
+
+
+OLD_ITEMS = [
+    _item("building", "00000", 100),
+    _item("building", "00001", 100),
+    _item("building", "00002", 100),
+    _item("place", "00000", 50),
+]
+NEW_ITEMS = [
+    _item("building", "00000", 100),  # unchanged
+    _item("building", "00001", 120),  # more rows
+    _item("building", "00003", 10),  # added; 00002 removed
+    _item("place", "00000", 50, x=5.0),  # bbox moved
+]
+
+
+def _write_release(root, release, items) -> None:
+    writer = CatalogWriter(root)
+    writer.write_parquet(f"{release}/collections.parquet", _table(items))
+    writer.finalize()
+
+
+class TestDiffReleases:
+    def test_changes_are_classified(self):
+        changes, _ = diff_releases(_table(OLD_ITEMS), _table(NEW_ITEMS))
+        assert list(
+            zip(
+                changes["collection"].to_pylist(),
+                changes["id"].to_pylist(),
+                changes["change"].to_pylist(),
+                changes["row_delta"].to_pylist(),
+                changes["bbox_changed"].to_pylist(),
+                strict=True,
+            )
+        ) == [
+            ("building", "00001", "changed", 20, False),
+            ("building", "00002", "removed", -100, False),
+            ("building", "00003", "added", 10, False),
+            ("place", "00000", "changed", 0, True),
+        ]
+
+    def test_per_type_summary(self):
+        _, summary = diff_releases(_table(OLD_ITEMS), _table(NEW_ITEMS))
+        assert summary["building"] == {
+            "items_a": 3,
+            "items_b": 3,
+            "rows_a": 300,
+            "rows_b": 230,
+            "row_delta": -70,
+            "added": 1,
+            "removed": 1,
+            "changed": 1,
+        }
+        assert summary["place"]["changed"] == 1
+        assert summary["place"]["row_delta"] == 0
+
+    def test_identical_releases_have_no_changes(self):
+        changes, summary = diff_releases(_table(OLD_ITEMS), _table(OLD_ITEMS))
+        assert changes.num_rows == 0
+        assert summary["building"]["changed"] == 0
+
+    def test_changeset_document_is_compact(self):
+        changes, summary = diff_releases(_table(OLD_ITEMS), _table(NEW_ITEMS))
+        doc = changeset_document(OLD, NEW, changes, summary)
+        by_key = {(c["collection"], c["id"]): c for c in doc["changes"]}
+
+        assert by_key[("building", "00001")] == {
+            "collection": "building",
+            "id": "00001",
+            "change": "changed",
+            "num_rows": [100, 120],
+        }
+        assert by_key[("place", "00000")]["bbox"] == [
+            [0.0, 0.0, 1.0, 1.0],
+            [5.0, 0.0, 6.0, 1.0],
+        ]
+        assert by_key[("building", "00003")]["bbox"][0] is None
+
+
+class TestReleaseChangesLink:
+    def test_changes_written_and_linked(self, tmp_path):
+        _write_release(tmp_path, OLD, OLD_ITEMS)
+        writer = CatalogWriter(tmp_path)
+        catalog = pystac.Catalog(id=NEW, description="release")
+
+        assert write_release_changes(
+            writer,
+            catalog,
+            OLD,
+            _table(NEW_ITEMS),
+            str(tmp_path / OLD / "collections.parquet"),
+            "https://stac.example.com/",
+        )
+        writer.finalize()
+
+        link = catalog.get_single_link("changes")
+        assert link.href == f"https://stac.example.com/{NEW}/changes.json"
+        doc = json.loads((tmp_path / NEW / "changes.json").read_text())
+        assert doc["from"] == OLD and doc["to"] == NEW
+
+    def test_unreadable_previous_release_is_skipped(self, tmp_path):
+        catalog = pystac.Catalog(id=NEW, description="release")
+        assert not write_release_changes(
+            CatalogWriter(tmp_path),
+            catalog,
+            OLD,
+            _table(NEW_ITEMS),
+            str(tmp_path / "missing.parquet"),
+            "https://stac.example.com",
+        )
+        assert catalog.get_single_link("changes") is None
+
+
+class TestDiffCommand:
+    def test_prints_summary_and_writes_changeset(self, tmp_path, capsys):
+        _write_release(tmp_path, OLD, OLD_ITEMS)
+        _write_release(tmp_path, NEW, NEW_ITEMS)
+        output = tmp_path / "changes.json"
+
+        main(["diff", OLD, NEW, "--catalog", str(tmp_path), "--output", str(output)])
+
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["building"]["added"] == 1
+        assert len(json.loads(output.read_text())["changes"]) == 4
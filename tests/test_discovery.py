@@ -0,0 +1,131 @@
+"""Tests for the concurrent, invocation-wide startup lookups."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pyarrow.fs as pa_fs
+
+from overture_stac.discovery import Discovery
+from overture_stac.overture_stac import (
+    PMTILES_ROOT,
+    OvertureRelease,
+    discover_all_pmtiles,
+)
+
+
+def file_info(path: str) -> pa_fs.FileInfo:
+    return pa_fs.FileInfo(path, type=pa_fs.FileType.File, size=1)
+
+
+class TestDiscovery:
+    def test_lookups_run_concurrently(self):
+        # Each lookup only returns once all three are running at the same time
+        barrier = threading.Barrier(3, timeout=5)
+
+        def lookup(result):
+            def wait(*args):
+                barrier.wait()
+                return result
+
+            return wait
+
+        manifest = MagicMock()
+        manifest.return_value.create_manifest.side_effect = lookup([["a", "1"]])
+        with (
+            patch(
+                "overture_stac.discovery.list_release_ids",
+                side_effect=lookup(["2026-09-17.0", "2026-08-05.0"]),
+            ),
+            patch(
+                "overture_stac.discovery.discover_all_pmtiles",
+                side_effect=lookup({"2026-09-17.0": {"buildings": "x.pmtiles"}}),
+            ),
+            patch("overture_stac.discovery.RegistryManifest", manifest),
+        ):
+            discovery = Discovery(MagicMock())
+
+            assert discovery.release_ids == ["2026-09-17.0", "2026-08-05.0"]
+            assert discovery.registry_manifest == [["a", "1"]]
+            assert discovery.pmtiles("2026-09-17.0") == {"buildings": "x.pmtiles"}
+            assert discovery.pmtiles("2026-08-05.0") == {}
+
+    @patch("overture_stac.discovery.RegistryManifest")
+    @patch("overture_stac.discovery.discover_all_pmtiles", return_value={})
+    @patch("overture_stac.discovery.list_release_ids", return_value=["r"])
+    def test_each_lookup_runs_once(self, list_ids, all_pmtiles, manifest):
+        discovery = Discovery(MagicMock())
+        for _ in range(3):
+            assert discovery.release_ids == ["r"]
+            assert discovery.registry_manifest is not None
+            assert discovery.pmtiles("r") == {}
+
+        list_ids.assert_called_once()
+        all_pmtiles.assert_called_once()
+        manifest.return_value.create_manifest.assert_called_once()
+
+    @patch("overture_stac.discovery.RegistryManifest")
+    @patch("overture_stac.discovery.list_release_ids", return_value=[])
+    @patch("overture_stac.discovery.discover_all_pmtiles")
+    @patch("overture_stac.discovery.discover_pmtiles", return_value={"a": "a.pmtiles"})
+    def test_single_release_lists_only_its_pmtiles(
+        self, one_release, all_pmtiles, _list_ids, _manifest
+    ):
+        discovery = Discovery(MagicMock(), release="2026-09-17.0")
+
+        assert discovery.pmtiles("2026-09-17.0") == {"a": "a.pmtiles"}
+        all_pmtiles.assert_not_called()
+        one_release.assert_called_once()
+
+
+class TestDiscoverAllPmtiles:
+    def test_one_listing_groups_by_release(self):
+        pages = [
+            [
+                file_info(f"{PMTILES_ROOT}/2026-08-05.0/buildings.pmtiles"),
+                file_info(f"{PMTILES_ROOT}/2026-08-05.0/places.pmtiles"),
+            ],
+            [
+                file_info(f"{PMTILES_ROOT}/2026-09-17.0/base.pmtiles"),
+                file_info(f"{PMTILES_ROOT}/2026-09-17.0/README.md"),
+                file_info(f"{PMTILES_ROOT}/2026-09-17.0/old/base.pmtiles"),
+            ],
+        ]
+        with patch(
+            "overture_stac.overture_stac.iter_listing", return_value=iter(pages)
+        ) as listing:
+            pmtiles = discover_all_pmtiles(MagicMock())
+
+        listing.assert_called_once()
+        assert listing.call_args.kwargs == {"recursive": True}
+        assert pmtiles == {
+            "2026-08-05.0": {
+                "buildings": f"{PMTILES_ROOT}/2026-08-05.0/buildings.pmtiles",
+                "places": f"{PMTILES_ROOT}/2026-08-05.0/places.pmtiles",
+            },
+            "2026-09-17.0": {"base": f"{PMTILES_ROOT}/2026-09-17.0/base.pmtiles"},
+        }
+
+    def test_listing_errors_mean_no_pmtiles(self):
+        with patch(
+            "overture_stac.overture_stac.iter_listing", side_effect=OSError("denied")
+        ):
+            assert discover_all_pmtiles(MagicMock()) == {}
+
+
+class TestReleasePmtiles:
+    def test_taken_from_discovery_on_first_use(self, tmp_path):
+        discovery = MagicMock()
+        discovery.pmtiles.return_value = {"buildings": "x.pmtiles"}
+
+        release = OvertureRelease(
+            release="2026-09-17.0",
+            schema="1.17.0",
+            output=tmp_path,
+            filesystem=pa_fs.LocalFileSystem(),
+            discovery=discovery,
+        )
+        discovery.pmtiles.assert_not_called()
+
+        assert release.available_pmtiles == {"buildings": "x.pmtiles"}
+        assert release.available_pmtiles == {"buildings": "x.pmtiles"}
+        discovery.pmtiles.assert_called_once_with("2026-09-17.0")
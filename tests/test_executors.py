@@ -0,0 +1,261 @@
+"""Release listing and the processes/threads/async executors on a synthetic release."""
+
+import json
+import subprocess
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.fs as pa_fs
+import pyarrow.parquet as pq
+import pytest
+
+from overture_stac.overture_stac import EXECUTORS, OvertureRelease, list_release_tree
+from overture_stac.writer import CatalogWriter
+
+RELEASE = "2026-08-05.0"
+
+
+def write_synthetic_release(root, themes: int, types: int, fragments: int) -> str:
+    """Write ``themes`` x ``types`` x ``fragments`` small GeoParquet files."""
+    for t in range(themes):
+        for y in range(types):
+            type_dir = root / RELEASE / f"theme=theme{t}" / f"type=type{t}_{y}"
+            type_dir.mkdir(parents=True)
+            for i in range(fragments):
+                x = float(i)
+                table = pa.table(
+                    {"id": [f"{i}-a", f"{i}-b"], "value": [i, i + 1]}
+                ).replace_schema_metadata(
+                    {
+                        b"geo": json.dumps(
+                            {
+                                "version": "1.1.0",
+                                "columns": {"geometry": {"bbox": [x, 0, x + 1, 1]}},
+                            }
+                        )
+                    }
+                )
+                pq.write_table(table, type_dir / f"part-{i:05d}-abc.zstd.parquet")
+    return str(root)
+
+
+def build(release_root: str, output, executor: str, workers: int = 2):
+    release = OvertureRelease(
+        release=RELEASE,
+        schema="1.17.0",
+        output=output,
+        s3_release_path=release_root,
+        writer=CatalogWriter(output),
+        filesystem=pa_fs.LocalFileSystem(),
+        available_pmtiles={},
+    )
+    release.build_release_catalog(title="Test", max_workers=workers, executor=executor)
+    release.writer.finalize()
+    return release
+
+
+class TestExecutors:
+    def test_modes_build_the_same_release(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 3, 2, 4)
+
+        manifests = {}
+        for executor in EXECUTORS:
+            release = build(root, tmp_path / executor, executor)
+            manifests[executor] = sorted(
+                json.dumps(feature, sort_keys=True)
+                for feature in release.manifest_items
+            )
+            assert sorted(release.type_collections) == [
+                f"type{t}_{y}" for t in range(3) for y in range(2)
+            ]
+
+        assert manifests["threads"] == manifests["processes"]
+        assert manifests["async"] == manifests["processes"]
+        assert len(manifests["processes"]) == 24
+
+    def test_rebuild_changes_nothing(self, tmp_path):
+        """Themes finishing in another order still write identical outputs."""
+        root = write_synthetic_release(tmp_path / "release", 3, 1, 2)
+
+        def rebuild(order):
+            output = tmp_path / "out"
+            release = OvertureRelease(
+                release=RELEASE,
+                schema="1.17.0",
+                output=output,
+                s3_release_path=root,
+                writer=CatalogWriter(output),
+                filesystem=pa_fs.LocalFileSystem(),
+                available_pmtiles={},
+            )
+            with patch(
+                "overture_stac.overture_stac.as_completed",
+                side_effect=lambda futures: order(list(futures)),
+            ):
+                release.build_release_catalog(
+                    title="Test", max_workers=2, executor="threads"
+                )
+            release.save("https://stac.example.com")
+            return release.writer.finalize()
+
+        assert "2026-08-05.0/manifest.geojson" in rebuild(list)
+        assert rebuild(lambda futures: futures[::-1]) == []
+
+    def test_unknown_executor(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 1, 1, 1)
+        with pytest.raises(ValueError, match="Unknown executor"):
+            build(root, tmp_path / "out", "fibers")
+
+
+# Runs one mode in a fresh interpreter and reports its wall time and the peak
+# RSS of its whole process tree (the forkserver and pool workers included),
+# sampled from /proc.
+BENCHMARK_SCRIPT = textwrap.dedent(
+    """
+    import json, os, sys, threading, time
+    import pyarrow.fs as pa_fs
+    from overture_stac.overture_stac import OvertureRelease
+    from overture_stac.writer import CatalogWriter
+
+    root, output, executor, release = sys.argv[1:5]
+    page = os.sysconf("SC_PAGE_SIZE")
+
+    def tree_rss(pid):
+        children = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+                except OSError:
+                    continue
+                children.setdefault(ppid, []).append(int(entry))
+        total, stack = 0, [pid]
+        while stack:
+            p = stack.pop()
+            try:
+                with open(f"/proc/{p}/statm") as f:
+                    total += int(f.read().split()[1]) * page
+            except OSError:
+                pass
+            stack.extend(children.get(p, []))
+        return total
+
+    peak, done = [0], threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], tree_rss(os.getpid()))
+            time.sleep(0.02)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    build = OvertureRelease(
+        release=release, schema="1.17.0", output=output, s3_release_path=root,
+        writer=CatalogWriter(output), filesystem=pa_fs.LocalFileSystem(),
+        available_pmtiles={},
+    )
+    build.build_release_catalog(title="Test", max_workers=4, executor=executor)
+    seconds = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    print(json.dumps({
+        "fragments": len(build.manifest_items),
+        "seconds": seconds,
+        "peak_rss": peak[0],
+    }))
+    """
+)
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+class TestExecutorBenchmark:
+    def test_throughput_and_rss(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 4, 2, 40)
+
+        report = {}
+        for executor in EXECUTORS:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    BENCHMARK_SCRIPT,
+                    root,
+                    str(tmp_path / executor),
+                    executor,
+                    RELEASE,
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            report[executor] = json.loads(result.stdout.splitlines()[-1])
+
+        print()
+        for executor, r in report.items():
+            print(
+                f"{executor:>9}: {r['fragments'] / r['seconds']:8.0f} fragments/s, "
+                f"peak RSS {r['peak_rss'] / 2**20:6.0f} MiB"
+            )
+
+        assert {r["fragments"] for r in report.values()} == {320}
+        # One process instead of a pool of workers that each load pyarrow.
+        assert report["threads"]["peak_rss"] < report["processes"]["peak_rss"]
+        assert report["async"]["peak_rss"] < report["processes"]["peak_rss"]
+
+
+class TestReleaseListing:
+    def test_one_listing_builds_the_tree(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 2, 2, 3)
+        (
+            tmp_path
+            / "release"
+            / RELEASE
+            / "theme=theme0"
+            / "type=type0_0"
+            / "_SUCCESS"
+        ).touch()
+
+        theme_paths, tree = list_release_tree(
+            pa_fs.LocalFileSystem(), f"{root}/{RELEASE}"
+        )
+
+        assert [path.rsplit("/", 1)[-1] for path in theme_paths] == [
+            "theme=theme0",
+            "theme=theme1",
+        ]
+        assert sorted(tree["theme1"]) == ["type1_0", "type1_1"]
+        files = tree["theme0"]["type0_0"]
+        assert [path.rsplit("/", 1)[-1] for path, _ in files] == [
+            f"part-{i:05d}-abc.zstd.parquet" for i in range(3)
+        ]
+        assert all(size > 0 for _, size in files)
+
+    def test_build_opens_listed_fragments_without_discovery(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 2, 1, 2)
+
+        with (
+            patch("overture_stac.overture_stac.ds.dataset") as discovery,
+            patch(
+                "overture_stac.listing.fs.FileSelector",
+                wraps=pa_fs.FileSelector,
+            ) as selector,
+        ):
+            release = build(root, tmp_path / "out", "processes", workers=1)
+
+        discovery.assert_not_called()
+        # The release, then each of its two themes and their one type
+        assert [call.kwargs for call in selector.call_args_list] == [
+            {},
+            {},
+            {"recursive": True},
+            {},
+            {"recursive": True},
+        ]
+        assert len(release.manifest_items) == 4
+        # One tail read per footer
+        assert release.stats["footer_requests"] == 4
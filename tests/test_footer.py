@@ -0,0 +1,138 @@
+"""Tests for the single tail-read footer reader."""
+
+import pyarrow as pa
+import pyarrow.fs as pa_fs
+import pyarrow.parquet as pq
+import pytest
+
+from overture_stac.footer import ParquetFooter, read_footer
+
+
+@pytest.fixture
+def parquet_file(tmp_path):
+    path = tmp_path / "part-00000.parquet"
+    table = pa.table({"id": [str(i) for i in range(5000)], "value": range(5000)})
+    # Many row groups make a footer of several KiB
+    pq.write_table(table, path, row_group_size=50)
+    return str(path), path.stat().st_size
+
+
+def footer_length(path: str) -> int:
+    with open(path, "rb") as f:
+        f.seek(-8, 2)
+        return int.from_bytes(f.read(4), "little") + 8
+
+
+class CountingHandler(pa_fs.FileSystemHandler):
+    """Local files, recording which filesystem calls are made."""
+
+    def __init__(self):
+        self.local = pa_fs.LocalFileSystem()
+        self.calls = []
+
+    def __eq__(self, other):
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
+
+    def get_type_name(self):
+        return "counting"
+
+    def get_file_info(self, paths):
+        self.calls.append("get_file_info")
+        return self.local.get_file_info(paths)
+
+    def get_file_info_selector(self, selector):
+        self.calls.append("get_file_info_selector")
+        return self.local.get_file_info(selector)
+
+    def open_input_file(self, path):
+        self.calls.append("open_input_file")
+        return self.local.open_input_file(path)
+
+    def open_input_stream(self, path):
+        self.calls.append("open_input_stream")
+        return self.local.open_input_stream(path)
+
+    def create_dir(self, path, recursive):
+        raise NotImplementedError
+
+    def delete_dir(self, path):
+        raise NotImplementedError
+
+    def delete_dir_contents(self, path, missing_dir_ok=False):
+        raise NotImplementedError
+
+    def delete_root_dir_contents(self):
+        raise NotImplementedError
+
+    def delete_file(self, path):
+        raise NotImplementedError
+
+    def move(self, src, dest):
+        raise NotImplementedError
+
+    def copy_file(self, src, dest):
+        raise NotImplementedError
+
+    def open_output_stream(self, path, metadata):
+        raise NotImplementedError
+
+    def open_append_stream(self, path, metadata):
+        raise NotImplementedError
+
+    def normalize_path(self, path):
+        return path
+
+
+class TestReadFooter:
+    def test_one_tail_read(self, parquet_file):
+        path, size = parquet_file
+        handler = CountingHandler()
+
+        metadata, requests = read_footer(pa_fs.PyFileSystem(handler), path, size)
+
+        assert requests == 1
+        assert handler.calls == ["open_input_file"]
+        # Opened from the listed size: no stat, which on S3 is a HEAD request
+        assert metadata.equals(pq.read_metadata(path))
+
+    def test_oversized_footer_takes_a_second_read(self, parquet_file):
+        path, size = parquet_file
+        assert footer_length(path) > 1024
+
+        metadata, requests = read_footer(
+            pa_fs.LocalFileSystem(), path, size, tail_bytes=1024
+        )
+
+        assert requests == 2
+        assert metadata.num_row_groups == 100
+
+    def test_file_smaller_than_the_tail(self, tmp_path):
+        path = tmp_path / "small.parquet"
+        pq.write_table(pa.table({"a": [1]}), path)
+
+        metadata, requests = read_footer(
+            pa_fs.LocalFileSystem(), str(path), path.stat().st_size
+        )
+
+        assert (metadata.num_rows, requests) == (1, 1)
+
+    def test_not_parquet(self, tmp_path):
+        path = tmp_path / "part-00000.parquet"
+        path.write_bytes(b"not a parquet file at all")
+
+        with pytest.raises(OSError, match="Parquet magic"):
+            read_footer(pa_fs.LocalFileSystem(), str(path), path.stat().st_size)
+
+
+class TestParquetFooter:
+    def test_reads_on_first_use(self, parquet_file):
+        path, size = parquet_file
+        fragment = ParquetFooter(pa_fs.LocalFileSystem(), path, size)
+        assert fragment.requests == 0
+
+        assert fragment.num_row_groups == 100
+        assert fragment.metadata.num_rows == 5000
+        assert fragment.requests == 1
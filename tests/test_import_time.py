@@ -0,0 +1,62 @@
+"""Startup guard: the CLI must not import pyarrow, pystac or stac-geoparquet eagerly."""
+
+import json
+import subprocess
+import sys
+
+HEAVY_PACKAGES = ("pyarrow", "pystac", "stac_geoparquet")
+
+# Cumulative `python -X importtime` budget for `overture_stac.cli`, in
+# microseconds. Loading pyarrow.dataset alone takes several times this.
+IMPORT_BUDGET_US = 250_000
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _heavy_modules_after(code: str) -> list[str]:
+    """Heavy modules in ``sys.modules`` once ``code`` has run (SystemExit allowed)."""
+    result = _run(
+        "import json, sys\n"
+        "try:\n"
+        f"    {code}\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(json.dumps(sorted(m for m in sys.modules "
+        f"if m.split('.')[0] in {HEAVY_PACKAGES!r})))"
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+class TestImportTime:
+    def test_cli_import_is_within_budget(self):
+        stderr = _run("import overture_stac.cli", "-X", "importtime").stderr
+        imported = {}
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                imported[name.strip()] = int(cumulative)
+
+        assert not [m for m in imported if m.split(".")[0] in HEAVY_PACKAGES]
+        assert imported["overture_stac.cli"] < IMPORT_BUDGET_US
+
+    def test_help_skips_heavy_imports(self):
+        code = "from overture_stac.cli import main; main(['--help'])"
+        assert _heavy_modules_after(code) == []
+
+    def test_argument_errors_skip_heavy_imports(self):
+        code = "from overture_stac.cli import main; main(['--release', 'latest'])"
+        assert _heavy_modules_after(code) == []
+
+    def test_subcommand_help_skips_heavy_imports(self):
+        for command in ("query", "diff", "plan", "run", "merge"):
+            code = f"from overture_stac.cli import main; main([{command!r}, '--help'])"
+            assert _heavy_modules_after(code) == [], command
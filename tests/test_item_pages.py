@@ -0,0 +1,105 @@
+"""Tests for the paginated static items pages."""
+
+import json
+
+import pyarrow.fs as pa_fs
+import pytest
+
+from overture_stac.item_pages import page_count
+from overture_stac.overture_stac import OvertureRelease
+from overture_stac.writer import CatalogWriter
+from tests.test_executors import RELEASE, write_synthetic_release
+
+ROOT_HREF = "https://stac.example.com"
+
+
+def build_and_save(tmp_path, fragments: int, item_page_size) -> OvertureRelease:
+    root = write_synthetic_release(tmp_path / "release", 1, 1, fragments)
+    output = tmp_path / "out"
+    release = OvertureRelease(
+        release=RELEASE,
+        schema="1.17.0",
+        output=output,
+        s3_release_path=root,
+        writer=CatalogWriter(output),
+        filesystem=pa_fs.LocalFileSystem(),
+        available_pmtiles={},
+        item_page_size=item_page_size,
+    )
+    release.build_release_catalog(title="Test", executor="threads")
+    release.save(ROOT_HREF)
+    release.writer.flush()
+    return release
+
+
+class TestItemPages:
+    def test_page_count(self):
+        assert page_count(0, 10) == 1
+        assert page_count(10, 10) == 1
+        assert page_count(11, 10) == 2
+
+    def test_pages_are_linked_in_item_order(self, tmp_path):
+        build_and_save(tmp_path, 5, 2)
+        collection_dir = tmp_path / "out" / RELEASE / "theme0" / "type0_0"
+
+        collection = json.loads((collection_dir / "collection.json").read_text())
+        pages_href = f"{ROOT_HREF}/{RELEASE}/theme0/type0_0/items"
+        (items_link,) = [link for link in collection["links"] if link["rel"] == "items"]
+        assert items_link["href"] == f"{pages_href}/page-1.json"
+
+        pages = [
+            json.loads((collection_dir / "items" / f"page-{n}.json").read_text())
+            for n in (1, 2, 3)
+        ]
+        assert not (collection_dir / "items" / "page-4.json").exists()
+        assert [page["numberReturned"] for page in pages] == [2, 2, 1]
+        assert {page["numberMatched"] for page in pages} == {5}
+        ids = [feature["id"] for page in pages for feature in page["features"]]
+        item_links = [
+            link["href"] for link in collection["links"] if link["rel"] == "item"
+        ]
+        assert [href.rsplit("/", 1)[1] for href in item_links] == [
+            f"{item_id}.json" for item_id in ids
+        ]
+
+        rels = [{link["rel"]: link["href"] for link in page["links"]} for page in pages]
+        assert "prev" not in rels[0] and "next" not in rels[2]
+        assert rels[0]["next"] == rels[1]["self"] == f"{pages_href}/page-2.json"
+        assert rels[2]["prev"] == rels[1]["self"]
+        assert (
+            rels[1]["collection"] == f"{pages_href[: -len('/items')]}/collection.json"
+        )
+
+    def test_features_match_the_item_files(self, tmp_path):
+        build_and_save(tmp_path, 2, 10)
+        collection_dir = tmp_path / "out" / RELEASE / "theme0" / "type0_0"
+
+        (page,) = [
+            json.loads(path.read_text())
+            for path in (collection_dir / "items").iterdir()
+        ]
+        for feature in page["features"]:
+            item_file = collection_dir / feature["id"] / f"{feature['id']}.json"
+            item = json.loads(item_file.read_text())
+            # Same item, only the links come out in a different order
+            for stac in (feature, item):
+                stac["links"].sort(key=lambda link: link["rel"])
+            assert feature == item
+
+    def test_off_by_default(self, tmp_path):
+        build_and_save(tmp_path, 2, None)
+        collection_dir = tmp_path / "out" / RELEASE / "theme0" / "type0_0"
+
+        collection = json.loads((collection_dir / "collection.json").read_text())
+        assert not (collection_dir / "items").exists()
+        assert "items" not in {link["rel"] for link in collection["links"]}
+
+    def test_page_size_must_be_positive(self, tmp_path):
+        with pytest.raises(ValueError, match="at least 1"):
+            OvertureRelease(
+                release=RELEASE,
+                schema="1.17.0",
+                output=tmp_path,
+                filesystem=pa_fs.LocalFileSystem(),
+                item_page_size=0,
+            )
@@ -0,0 +1,182 @@
+"""Tests for the paginated, streaming listings."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pyarrow.fs as pa_fs
+import pytest
+
+from overture_stac.listing import buffered, iter_listing
+from overture_stac.overture_stac import iter_release_themes, prefetch_footers
+
+
+def file_info(path: str, size: int = 1) -> pa_fs.FileInfo:
+    return pa_fs.FileInfo(path, type=pa_fs.FileType.File, size=size)
+
+
+class TestIterListing:
+    def test_one_page_per_directory_in_key_order(self, tmp_path):
+        for name in ["theme=base/type=x/part-0", "theme=base-x/part-1", "top"]:
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text("x")
+        filesystem = MagicMock(wraps=pa_fs.LocalFileSystem())
+
+        pages = iter_listing(filesystem, str(tmp_path), recursive=True)
+        first = next(pages)
+        # The first directory is yielded before the others are listed
+        assert filesystem.get_file_info.call_count == 2
+        files = [
+            [i.path[len(str(tmp_path)) + 1 :] for i in page if i.is_file]
+            for page in [first, *pages]
+        ]
+
+        assert files == [
+            ["theme=base-x/part-1"],
+            ["theme=base/type=x/part-0"],
+            ["top"],
+        ]
+        selectors = [call.args[0] for call in filesystem.get_file_info.mock_calls]
+        assert [s.recursive for s in selectors] == [False, True, True]
+
+    def test_not_recursive_is_one_page(self, tmp_path):
+        (tmp_path / "b").mkdir()
+        (tmp_path / "a").write_text("x")
+
+        pages = list(iter_listing(pa_fs.LocalFileSystem(), str(tmp_path)))
+
+        assert [[i.base_name for i in page] for page in pages] == [["a", "b"]]
+
+    def test_s3_paths_go_through_the_filesystem(self):
+        filesystem = MagicMock()
+        filesystem.get_file_info.side_effect = [
+            [pa_fs.FileInfo("bucket/release/a", type=pa_fs.FileType.Directory)],
+            [file_info("bucket/release/a/part-0.parquet", 10)],
+        ]
+
+        pages = list(iter_listing(filesystem, "s3://bucket/release/", recursive=True))
+
+        assert [[(i.path, i.size) for i in page] for page in pages] == [
+            [("bucket/release/a", None), ("bucket/release/a/part-0.parquet", 10)]
+        ]
+        assert filesystem.get_file_info.call_args_list[0].args[0].base_dir == (
+            "bucket/release"
+        )
+
+
+class TestBuffered:
+    def test_yields_in_order(self):
+        assert list(buffered(range(100), maxsize=3)) == list(range(100))
+
+    def test_producer_errors_reach_the_consumer(self):
+        def pages():
+            yield 1
+            raise OSError("listing failed")
+
+        items = buffered(pages())
+        assert next(items) == 1
+        with pytest.raises(OSError, match="listing failed"):
+            next(items)
+
+    def test_producer_stops_when_the_consumer_does(self):
+        produced = []
+
+        def pages():
+            for i in range(1000):
+                produced.append(i)
+                yield i
+
+        items = buffered(pages(), maxsize=2)
+        assert next(items) == 0
+        items.close()
+        threading.Event().wait(0.3)
+        assert len(produced) < 10
+
+
+def write_files(root, names):
+    for name in names:
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text("x")
+
+
+class TestIterReleaseThemes:
+    def test_each_theme_is_yielded_when_its_listing_ends(self, tmp_path):
+        write_files(
+            tmp_path,
+            [
+                "theme=a/type=x/part-0.parquet",
+                "theme=b/type=y/part-1.parquet",
+                "theme=b/type=y/part-0.parquet",
+                "theme=b/type=z/_SUCCESS",
+            ],
+        )
+        local = pa_fs.LocalFileSystem()
+        first_theme_seen = threading.Event()
+
+        def get_file_info(selector):
+            # Theme b is only listed once the consumer already has theme a
+            if "theme=b" in selector.base_dir:
+                assert first_theme_seen.wait(5)
+            return local.get_file_info(selector)
+
+        filesystem = MagicMock()
+        filesystem.get_file_info.side_effect = get_file_info
+        themes = iter_release_themes(filesystem, str(tmp_path))
+        theme_path, types = next(themes)
+        first_theme_seen.set()
+        rest = list(themes)
+
+        assert theme_path == f"{tmp_path}/theme=a"
+        assert types == {"x": [(f"{tmp_path}/theme=a/type=x/part-0.parquet", 1)]}
+        assert rest == [
+            (
+                f"{tmp_path}/theme=b",
+                {
+                    "y": [
+                        (f"{tmp_path}/theme=b/type=y/part-0.parquet", 1),
+                        (f"{tmp_path}/theme=b/type=y/part-1.parquet", 1),
+                    ],
+                    "z": [],
+                },
+            )
+        ]
+        # Each type directory is its own recursive listing
+        selectors = [call.args[0] for call in filesystem.get_file_info.mock_calls]
+        assert [
+            s.base_dir[len(str(tmp_path)) + 1 :] for s in selectors if s.recursive
+        ] == [
+            "theme=a/type=x",
+            "theme=b/type=y",
+            "theme=b/type=z",
+        ]
+
+    def test_theme_names_that_prefix_each_other(self, tmp_path):
+        write_files(
+            tmp_path,
+            [
+                "theme=base-x/type=y/part-0.parquet",
+                "theme=base/type=x/part-0.parquet",
+                "theme=base/type=x/part-1.parquet",
+            ],
+        )
+
+        themes = dict(iter_release_themes(pa_fs.LocalFileSystem(), str(tmp_path)))
+
+        assert sorted(themes) == [f"{tmp_path}/theme=base", f"{tmp_path}/theme=base-x"]
+        assert len(themes[f"{tmp_path}/theme=base"]["x"]) == 2
+        assert len(themes[f"{tmp_path}/theme=base-x"]["y"]) == 1
+
+
+class TestPrefetchFooters:
+    def test_order_and_bounded_queue(self):
+        fragments = [MagicMock(name=f"fragment-{i}") for i in range(10)]
+        pool = MagicMock(wraps=ThreadPoolExecutor(max_workers=4))
+
+        prefetched = prefetch_footers(fragments, pool, depth=3)
+        assert next(prefetched) is fragments[0]
+        assert pool.submit.call_count == 3
+        assert [fragments[0], *prefetched] == fragments
+
+        for fragment in fragments:
+            fragment.ensure_complete_metadata.assert_called_once_with()
+        pool.shutdown()
@@ -0,0 +1,80 @@
+"""Tests for the NDJSON export for pgstac."""
+
+import json
+
+import pyarrow as pa
+import pyarrow.fs as pa_fs
+import pytest
+
+from overture_stac.overture_stac import OvertureRelease
+from overture_stac.pgstac_export import export_paths
+from overture_stac.writer import CatalogWriter
+from tests.test_executors import RELEASE, write_synthetic_release
+
+
+def build_and_save(tmp_path, pgstac_export) -> OvertureRelease:
+    root = write_synthetic_release(tmp_path / "release", 1, 2, 3)
+    output = tmp_path / "out"
+    release = OvertureRelease(
+        release=RELEASE,
+        schema="1.17.0",
+        output=output,
+        s3_release_path=root,
+        writer=CatalogWriter(output),
+        filesystem=pa_fs.LocalFileSystem(),
+        available_pmtiles={},
+        pgstac_export=pgstac_export,
+    )
+    release.build_release_catalog(title="Test", executor="threads")
+    release.save("https://stac.example.com")
+    release.writer.flush()
+    return release
+
+
+def read_ndjson(path, compression=None) -> list[dict]:
+    with pa.input_stream(str(path), compression=compression) as f:
+        return [json.loads(line) for line in f.read().decode().splitlines()]
+
+
+class TestPgstacExport:
+    @pytest.mark.parametrize(
+        "export_format, compression", [("ndjson", None), ("zstd", "zstd")]
+    )
+    def test_collections_and_items(self, tmp_path, export_format, compression):
+        build_and_save(tmp_path, export_format)
+        collections_path, items_path = export_paths(RELEASE, export_format)
+
+        collections = read_ndjson(tmp_path / "out" / collections_path, compression)
+        items = read_ndjson(tmp_path / "out" / items_path, compression)
+
+        assert [c["id"] for c in collections] == ["type0_0", "type0_1"]
+        assert all(c["type"] == "Collection" for c in collections)
+        assert not [
+            link for c in collections for link in c["links"] if link["rel"] == "item"
+        ]
+        assert len(items) == 6
+        assert [item["collection"] for item in items] == 3 * ["type0_0"] + 3 * [
+            "type0_1"
+        ]
+        item = items[0]
+        saved = json.loads(
+            (tmp_path / "out" / RELEASE / "theme0" / "type0_0" / item["id"])
+            .joinpath(f"{item['id']}.json")
+            .read_text()
+        )
+        assert item["properties"] == saved["properties"]
+        assert item["assets"] == saved["assets"]
+
+    def test_off_by_default(self, tmp_path):
+        build_and_save(tmp_path, None)
+        assert not (tmp_path / "out" / RELEASE / "pgstac").exists()
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown pgstac export format"):
+            OvertureRelease(
+                release=RELEASE,
+                schema="1.17.0",
+                output=tmp_path,
+                filesystem=pa_fs.LocalFileSystem(),
+                pgstac_export="csv",
+            )
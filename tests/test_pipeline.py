@@ -0,0 +1,183 @@
+"""Tests for the staged asyncio pipeline executor."""
+
+import asyncio
+import random
+import threading
+import time
+from unittest.mock import patch
+
+import pyarrow.fs as pa_fs
+import pytest
+
+from overture_stac.cli import main
+from overture_stac.overture_stac import OvertureRelease, make_fragments
+from overture_stac.pipeline import PIPELINE_STAGES, ReleasePipeline
+from overture_stac.writer import CatalogWriter
+from tests.test_executors import RELEASE, write_synthetic_release
+
+
+class SlowFooter:
+    """Fragment whose footer read takes a random while, so reads finish out of order."""
+
+    def __init__(self, fragment):
+        self.fragment = fragment
+
+    def ensure_complete_metadata(self):
+        time.sleep(random.uniform(0, 0.01))
+        self.fragment.ensure_complete_metadata()
+
+    def __getattr__(self, name):
+        return getattr(self.fragment, name)
+
+
+class StalledFooter(SlowFooter):
+    """First fragment of a type, whose footer read waits for the others'."""
+
+    def __init__(self, fragment, others: int):
+        super().__init__(fragment)
+        self.others = others
+        self.read = threading.Semaphore(0)
+        self.reads_before = 0
+
+    def ensure_complete_metadata(self):
+        # Until every other footer is read, or nothing holds them back
+        while self.read.acquire(timeout=0.5):
+            self.reads_before += 1
+            if self.reads_before == self.others:
+                break
+        self.fragment.ensure_complete_metadata()
+
+
+class CountedFooter(SlowFooter):
+    def __init__(self, fragment, stalled: StalledFooter):
+        super().__init__(fragment)
+        self.stalled = stalled
+
+    def ensure_complete_metadata(self):
+        self.fragment.ensure_complete_metadata()
+        self.stalled.read.release()
+
+
+def make_release(release_root: str, output, **kwargs) -> OvertureRelease:
+    return OvertureRelease(
+        release=RELEASE,
+        schema="1.17.0",
+        output=output,
+        s3_release_path=release_root,
+        writer=CatalogWriter(output),
+        filesystem=pa_fs.LocalFileSystem(),
+        available_pmtiles={},
+        **kwargs,
+    )
+
+
+def build(release: OvertureRelease, stage_concurrency=None) -> OvertureRelease:
+    release.build_release_catalog(
+        title="Test", executor="pipeline", stage_concurrency=stage_concurrency
+    )
+    return release
+
+
+class TestReleasePipeline:
+    def test_items_keep_listing_order(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 2, 2, 12)
+
+        with patch(
+            "overture_stac.pipeline.make_fragments",
+            lambda filesystem, files: [
+                SlowFooter(f) for f in make_fragments(filesystem, files)
+            ],
+        ):
+            release = build(
+                make_release(root, tmp_path / "out"),
+                {"footers": 8, "render": 3},
+            )
+
+        by_type = {}
+        for feature in release.manifest_items:
+            by_type.setdefault(feature["properties"]["ovt_type"], []).append(
+                feature["properties"]["rel_path"]
+            )
+        assert len(by_type) == 4
+        for paths in by_type.values():
+            assert paths == sorted(paths)
+            assert len(paths) == 12
+
+    def test_metrics_and_bounded_queues(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 2, 2, 6)
+        release = make_release(root, tmp_path / "out")
+        release.make_release_catalog(title="Test")
+        pipeline = ReleasePipeline(release, {"footers": 1, "render": 1}, queue_size=2)
+
+        results = asyncio.run(pipeline.run())
+
+        assert sorted(r.theme_name for r in results) == ["theme0", "theme1"]
+        metrics = {stage: m.to_dict() for stage, m in pipeline.metrics.items()}
+        assert list(metrics) == list(PIPELINE_STAGES)
+        assert metrics["list"]["processed"] == 24
+        assert metrics["footers"]["processed"] == 24
+        assert metrics["render"]["processed"] == 24
+        assert metrics["write"]["processed"] == 4
+        for stage in ("footers", "render", "write"):
+            assert 1 <= metrics[stage]["max_queue_depth"] <= 2
+        assert pipeline.bottleneck() in PIPELINE_STAGES
+
+    def test_stalled_fragment_bounds_the_reorder_buffer(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 1, 1, 20)
+        stalled = []
+
+        def fragments(filesystem, files):
+            first, *rest = make_fragments(filesystem, files)
+            stalled.append(StalledFooter(first, len(rest)))
+            return [stalled[0], *(CountedFooter(f, stalled[0]) for f in rest)]
+
+        release = make_release(root, tmp_path / "out")
+        release.make_release_catalog(title="Test")
+        pipeline = ReleasePipeline(release, {"footers": 8}, reorder_window=4)
+        with patch("overture_stac.pipeline.make_fragments", fragments):
+            (result,) = asyncio.run(pipeline.run())
+
+        # Only the rest of the window got past the stalled fragment
+        assert stalled[0].reads_before == 3
+        assert pipeline.metrics["render"].processed == 20
+
+    def test_build_records_metrics(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 1, 1, 2)
+        release = build(make_release(root, tmp_path / "out"))
+
+        assert release.pipeline_metrics["render"]["processed"] == 2
+        assert len(release.manifest_items) == 2
+
+    def test_stage_failure_is_raised(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 1, 2, 3)
+
+        with (
+            patch(
+                "overture_stac.overture_stac.TypeBuilder.add",
+                side_effect=ValueError("bad footer"),
+            ),
+            pytest.raises(ValueError, match="bad footer"),
+        ):
+            build(make_release(root, tmp_path / "out"))
+
+    def test_unknown_stage(self, tmp_path):
+        release = make_release(str(tmp_path), tmp_path / "out")
+        with pytest.raises(ValueError, match="Unknown pipeline stages: parse"):
+            ReleasePipeline(release, {"parse": 2})
+
+    def test_resumes_from_checkpoints(self, tmp_path):
+        root = write_synthetic_release(tmp_path / "release", 1, 2, 3)
+        first = build(make_release(root, tmp_path / "out", checkpoint=True))
+
+        with patch("overture_stac.pipeline.make_fragments") as opened:
+            resumed = build(
+                make_release(root, tmp_path / "out", checkpoint=True, resume=True)
+            )
+
+        opened.assert_not_called()
+        assert resumed.manifest_items == first.manifest_items
+
+    def test_cli_rejects_bad_stage_concurrency(self):
+        for value in ("parse=2", "footers=0", "footers"):
+            with pytest.raises(SystemExit):
+                main(["--executor", "pipeline", "--stage-concurrency", value])
@@ -10,17 +10,42 @@ import json
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+import pyarrow as pa
+import pyarrow.fs as pa_fs
+import pyarrow.parquet as pq
 import pystac
+import pytest
 
+from overture_stac.checkpoint import CheckpointStore
 from overture_stac.overture_stac import (
+    ITEM_ASSET_DEFINITIONS,
     ITEM_STAC_EXTENSIONS,
+    STORAGE_EXTENSION,
+    STORAGE_SCHEMES,
     OvertureRelease,
+    ThemeResult,
+    TypeResult,
+    build_type_collection,
+    combine_column_stats,
+    init_worker,
     process_theme_worker,
+    process_type,
+    row_group_bboxes,
+    row_groups_table,
 )
 
 
-def make_mock_fragment(path: str, num_rows: int = 100, num_row_groups: int = 2):
-    """Create a mock parquet fragment with metadata."""
+def make_mock_fragment(
+    path: str,
+    num_rows: int = 100,
+    num_row_groups: int = 2,
+    names: tuple[str, ...] = ("id", "geometry", "name"),
+):
+    """Create a mock parquet fragment with metadata.
+
+    The Parquet schema's text is derived from ``names`` so that fragments with
+    the same columns intern to the same schema.
+    """
     geo_metadata = json.dumps(
         {
             "version": "1.0.0",
@@ -30,12 +55,15 @@ def make_mock_fragment(path: str, num_rows: int = 100, num_row_groups: int = 2):
         }
     ).encode("utf-8")
 
-    schema = MagicMock()
-    schema.metadata = {b"geo": geo_metadata}
-    schema.names = ["id", "geometry", "name"]
+    schema = pa.schema(
+        [(name, pa.binary() if name == "geometry" else pa.string()) for name in names],
+        metadata={b"geo": geo_metadata},
+    )
 
     metadata = MagicMock()
     metadata.num_rows = num_rows
+    metadata.metadata = {b"geo": geo_metadata}
+    metadata.schema.__str__.return_value = f"schema({', '.join(names)})"
     metadata.schema.to_arrow_schema.return_value = schema
 
     fragment = MagicMock()
@@ -94,7 +122,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        theme_catalog, manifest_items, type_collections, theme_name = (
+        theme_catalog, manifest_items, type_collections, theme_name, *_ = (
             process_theme_worker(
                 theme_path="bucket/release/theme=test",
                 release_path="s3://bucket/release",
@@ -142,7 +170,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        theme_catalog, manifest_items, type_collections, theme_name = (
+        theme_catalog, manifest_items, type_collections, theme_name, *_ = (
             process_theme_worker(
                 theme_path="bucket/release/theme=things",
                 release_path="s3://bucket/release",
@@ -183,7 +211,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        theme_catalog, _, _, _ = process_theme_worker(
+        theme_catalog, _, _, *_ = process_theme_worker(
             theme_path="bucket/release/theme=things",
             release_path="s3://bucket/release",
             s3_region="us-west-2",
@@ -197,9 +225,9 @@ class TestProcessThemeWorker:
         extra = collection.extra_fields
 
         assert extra["table:columns"] == [
-            {"name": "id"},
-            {"name": "geometry"},
-            {"name": "name"},
+            {"name": "id", "type": "string"},
+            {"name": "geometry", "type": "binary"},
+            {"name": "name", "type": "string"},
         ]
         assert extra["table:primary_geometry"] == "geometry"
         assert extra["table:row_count"] == 3000
@@ -241,7 +269,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        theme_catalog, _, _, _ = process_theme_worker(
+        theme_catalog, _, _, *_ = process_theme_worker(
             theme_path="bucket/release/theme=things",
             release_path="s3://bucket/release",
             s3_region="us-west-2",
@@ -276,7 +304,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        _, _, type_collections, _ = process_theme_worker(
+        _, _, type_collections, *_ = process_theme_worker(
             theme_path="bucket/release/theme=places",
             release_path="s3://bucket/release",
             s3_region="us-west-2",
@@ -315,7 +343,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        _, _, type_collections, _ = process_theme_worker(
+        _, _, type_collections, *_ = process_theme_worker(
             theme_path="bucket/release/theme=places",
             release_path="s3://bucket/release",
             s3_region="us-west-2",
@@ -351,7 +379,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        theme_catalog, _, _, _ = process_theme_worker(
+        theme_catalog, _, _, *_ = process_theme_worker(
             theme_path="bucket/release/theme=dbg",
             release_path="s3://bucket/release",
             s3_region="us-west-2",
@@ -383,7 +411,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        theme_catalog, _, _, _ = process_theme_worker(
+        theme_catalog, _, _, *_ = process_theme_worker(
             theme_path="bucket/release/theme=buildings",
             release_path="s3://bucket/release",
             s3_region="us-west-2",
@@ -416,7 +444,7 @@ class TestProcessThemeWorker:
         mock_fs.S3FileSystem.return_value = mock_filesystem
         mock_ds.dataset.return_value = dataset
 
-        theme_catalog, _, _, _ = process_theme_worker(
+        theme_catalog, _, _, *_ = process_theme_worker(
             theme_path="bucket/release/theme=places",
             release_path="s3://bucket/release",
             s3_region="us-west-2",
@@ -443,14 +471,446 @@ class TestProcessThemeWorker:
         assert collections[0].title == "place"
 
 
+class TestCompactProfile:
+    """The compact profile moves per-item constants onto the collection."""
+
+    def _run(self, mock_fs, mock_ds, profile: str) -> ThemeResult:
+        fragments = [
+            make_mock_fragment(
+                f"bucket/release/theme=places/type=place/part-0000{i}-abc.parquet",
+            )
+            for i in range(3)
+        ]
+        file_info, dataset = make_mock_theme_type(
+            "bucket/release/theme=places/type=place", fragments
+        )
+        mock_filesystem = MagicMock()
+        mock_filesystem.get_file_info.return_value = [file_info]
+        mock_fs.S3FileSystem.return_value = mock_filesystem
+        mock_ds.dataset.return_value = dataset
+
+        return process_theme_worker(
+            theme_path="bucket/release/theme=places",
+            release_path="s3://bucket/release",
+            s3_region="us-west-2",
+            debug=False,
+            release_datetime=datetime(2026, 4, 15),
+            release="2026-04-15.0",
+            available_pmtiles={},
+            profile=profile,
+        )
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_items_drop_schemes_and_shared_asset_fields(self, mock_fs, mock_ds):
+        result = self._run(mock_fs, mock_ds, "compact")
+        item = result.type_collections["place"][0]
+
+        assert "storage:schemes" not in item.properties
+        for key in ("aws", "azure"):
+            asset = item.assets[key].to_dict()
+            assert set(asset) >= {"href", "storage:refs"}
+            assert not set(asset) & {"type", "title", "description", "roles"}
+        # Items still use storage:refs / alternate, so still declare them.
+        for ext_url in ITEM_STAC_EXTENSIONS:
+            assert ext_url in item.stac_extensions
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_collection_declares_schemes_and_item_assets(self, mock_fs, mock_ds):
+        result = self._run(mock_fs, mock_ds, "compact")
+        collection = next(iter(result.theme_catalog.get_children()))
+
+        assert collection.extra_fields["storage:schemes"] == STORAGE_SCHEMES
+        assert collection.extra_fields["item_assets"] == ITEM_ASSET_DEFINITIONS
+        assert STORAGE_EXTENSION in collection.stac_extensions
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_stats_report_size_reduction(self, mock_fs, mock_ds):
+        full = self._run(mock_fs, mock_ds, "full").stats
+        compact = self._run(mock_fs, mock_ds, "compact").stats
+
+        assert full["items"] == compact["items"] == 3
+        assert compact["item_bytes"] < compact["item_bytes_full"]
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_full_profile_does_not_measure_items(self, mock_fs, mock_ds):
+        with patch("overture_stac.overture_stac.item_json_size") as item_json_size:
+            stats = self._run(mock_fs, mock_ds, "full").stats
+
+        item_json_size.assert_not_called()
+        assert stats["item_bytes"] == stats["item_bytes_full"] == 0
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_full_profile_leaves_collection_untouched(self, mock_fs, mock_ds):
+        result = self._run(mock_fs, mock_ds, "full")
+        collection = next(iter(result.theme_catalog.get_children()))
+        assert "storage:schemes" not in collection.extra_fields
+        assert "item_assets" not in collection.extra_fields
+
+    def test_unknown_profile_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            OvertureRelease(
+                release="2026-04-15.0",
+                schema="1.0",
+                output=str(tmp_path),
+                profile="tiny",
+            )
+
+
+class TestSchemaInterning:
+    """Fragments sharing a schema are converted once; the rest are reported."""
+
+    def _run(self, mock_fs, mock_ds, fragments) -> ThemeResult:
+        file_info, dataset = make_mock_theme_type(
+            "bucket/release/theme=places/type=place", fragments
+        )
+        mock_filesystem = MagicMock()
+        mock_filesystem.get_file_info.return_value = [file_info]
+        mock_fs.S3FileSystem.return_value = mock_filesystem
+        mock_ds.dataset.return_value = dataset
+
+        return process_theme_worker(
+            theme_path="bucket/release/theme=places",
+            release_path="s3://bucket/release",
+            s3_region="us-west-2",
+            debug=False,
+            release_datetime=datetime(2026, 4, 15),
+            release="2026-04-15.0",
+            available_pmtiles={},
+        )
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_shared_schema_converted_once(self, mock_fs, mock_ds):
+        fragments = [
+            make_mock_fragment(
+                f"bucket/release/theme=places/type=place/part-0000{i}-abc.parquet"
+            )
+            for i in range(4)
+        ]
+        result = self._run(mock_fs, mock_ds, fragments)
+
+        conversions = sum(
+            f.metadata.schema.to_arrow_schema.call_count for f in fragments
+        )
+        assert conversions == 1
+        assert result.stats["schemas"] == 1
+        assert result.stats["schema_drift_fragments"] == 0
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_drifted_fragments_reported(self, mock_fs, mock_ds, caplog):
+        fragments = [
+            make_mock_fragment(
+                "bucket/release/theme=places/type=place/part-00000-abc.parquet"
+            ),
+            make_mock_fragment(
+                "bucket/release/theme=places/type=place/part-00001-abc.parquet"
+            ),
+            make_mock_fragment(
+                "bucket/release/theme=places/type=place/part-00002-abc.parquet",
+                names=("id", "geometry", "name", "extra"),
+            ),
+        ]
+        with caplog.at_level("WARNING", logger="pystac"):
+            result = self._run(mock_fs, mock_ds, fragments)
+
+        assert result.stats["schemas"] == 2
+        assert result.stats["schema_drift_fragments"] == 1
+        assert "part-00002-abc.parquet" in caplog.text
+
+        # table:columns come from the first fragment, not the last one seen
+        collection = next(iter(result.theme_catalog.get_children()))
+        assert [c["name"] for c in collection.extra_fields["table:columns"]] == [
+            "id",
+            "geometry",
+            "name",
+        ]
+
+    def test_real_footers(self, tmp_path, caplog):
+        """Identical footers read from separate files share one schema."""
+        geo = json.dumps(
+            {"version": "1.1.0", "columns": {"geometry": {"bbox": [0, 0, 1, 1]}}}
+        )
+        tables = [pa.table({"id": ["a"], "value": [i]}) for i in range(3)]
+        tables.append(pa.table({"id": ["a"], "value": ["drifted"]}))
+        fragments = []
+        for i, table in enumerate(tables):
+            local_path = tmp_path / f"part-0000{i}-a.parquet"
+            pq.write_table(table.replace_schema_metadata({b"geo": geo}), local_path)
+            fragment = MagicMock()
+            fragment.path = f"bucket/release/theme=places/type=place/{local_path.name}"
+            fragment.metadata = pq.ParquetFile(local_path).metadata
+            fragment.num_row_groups = 1
+            fragments.append(fragment)
+
+        with caplog.at_level("WARNING", logger="pystac"):
+            result = process_type("place", fragments, datetime(2026, 4, 15))
+
+        assert result.stats["schemas"] == 2
+        assert result.stats["schema_drift_fragments"] == 1
+        assert "1 of 4 fragments" in caplog.text
+        assert result.columns[1] == {"name": "value", "type": "int64"}
+
+
+def make_fragment_with_row_groups(tmp_path, path: str):
+    """A mock fragment backed by a real footer with two row groups and a bbox column."""
+    bboxes = [(0, 0, 1, 1), (2, 2, 3, 3), (10, 10, 11, 11), (12, 10, 13, 12)]
+    table = pa.table(
+        {
+            "id": ["a", "b", "c", "d"],
+            "bbox": [
+                {"xmin": x0, "ymin": y0, "xmax": x1, "ymax": y1}
+                for x0, y0, x1, y1 in bboxes
+            ],
+        }
+    ).replace_schema_metadata(
+        {
+            b"geo": json.dumps(
+                {"version": "1.1.0", "columns": {"geometry": {"bbox": [0, 0, 13, 12]}}}
+            )
+        }
+    )
+    local_path = tmp_path / path.split("/")[-1]
+    pq.write_table(table, local_path, row_group_size=2)
+
+    fragment = MagicMock()
+    fragment.path = path
+    fragment.metadata = pq.ParquetFile(local_path).metadata
+    fragment.num_row_groups = fragment.metadata.num_row_groups
+    return fragment
+
+
+class TestRowGroupIndex:
+    """Per-row-group bboxes come from the bbox column statistics in the footer."""
+
+    def _run(self, mock_fs, mock_ds, fragments, row_group_index) -> ThemeResult:
+        file_info, dataset = make_mock_theme_type(
+            "bucket/release/theme=places/type=place", fragments
+        )
+        mock_filesystem = MagicMock()
+        mock_filesystem.get_file_info.return_value = [file_info]
+        mock_fs.S3FileSystem.return_value = mock_filesystem
+        mock_ds.dataset.return_value = dataset
+
+        return process_theme_worker(
+            theme_path="bucket/release/theme=places",
+            release_path="s3://bucket/release",
+            s3_region="us-west-2",
+            debug=False,
+            release_datetime=datetime(2026, 4, 15),
+            release="2026-04-15.0",
+            available_pmtiles={},
+            row_group_index=row_group_index,
+        )
+
+    def test_row_group_bboxes_from_statistics(self, tmp_path):
+        fragment = make_fragment_with_row_groups(tmp_path, "b/part-00000-a.parquet")
+        columns = (1, 2, 3, 4)
+        assert row_group_bboxes(fragment.metadata, columns, [0, 0, 13, 12]) == [
+            {"row_offset": 0, "num_rows": 2, "bbox": [0, 0, 3, 3]},
+            {"row_offset": 2, "num_rows": 2, "bbox": [10, 10, 13, 12]},
+        ]
+
+    def test_missing_bbox_column_falls_back_to_file_bbox(self, tmp_path):
+        fragment = make_fragment_with_row_groups(tmp_path, "b/part-00000-a.parquet")
+        row_groups = row_group_bboxes(fragment.metadata, None, [0, 0, 13, 12])
+        assert [rg["bbox"] for rg in row_groups] == [[0, 0, 13, 12]] * 2
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_properties_mode_adds_row_groups_to_items(self, mock_fs, mock_ds, tmp_path):
+        fragment = make_fragment_with_row_groups(
+            tmp_path, "bucket/release/theme=places/type=place/part-00000-abc.parquet"
+        )
+        result = self._run(mock_fs, mock_ds, [fragment], "properties")
+
+        item = result.type_collections["place"][0]
+        assert [rg["bbox"] for rg in item.properties["row_groups"]] == [
+            [0, 0, 3, 3],
+            [10, 10, 13, 12],
+        ]
+        assert result.row_groups == []
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_sidecar_mode_returns_index_records(self, mock_fs, mock_ds, tmp_path):
+        fragment = make_fragment_with_row_groups(
+            tmp_path, "bucket/release/theme=places/type=place/part-00000-abc.parquet"
+        )
+        result = self._run(mock_fs, mock_ds, [fragment], "sidecar")
+
+        assert "row_groups" not in result.type_collections["place"][0].properties
+        table = row_groups_table(result.row_groups)
+        assert table.column("row_group").to_pylist() == [0, 1]
+        assert table.column("row_offset").to_pylist() == [0, 2]
+        assert table.column("bbox").to_pylist()[1] == {
+            "xmin": 10,
+            "ymin": 10,
+            "xmax": 13,
+            "ymax": 12,
+        }
+        assert set(table.column("rel_path").to_pylist()) == {
+            "release/theme=places/type=place/part-00000-abc.parquet"
+        }
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_off_by_default(self, mock_fs, mock_ds, tmp_path):
+        fragment = make_fragment_with_row_groups(
+            tmp_path, "bucket/release/theme=places/type=place/part-00000-abc.parquet"
+        )
+        result = self._run(mock_fs, mock_ds, [fragment], None)
+        assert "row_groups" not in result.type_collections["place"][0].properties
+        assert result.row_groups == []
+
+
+class TestColumnStats:
+    """table:columns carry types, sizes and null fractions from the footers."""
+
+    def test_typed_columns_with_sizes(self, tmp_path):
+        fragments = [
+            make_fragment_with_row_groups(
+                tmp_path,
+                f"bucket/release/theme=places/type=place/part-0000{i}-a.parquet",
+            )
+            for i in range(2)
+        ]
+        result = process_type("place", fragments, datetime(2026, 4, 15))
+
+        footer = fragments[0].metadata
+        id_bytes = sum(
+            footer.row_group(i).column(0).total_compressed_size for i in range(2)
+        )
+        assert result.column_stats["id"] == {
+            "compressed_bytes": 2 * id_bytes,
+            "uncompressed_bytes": result.column_stats["id"]["uncompressed_bytes"],
+            "values": 8,
+            "nulls": 0,
+        }
+        # Four leaves of two row groups of two fragments
+        assert result.column_stats["bbox"]["values"] == 32
+        assert result.column_stats["bbox"]["nulls"] is None
+
+        columns = build_type_collection(result).extra_fields["table:columns"]
+        assert columns[0] == {
+            "name": "id",
+            "type": "string",
+            "compressed_bytes": 2 * id_bytes,
+            "uncompressed_bytes": result.column_stats["id"]["uncompressed_bytes"],
+            "null_fraction": 0.0,
+        }
+        assert columns[1]["name"] == "bbox"
+        assert columns[1]["type"] == (
+            "struct<xmin: int64, ymin: int64, xmax: int64, ymax: int64>"
+        )
+        assert "null_fraction" not in columns[1]
+
+    def test_chunks_combine(self):
+        a = {"id": {"compressed_bytes": 1, "uncompressed_bytes": 2, "values": 4}}
+        b = {"id": {"compressed_bytes": 10, "uncompressed_bytes": 20, "values": 6}}
+
+        assert combine_column_stats(
+            [{"id": {**a["id"], "nulls": 1}}, {"id": {**b["id"], "nulls": 2}}]
+        ) == {
+            "id": {
+                "compressed_bytes": 11,
+                "uncompressed_bytes": 22,
+                "values": 10,
+                "nulls": 3,
+            }
+        }
+        combined = combine_column_stats(
+            [{"id": {**a["id"], "nulls": 1}}, {"id": {**b["id"], "nulls": None}}]
+        )
+        assert combined["id"]["nulls"] is None
+
+
+class TestCheckpoints:
+    """Finished types are checkpointed and reused by --resume."""
+
+    def _run(self, mock_fs, mock_ds, checkpoints, resume) -> ThemeResult:
+        fragments = [
+            make_mock_fragment(
+                f"bucket/release/theme=places/type=place/part-0000{i}-abc.parquet",
+                num_rows=10 * (i + 1),
+            )
+            for i in range(2)
+        ]
+        file_info, dataset = make_mock_theme_type(
+            "bucket/release/theme=places/type=place", fragments
+        )
+        mock_filesystem = MagicMock()
+        mock_filesystem.get_file_info.return_value = [file_info]
+        mock_fs.S3FileSystem.return_value = mock_filesystem
+        mock_ds.dataset.return_value = dataset
+
+        return process_theme_worker(
+            theme_path="bucket/release/theme=places",
+            release_path="s3://bucket/release",
+            s3_region="us-west-2",
+            debug=False,
+            release_datetime=datetime(2026, 4, 15),
+            release="2026-04-15.0",
+            available_pmtiles={},
+            checkpoints=checkpoints,
+            resume=resume,
+        )
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_finished_types_are_checkpointed(self, mock_fs, mock_ds, tmp_path):
+        store = CheckpointStore(pa_fs.LocalFileSystem(), str(tmp_path))
+        result = self._run(mock_fs, mock_ds, store, resume=False)
+
+        checkpoint = TypeResult.from_dict(store.load("places", "place"))
+        assert [i.id for i in checkpoint.items] == [
+            i.id for i in result.type_collections["place"]
+        ]
+        assert checkpoint.stats["items"] == 2
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_resume_skips_checkpointed_types(self, mock_fs, mock_ds, tmp_path):
+        store = CheckpointStore(pa_fs.LocalFileSystem(), str(tmp_path))
+        first = self._run(mock_fs, mock_ds, store, resume=False)
+
+        mock_ds.dataset.reset_mock()
+        resumed = self._run(mock_fs, mock_ds, store, resume=True)
+
+        mock_ds.dataset.assert_not_called()
+        first_collection = next(iter(first.theme_catalog.get_children()))
+        resumed_collection = next(iter(resumed.theme_catalog.get_children()))
+        assert resumed_collection.to_dict(
+            include_self_link=False, transform_hrefs=False
+        ) == first_collection.to_dict(include_self_link=False, transform_hrefs=False)
+        assert resumed.manifest_items == first.manifest_items
+        assert resumed.stats == first.stats
+
+    @patch("overture_stac.overture_stac.ds")
+    @patch("overture_stac.overture_stac.fs")
+    def test_without_resume_checkpoints_are_rebuilt(self, mock_fs, mock_ds, tmp_path):
+        store = CheckpointStore(pa_fs.LocalFileSystem(), str(tmp_path))
+        self._run(mock_fs, mock_ds, store, resume=False)
+        mock_ds.dataset.reset_mock()
+
+        self._run(mock_fs, mock_ds, store, resume=False)
+        mock_ds.dataset.assert_called_once()
+
+
 class TestBuildReleaseCatalog:
     """Tests for the build_release_catalog method."""
 
+    @patch("overture_stac.writer.CatalogWriter.write_parquet")
     @patch("overture_stac.overture_stac.stac_geoparquet")
     @patch("overture_stac.overture_stac.fs")
     @patch("overture_stac.overture_stac.process_theme_worker")
     def test_workers_1_runs_in_process(
-        self, mock_worker, mock_fs, mock_stac_geoparquet
+        self, mock_worker, mock_fs, mock_stac_geoparquet, _mock_write_parquet, tmp_path
     ):
         """Verify workers<=1 calls process_theme_worker directly (no subprocess)."""
         mock_filesystem = MagicMock()
@@ -461,18 +921,16 @@ class TestBuildReleaseCatalog:
         mock_stac_geoparquet.arrow.parse_stac_items_to_arrow.return_value = mock_table
 
         mock_catalog = pystac.Catalog(id="test", description="test theme")
-        mock_worker.return_value = (mock_catalog, [], {}, "test")
+        mock_worker.return_value = ThemeResult(mock_catalog, [], {}, "test", {})
 
         release = OvertureRelease(
             release="2026-04-15.0",
             schema="1.0",
-            output="test_output",
+            output=str(tmp_path),
         )
 
-        # Patch get_release_themes to set themes directly
-        mock_theme = MagicMock()
-        mock_theme.path = "bucket/release/theme=test"
-        release.get_release_themes = lambda: setattr(release, "themes", [mock_theme])
+        # Patch get_release_themes to yield the theme paths directly
+        release.get_release_themes = lambda: iter(["bucket/release/theme=test"])
 
         with patch("overture_stac.overture_stac.ProcessPoolExecutor") as mock_pool_cls:
             release.build_release_catalog(title="Test", max_workers=1)
@@ -482,11 +940,12 @@ class TestBuildReleaseCatalog:
         # But process_theme_worker should have been called directly
         mock_worker.assert_called_once()
 
+    @patch("overture_stac.writer.CatalogWriter.write_parquet")
     @patch("overture_stac.overture_stac.stac_geoparquet")
     @patch("overture_stac.overture_stac.fs")
     @patch("overture_stac.overture_stac.process_theme_worker")
     def test_workers_gt1_uses_process_pool(
-        self, mock_worker, mock_fs, mock_stac_geoparquet
+        self, mock_worker, mock_fs, mock_stac_geoparquet, _mock_write_parquet, tmp_path
     ):
         """Verify workers>1 uses ProcessPoolExecutor."""
         mock_filesystem = MagicMock()
@@ -501,16 +960,16 @@ class TestBuildReleaseCatalog:
         release = OvertureRelease(
             release="2026-04-15.0",
             schema="1.0",
-            output="test_output",
+            output=str(tmp_path),
         )
 
-        mock_theme = MagicMock()
-        mock_theme.path = "bucket/release/theme=test"
-        release.get_release_themes = lambda: setattr(release, "themes", [mock_theme])
+        release.get_release_themes = lambda: iter(["bucket/release/theme=test"])
 
         with patch("overture_stac.overture_stac.ProcessPoolExecutor") as mock_pool_cls:
             mock_future = MagicMock()
-            mock_future.result.return_value = (mock_catalog, [], {}, "test")
+            mock_future.result.return_value = ThemeResult(
+                mock_catalog, [], {}, "test", {}
+            )
 
             mock_executor = MagicMock()
             mock_executor.__enter__ = MagicMock(return_value=mock_executor)
@@ -526,4 +985,7 @@ class TestBuildReleaseCatalog:
             ):
                 release.build_release_catalog(title="Test", max_workers=4)
 
-            mock_pool_cls.assert_called_once_with(max_workers=4)
+            mock_pool_cls.assert_called_once()
+            kwargs = mock_pool_cls.call_args.kwargs
+            assert kwargs["max_workers"] == 4
+            assert kwargs["initializer"] is init_worker
@@ -0,0 +1,161 @@
+"""Unit tests for bbox queries over collections.parquet and `gen-stac query`."""
+
+import io
+import threading
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pystac
+import pytest
+import stac_geoparquet
+
+from overture_stac.cli import main
+from overture_stac.query import collections_href, query_collections
+from overture_stac.writer import CatalogWriter
+
+RELEASE = "2026-08-05.0"
+
+
+def _item(collection: str, item_id: str, bbox: list[float]) -> pystac.Item:
+    xmin, ymin, xmax, ymax = bbox
+    rel_path = f"release/{RELEASE}/type={collection}/part-{item_id}.parquet"
+    item = pystac.Item(
+        id=item_id,
+        geometry={
+            "type": "Polygon",
+            "coordinates": [
+                [[xmin, ymin], [xmax, ymin], [xmax, ymax], [xmin, ymax], [xmin, ymin]]
+            ],
+        },
+        bbox=bbox,
+        datetime=datetime(2026, 8, 5),
+        properties={"num_rows": 10},
+        collection=collection,
+    )
+    item.add_asset(
+        "aws",
+        pystac.Asset(
+            href=f"https://aws.example.com/{rel_path}",
+            extra_fields={"alternate": {"s3": {"href": f"s3://bucket/{rel_path}"}}},
+        ),
+    )
+    item.add_asset("azure", pystac.Asset(href=f"https://azure.example.com/{rel_path}"))
+    return item
+
+
+def _write_collections(root) -> None:
+    items = [
+        _item("building", "00000", [0.0, 0.0, 10.0, 10.0]),
+        _item("building", "00001", [20.0, 20.0, 30.0, 30.0]),
+        _item("place", "00000", [5.0, 5.0, 6.0, 6.0]),
+    ]
+    writer = CatalogWriter(root)
+    writer.write_parquet(
+        f"{RELEASE}/collections.parquet",
+        stac_geoparquet.arrow.parse_stac_items_to_arrow(items),
+    )
+    writer.finalize()
+
+
+class _RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Serves files with support for single `Range: bytes=a-b` requests."""
+
+    def send_head(self):
+        range_header = self.headers.get("Range")
+        if range_header is None:
+            return super().send_head()
+        path = self.translate_path(self.path)
+        with open(path, "rb") as f:
+            data = f.read()
+        start, end = (int(v) for v in range_header.split("=")[1].split("-"))
+        body = data[start : end + 1]
+        self.send_response(206)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.end_headers()
+        self.range_requests.append(range_header)
+        return io.BytesIO(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestQueryCollections:
+    def test_bbox_intersection(self, tmp_path):
+        _write_collections(tmp_path)
+        result = query_collections(
+            collections_href(str(tmp_path), RELEASE), [4.0, 4.0, 7.0, 7.0]
+        )
+        assert sorted(
+            zip(result["collection"].to_pylist(), result["id"].to_pylist(), strict=True)
+        ) == [
+            ("building", "00000"),
+            ("place", "00000"),
+        ]
+
+    def test_type_filter_and_s3_hrefs(self, tmp_path):
+        _write_collections(tmp_path)
+        result = query_collections(
+            collections_href(str(tmp_path), RELEASE),
+            [-180.0, -90.0, 180.0, 90.0],
+            types=["building"],
+            asset="s3",
+        )
+        assert sorted(result["href"].to_pylist()) == [
+            f"s3://bucket/release/{RELEASE}/type=building/part-00000.parquet",
+            f"s3://bucket/release/{RELEASE}/type=building/part-00001.parquet",
+        ]
+
+    def test_no_match_returns_empty_table(self, tmp_path):
+        _write_collections(tmp_path)
+        result = query_collections(
+            collections_href(str(tmp_path), RELEASE), [100.0, 50.0, 101.0, 51.0]
+        )
+        assert result.num_rows == 0
+
+    def test_unknown_asset_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            query_collections("unused.parquet", [0, 0, 1, 1], asset="gcs")
+
+    def test_remote_catalog_read_with_range_requests(self, tmp_path):
+        _write_collections(tmp_path)
+        handler = partial(_RangeRequestHandler, directory=str(tmp_path))
+        _RangeRequestHandler.range_requests = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}"
+            result = query_collections(
+                collections_href(url, RELEASE), [4.0, 4.0, 7.0, 7.0], types=["place"]
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert result["id"].to_pylist() == ["00000"]
+        assert _RangeRequestHandler.range_requests
+
+
+class TestQueryCommand:
+    def test_prints_matching_hrefs(self, tmp_path, capsys):
+        _write_collections(tmp_path)
+        main(
+            [
+                "query",
+                "--catalog",
+                str(tmp_path),
+                "--release",
+                RELEASE,
+                "--bbox",
+                "4",
+                "4",
+                "7",
+                "7",
+                "--type",
+                "place",
+            ]
+        )
+        assert capsys.readouterr().out.splitlines() == [
+            f"https://aws.example.com/release/{RELEASE}/type=place/part-00000.parquet"
+        ]
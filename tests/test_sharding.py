@@ -0,0 +1,239 @@
+"""Unit tests for sharded builds: plan, run --shard i/N and merge."""
+
+import json
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.fs as pa_fs
+import pyarrow.parquet as pq
+import pytest
+
+from overture_stac.cli import main
+from overture_stac.overture_stac import prefetch_footers
+from overture_stac.sharding import (
+    assign_units,
+    load_plan,
+    make_plan,
+    merge_partials,
+    parse_shard,
+    run_shard,
+    write_plan,
+)
+from overture_stac.validate import ValidationReport
+from overture_stac.writer import CatalogWriter
+
+RELEASE = "2026-08-05.0"
+ROOT_HREF = "https://stac.example.com"
+# theme -> type -> number of fragments
+LAYOUT = {
+    "buildings": {"building": 7, "building_part": 2},
+    "places": {"place": 4},
+    "divisions": {"division": 0},
+}
+
+
+def _write_fragment(path, index: int) -> None:
+    x = float(index)
+    table = pa.table(
+        {
+            "id": [f"{index}-a", f"{index}-b"],
+            "bbox": [
+                {"xmin": x, "ymin": 0.0, "xmax": x + 0.5, "ymax": 0.5},
+                {"xmin": x + 0.5, "ymin": 0.5, "xmax": x + 1, "ymax": 1.0},
+            ],
+        }
+    ).replace_schema_metadata(
+        {
+            b"geo": json.dumps(
+                {
+                    "version": "1.1.0",
+                    "columns": {"geometry": {"bbox": [x, 0, x + 1, 1]}},
+                }
+            )
+        }
+    )
+    pq.write_table(table, path)
+
+
+@pytest.fixture
+def release_root(tmp_path):
+    root = tmp_path / "release"
+    for theme, types in LAYOUT.items():
+        for type_name, count in types.items():
+            type_dir = root / RELEASE / f"theme={theme}" / f"type={type_name}"
+            type_dir.mkdir(parents=True)
+            for i in range(count):
+                _write_fragment(type_dir / f"part-{i:05d}-abc.zstd.parquet", i)
+    return str(root)
+
+
+def _plan(release_root, shards: int) -> dict:
+    return make_plan(
+        [
+            {
+                "release": RELEASE,
+                "schema": "1.17.0",
+                "title": "Latest Overture Release",
+                "latest": True,
+            }
+        ],
+        shards,
+        pa_fs.LocalFileSystem(),
+        [RELEASE],
+        release_root=release_root,
+        full=True,
+    )
+
+
+def _build(tmp_path, release_root, shards: int, name: str):
+    plan = _plan(release_root, shards)
+    local = pa_fs.LocalFileSystem()
+    partials = str(tmp_path / f"{name}-partials")
+    for index in range(shards):
+        run_shard(plan, index, local, partials, local)
+    output = tmp_path / name
+    merge_partials(plan, local, partials, CatalogWriter(output), ROOT_HREF)
+    return output
+
+
+def _files(root) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class TestPlan:
+    def test_parse_shard(self):
+        assert parse_shard("2/8") == (2, 8)
+        for bad in ("8/8", "-1/4", "1", "a/b", "0/0"):
+            with pytest.raises(ValueError):
+                parse_shard(bad)
+
+    def test_assignment_balances_fragments(self):
+        assignments = assign_units([5, 4, 3, 3, 2, 1], 2)
+        assert assignments == [[0, 3, 5], [1, 2, 4]]
+
+    def test_every_fragment_is_planned_once(self, release_root):
+        plan = _plan(release_root, 3)
+
+        assigned = sorted(i for units in plan["assignments"] for i in units)
+        assert assigned == list(range(len(plan["units"])))
+        fragments = [path for u in plan["units"] for path, _ in u["fragments"]]
+        assert len(fragments) == len(set(fragments)) == 13
+        # An empty type is kept, as one empty chunk
+        (division,) = [u for u in plan["units"] if u["type"] == "division"]
+        assert division["fragments"] == []
+        assert plan["releases"][0]["themes"]["buildings"] == [
+            "building",
+            "building_part",
+        ]
+
+    def test_plan_round_trips(self, tmp_path, release_root):
+        plan = _plan(release_root, 2)
+        write_plan(str(tmp_path / "plan.json"), plan)
+        assert load_plan(str(tmp_path / "plan.json")) == plan
+
+
+class TestMerge:
+    def test_output_does_not_depend_on_shard_count(self, tmp_path, release_root):
+        one = _files(_build(tmp_path, release_root, 1, "one"))
+        three = _files(_build(tmp_path, release_root, 3, "three"))
+
+        assert one == three
+        assert f"{RELEASE}/collections.parquet" in one
+        manifest = json.loads(one[f"{RELEASE}/manifest.geojson"])
+        assert len(manifest["features"]) == 13
+
+    def test_merged_catalog_has_every_type(self, tmp_path, release_root):
+        output = _build(tmp_path, release_root, 2, "out")
+
+        catalog = json.loads((output / RELEASE / "catalog.json").read_text())
+        assert catalog["latest"] is True
+        building = json.loads(
+            (
+                output / RELEASE / "buildings" / "building" / "collection.json"
+            ).read_text()
+        )
+        assert building["table:row_count"] == 14
+        places = json.loads(
+            (output / RELEASE / "places" / "place" / "collection.json").read_text()
+        )
+        assert places["table:row_count"] == 8
+        division = json.loads(
+            (
+                output / RELEASE / "divisions" / "division" / "collection.json"
+            ).read_text()
+        )
+        assert division["table:row_count"] == 0
+
+    def test_shard_reads_footers_on_a_pool(self, tmp_path, release_root):
+        plan = _plan(release_root, 1)
+        local = pa_fs.LocalFileSystem()
+
+        with patch(
+            "overture_stac.overture_stac.prefetch_footers", wraps=prefetch_footers
+        ) as prefetch:
+            run_shard(plan, 0, local, str(tmp_path / "partials"), local, workers=2)
+
+        pools = {call.args[1] for call in prefetch.call_args_list}
+        assert len(pools) == 1
+        assert pools.pop()._max_workers == 2
+
+    def test_missing_partial_names_its_shard(self, tmp_path, release_root):
+        plan = _plan(release_root, 2)
+        local = pa_fs.LocalFileSystem()
+        partials = str(tmp_path / "partials")
+        run_shard(plan, 0, local, partials, local)
+
+        with pytest.raises(FileNotFoundError, match="rerun shard 1/2"):
+            merge_partials(
+                plan, local, partials, CatalogWriter(tmp_path / "out"), ROOT_HREF
+            )
+
+    def test_cli_output_options(self, tmp_path, release_root):
+        plan = _plan(release_root, 1)
+        write_plan(str(tmp_path / "plan.json"), plan)
+        local = pa_fs.LocalFileSystem()
+        run_shard(plan, 0, local, str(tmp_path / "partials"), local)
+        output = tmp_path / "out"
+        merge = [
+            "merge",
+            "--plan",
+            str(tmp_path / "plan.json"),
+            "--partials",
+            str(tmp_path / "partials"),
+            "--output",
+            str(output),
+            "--root-href",
+            ROOT_HREF,
+            "--workers",
+            "1",
+        ]
+
+        with (
+            patch("overture_stac.sharding.add_changes_link") as add_changes_link,
+            patch(
+                "overture_stac.cli.validate_output", return_value=ValidationReport()
+            ) as validate_output,
+        ):
+            main([*merge, "--precompress", "gzip", "--changes", "--validate"])
+
+        assert (output / RELEASE / "catalog.json.gz").is_file()
+        validate_output.assert_called_once_with(str(output), 1)
+        (call,) = add_changes_link.call_args_list
+        release, release_ids, root_href = call.args
+        assert (release.release, release_ids, root_href) == (
+            RELEASE,
+            [RELEASE],
+            ROOT_HREF,
+        )
+
+        invalid = ValidationReport(1, (("catalog.json", "invalid"),))
+        with (
+            patch("overture_stac.cli.validate_output", return_value=invalid),
+            pytest.raises(SystemExit) as exit_info,
+        ):
+            main([*merge, "--validate"])
+        assert exit_info.value.code == 1
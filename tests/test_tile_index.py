@@ -0,0 +1,115 @@
+"""Unit tests for the static quadkey tile index."""
+
+import json
+import time
+
+import pytest
+
+from overture_stac.tile_index import (
+    bbox_quadkeys,
+    bbox_tile_count,
+    build_tile_index,
+    lat_to_tile_y,
+    lon_to_tile_x,
+    quadkey,
+    write_tile_index,
+)
+from overture_stac.writer import CatalogWriter
+
+
+def _feature(ovt_type: str, rel_path: str, bbox: list[float]) -> dict:
+    return {
+        "type": "Feature",
+        "properties": {"ovt_type": ovt_type, "rel_path": rel_path},
+        "bbox": bbox,
+    }
+
+
+class TestQuadkeys:
+    def test_known_quadkeys(self):
+        # Bing Maps documentation example: tile (3, 5) at zoom 3 is "213".
+        assert quadkey(3, 5, 3) == "213"
+        assert quadkey(0, 0, 1) == "0"
+        assert quadkey(1, 1, 1) == "3"
+
+    def test_tile_coordinates_are_clamped(self):
+        assert lon_to_tile_x(180.0, 2) == 3
+        assert lon_to_tile_x(-180.0, 2) == 0
+        assert lat_to_tile_y(90.0, 2) == 0
+        assert lat_to_tile_y(-90.0, 2) == 3
+
+    def test_bbox_covers_all_intersecting_tiles(self):
+        assert sorted(bbox_quadkeys([-180, -90, 180, 90], 1)) == ["0", "1", "2", "3"]
+        # A small box in the north-east quadrant touches one tile.
+        assert list(bbox_quadkeys([10, 10, 11, 11], 1)) == ["1"]
+
+    def test_bbox_crossing_the_antimeridian(self):
+        # From 170E eastwards to 170W: the last and first columns
+        bbox = [170, 10, -170, 11]
+        assert sorted(bbox_quadkeys(bbox, 2)) == [quadkey(0, 1, 2), quadkey(3, 1, 2)]
+        assert bbox_tile_count(bbox, 2) == 2
+        # The two sides overlap in a column, so every column is covered
+        assert sorted(bbox_quadkeys([50, 10, 10, 11], 1)) == ["0", "1"]
+
+
+class TestBuildTileIndex:
+    def test_paths_grouped_by_tile_and_type(self):
+        features = [
+            _feature("building", "r/b/part-1.parquet", [10, 10, 11, 11]),
+            _feature("building", "r/b/part-0.parquet", [-180, -90, 180, 90]),
+            _feature("place", "r/p/part-0.parquet", [-10, -10, -9, -9]),
+        ]
+        tiles = build_tile_index(features, [1]).tiles
+
+        assert tiles[1]["1"] == {
+            "building": ["r/b/part-0.parquet", "r/b/part-1.parquet"]
+        }
+        assert tiles[1]["2"] == {
+            "building": ["r/b/part-0.parquet"],
+            "place": ["r/p/part-0.parquet"],
+        }
+
+    def test_world_spanning_fragment_is_not_fanned_out(self):
+        features = [
+            _feature("division", "r/d/part-0.parquet", [-180, -90, 180, 90]),
+            _feature("place", "r/p/part-0.parquet", [10, 10, 11, 11]),
+        ]
+        assert bbox_tile_count(features[0]["bbox"], 10) == 1 << 20
+
+        start = time.perf_counter()
+        index = build_tile_index(features, [2, 10])
+        assert time.perf_counter() - start < 1
+
+        # 16 tiles at zoom 2 are few enough to list it in each
+        assert len(index.tiles[2]) == 16
+        assert index.wide[2] == {}
+        assert index.wide[10] == {"division": ["r/d/part-0.parquet"]}
+        assert len(index.tiles[10]) == bbox_tile_count(features[1]["bbox"], 10)
+        assert all(
+            collections == {"place": ["r/p/part-0.parquet"]}
+            for collections in index.tiles[10].values()
+        )
+
+    def test_invalid_zoom_rejected(self):
+        for zoom in (0, 11):
+            with pytest.raises(ValueError):
+                build_tile_index([], [zoom])
+
+
+class TestWriteTileIndex:
+    def test_one_file_per_non_empty_tile(self, tmp_path):
+        features = [_feature("place", "r/p/part-0.parquet", [10, 10, 11, 11])]
+        writer = CatalogWriter(tmp_path)
+        assert write_tile_index(writer, "2026-08-05.0", features, zooms=(1, 2)) == 2
+        writer.finalize()
+
+        tiles = tmp_path / "2026-08-05.0" / "tiles"
+        assert json.loads((tiles / "1" / "1.json").read_text()) == {
+            "zoom": 1,
+            "quadkey": "1",
+            "collections": {"place": ["r/p/part-0.parquet"]},
+        }
+        assert not (tiles / "1" / "0.json").exists()
+        index = json.loads((tiles / "index.json").read_text())
+        assert index["zooms"] == {"1": 1, "2": 1}
+        assert index["wide"] == {}
@@ -0,0 +1,130 @@
+"""Tests for offline, parallel STAC validation."""
+
+import json
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from overture_stac.cli import main
+from overture_stac.overture_stac import TABLE_EXTENSION
+from overture_stac.validate import (
+    SCHEMA_DIR,
+    SCHEMA_URLS,
+    STAC_SCHEMA_ROOT,
+    schema_path,
+    schema_validator,
+    validate_catalog,
+    validate_object,
+    validate_output,
+)
+from overture_stac.writer import CatalogWriter
+from tests.test_writer import _make_release_catalog
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    writer = CatalogWriter(tmp_path)
+    writer.save_catalog(
+        _make_release_catalog(), "ABSOLUTE_PUBLISHED", rel_dir="2026-08-05.0"
+    )
+    writer.write_json("2026-08-05.0/tiles/index.json", {"zooms": {}})
+    writer.finalize()
+    return tmp_path
+
+
+def item_path(root):
+    return root / "2026-08-05.0" / "place" / "00000" / "00000.json"
+
+
+class TestValidate:
+    def test_core_schemas_are_vendored(self):
+        core = [url for url in SCHEMA_URLS if "stac-extensions" not in url]
+
+        assert [url for url in core if not schema_path(url).is_file()] == []
+
+    def test_extensions_are_checked(self, tmp_path):
+        schema_dir = tmp_path / "schemas"
+        shutil.copytree(SCHEMA_DIR, schema_dir)
+        schema_file = schema_path(TABLE_EXTENSION, schema_dir)
+        schema_file.parent.mkdir(parents=True, exist_ok=True)
+        schema_file.write_text(
+            json.dumps(
+                {"properties": {"table:row_count": {"type": "integer", "minimum": 0}}}
+            )
+        )
+        collection = next(_make_release_catalog().get_children()).to_dict()
+        collection["stac_extensions"] = [TABLE_EXTENSION]
+        collection["table:row_count"] = -1
+
+        schema_validator.cache_clear()
+        try:
+            with patch("overture_stac.validate.SCHEMA_DIR", schema_dir):
+                report = validate_object(collection, "collection.json")
+        finally:
+            schema_validator.cache_clear()
+
+        ((_, message),) = report.errors
+        assert message.startswith(TABLE_EXTENSION)
+
+    def test_valid_catalog(self):
+        report = validate_catalog(_make_release_catalog())
+
+        assert report.objects == 3
+        assert report.errors == ()
+
+    def test_invalid_item(self):
+        item = next(_make_release_catalog().get_items(recursive=True)).to_dict()
+        item["bbox"] = "everywhere"
+
+        report = validate_object(item, "00000.json")
+
+        assert report.objects == 1
+        ((name, message),) = report.errors
+        assert name == "00000.json"
+        assert "item.json" in message and "bbox" in message
+
+    def test_unvendored_extension_is_unchecked(self):
+        item = next(_make_release_catalog().get_items(recursive=True)).to_dict()
+        url = "https://stac-extensions.github.io/unknown/v1.0.0/schema.json"
+        item["stac_extensions"] = [url]
+
+        report = validate_object(item, "00000.json")
+
+        assert report.errors == ()
+        assert report.unchecked == {url}
+
+    def test_unvendored_core_schema_fails(self):
+        item = next(_make_release_catalog().get_items(recursive=True)).to_dict()
+        item["stac_version"] = "0.0.1"
+        url = f"{STAC_SCHEMA_ROOT.format(version='0.0.1')}/item-spec/json-schema/item.json"
+
+        report = validate_object(item, "00000.json")
+
+        assert report.errors == (("00000.json", f"{url}: no vendored schema"),)
+
+    def test_not_stac_json_is_skipped(self):
+        assert validate_object({"zooms": {}}, "tiles/index.json").objects == 0
+
+    @patch("urllib.request.urlopen", side_effect=AssertionError("network access"))
+    def test_output_offline_and_in_parallel(self, _urlopen, catalog_dir):
+        item = json.loads(item_path(catalog_dir).read_text())
+        item["bbox"] = "everywhere"
+        item_path(catalog_dir).write_text(json.dumps(item))
+
+        serial = validate_output(catalog_dir, workers=1)
+        parallel = validate_output(str(catalog_dir), workers=2)
+
+        assert serial == parallel
+        assert serial.objects == 3
+        assert [name for name, _ in serial.errors] == [
+            "2026-08-05.0/place/00000/00000.json"
+        ]
+
+    def test_cli_exit_status(self, catalog_dir):
+        main(["validate", "--output", str(catalog_dir), "--workers", "1"])
+
+        item_path(catalog_dir).write_text("{not json")
+        with pytest.raises(SystemExit) as exit_info:
+            main(["validate", "--output", str(catalog_dir), "--workers", "1"])
+        assert exit_info.value.code == 1
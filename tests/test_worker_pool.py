@@ -0,0 +1,81 @@
+"""Tests and a per-task overhead benchmark for the warm worker pool."""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from overture_stac import overture_stac
+from overture_stac.overture_stac import (
+    init_worker,
+    make_worker_pool,
+    worker_filesystem,
+)
+
+REGION = "us-west-2"
+
+
+@pytest.fixture
+def clean_worker_state():
+    yield
+    overture_stac._worker_filesystems.clear()
+
+
+class TestWorkerFilesystem:
+    def test_initializer_filesystem_is_reused(self, clean_worker_state):
+        init_worker(REGION)
+        assert worker_filesystem(REGION) is worker_filesystem(REGION)
+
+    def test_outside_a_pool_each_call_gets_a_new_filesystem(self):
+        assert worker_filesystem(REGION) is not worker_filesystem(REGION)
+
+
+class TestWorkerPool:
+    def test_workers_are_long_lived(self):
+        with make_worker_pool(1) as pool:
+            pids = {pool.submit(os.getpid).result() for _ in range(4)}
+        assert len(pids) == 1
+
+    @pytest.mark.skipif(
+        "forkserver" not in multiprocessing.get_all_start_methods(),
+        reason="forkserver is not available on this platform",
+    )
+    def test_uses_forkserver(self):
+        with make_worker_pool(1) as pool:
+            assert pool._mp_context.get_start_method() == "forkserver"
+
+
+def _per_task_seconds(rounds: int, workers: int, shared_pool: bool) -> float:
+    """Mean wall time per task when every round is one release's themes."""
+    start = time.perf_counter()
+    if shared_pool:
+        with make_worker_pool(workers, REGION) as pool:
+            for _ in range(rounds):
+                list(pool.map(worker_filesystem, [REGION] * workers))
+    else:
+        # The previous behavior: a fresh spawned pool per release, and a new
+        # filesystem in every task.
+        context = multiprocessing.get_context("spawn")
+        for _ in range(rounds):
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                list(pool.map(worker_filesystem, [REGION] * workers))
+    return (time.perf_counter() - start) / (rounds * workers)
+
+
+@pytest.mark.slow
+class TestWorkerPoolBenchmark:
+    def test_warm_pool_lowers_per_task_overhead(self):
+        rounds, workers = 4, 2
+        # Start the forkserver so both sides are measured from a warm parent.
+        with make_worker_pool(1) as pool:
+            pool.submit(os.getpid).result()
+
+        before = _per_task_seconds(rounds, workers, shared_pool=False)
+        after = _per_task_seconds(rounds, workers, shared_pool=True)
+        print(
+            f"\nper-task overhead: {before * 1000:.1f} ms with a spawned pool per "
+            f"release, {after * 1000:.1f} ms with one warm pool"
+        )
+        assert after < before
@@ -0,0 +1,322 @@
+"""Unit tests for CatalogWriter's skip-unchanged writes and changed-paths output."""
+
+import gzip
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.fs as fs
+import pystac
+import pytest
+import stac_geoparquet
+
+from overture_stac.cli import main
+from overture_stac.overture_stac import build_root_catalog
+from overture_stac.writer import (
+    CHANGED_PATHS_FILENAME,
+    CONTENT_HASHES_FILENAME,
+    CatalogWriter,
+    content_hash,
+    is_object_store_uri,
+    load_previous_hashes,
+)
+
+ROOT = "https://stac.overturemaps.org"
+
+
+def _changed_paths(root) -> list[str]:
+    return (root / CHANGED_PATHS_FILENAME).read_text().splitlines()
+
+
+def _make_release_catalog() -> pystac.Catalog:
+    catalog = pystac.Catalog(id="2026-08-05.0", description="release")
+    collection = pystac.Collection(
+        id="place",
+        description="places",
+        extent=pystac.Extent(
+            spatial=pystac.SpatialExtent(bboxes=[[0.0, 0.0, 1.0, 1.0]]),
+            temporal=pystac.TemporalExtent(intervals=[[None, None]]),
+        ),
+    )
+    item = pystac.Item(
+        id="00000",
+        geometry={
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+        },
+        bbox=[0.0, 0.0, 1.0, 1.0],
+        datetime=datetime(2026, 8, 5),
+        properties={"num_rows": 10},
+    )
+    item.add_asset("aws", pystac.Asset(href="https://example.com/part-00000.parquet"))
+    collection.add_item(item)
+    catalog.add_child(collection)
+    catalog.normalize_hrefs(f"{ROOT}/2026-08-05.0/")
+    return catalog
+
+
+class TestCatalogWriter:
+    def test_first_write_is_changed(self, tmp_path):
+        writer = CatalogWriter(tmp_path)
+        assert writer.write_text("a/b.json", "{}").result() is True
+        assert (tmp_path / "a" / "b.json").read_text() == "{}"
+        assert writer.finalize() == ["a/b.json"]
+        assert _changed_paths(tmp_path) == ["a/b.json"]
+
+    def test_identical_file_on_disk_is_left_untouched(self, tmp_path):
+        CatalogWriter(tmp_path).write_text("x.json", "{}").result()
+        mtime = (tmp_path / "x.json").stat().st_mtime_ns
+
+        writer = CatalogWriter(tmp_path)
+        assert writer.write_text("x.json", "{}").result() is False
+        assert (tmp_path / "x.json").stat().st_mtime_ns == mtime
+        assert writer.finalize() == []
+        assert writer.unchanged == 1
+
+    def test_modified_file_is_rewritten(self, tmp_path):
+        CatalogWriter(tmp_path).write_text("x.json", "{}").result()
+        writer = CatalogWriter(tmp_path)
+        assert writer.write_text("x.json", '{"a": 1}').result() is True
+        assert (tmp_path / "x.json").read_text() == '{"a": 1}'
+
+    def test_previous_hashes_used_for_fresh_output_dir(self, tmp_path):
+        """A fresh CI workspace still gets the file, but it isn't reported changed."""
+        writer = CatalogWriter(
+            tmp_path, previous_hashes={"x.json": content_hash(b"{}")}
+        )
+        assert writer.write_text("x.json", "{}").result() is False
+        assert (tmp_path / "x.json").exists()
+        assert writer.finalize() == []
+
+    def test_missing_files_pruned_on_full_rebuild(self, tmp_path):
+        previous = {"gone.json": "abc", "kept.json": content_hash(b"{}")}
+        writer = CatalogWriter(tmp_path, previous_hashes=previous)
+        writer.write_text("kept.json", "{}")
+        assert writer.finalize(prune_missing=True) == ["gone.json"]
+        hashes = json.loads((tmp_path / CONTENT_HASHES_FILENAME).read_text())
+        assert set(hashes) == {"kept.json"}
+
+    def test_missing_files_carried_over_on_partial_rebuild(self, tmp_path):
+        writer = CatalogWriter(tmp_path, previous_hashes={"other.json": "abc"})
+        writer.write_text("kept.json", "{}")
+        assert writer.finalize(prune_missing=False) == ["kept.json"]
+        hashes = json.loads((tmp_path / CONTENT_HASHES_FILENAME).read_text())
+        assert hashes["other.json"] == "abc"
+
+    def test_saved_catalog_tree_is_tracked(self, tmp_path):
+        writer = CatalogWriter(tmp_path)
+        writer.save_catalog(
+            _make_release_catalog(),
+            catalog_type=pystac.CatalogType.ABSOLUTE_PUBLISHED,
+            rel_dir="2026-08-05.0",
+        )
+        assert writer.finalize() == [
+            "2026-08-05.0/catalog.json",
+            "2026-08-05.0/place/00000/00000.json",
+            "2026-08-05.0/place/collection.json",
+        ]
+
+    def test_rebuilding_same_catalog_reports_nothing_changed(self, tmp_path):
+        for _ in range(2):
+            writer = CatalogWriter(tmp_path)
+            writer.save_catalog(
+                _make_release_catalog(),
+                catalog_type=pystac.CatalogType.ABSOLUTE_PUBLISHED,
+                rel_dir="2026-08-05.0",
+            )
+            build_root_catalog(tmp_path, ROOT, ["2026-08-05.0"], writer=writer)
+            changed = writer.finalize()
+        assert changed == []
+
+    def test_load_previous_hashes_missing_file_returns_none(self, tmp_path):
+        assert load_previous_hashes(str(tmp_path / "nope.json")) is None
+
+    def test_load_previous_hashes_round_trips(self, tmp_path):
+        writer = CatalogWriter(tmp_path)
+        writer.write_text("x.json", "{}")
+        writer.finalize()
+        loaded = load_previous_hashes(str(tmp_path / CONTENT_HASHES_FILENAME))
+        assert loaded == {"x.json": content_hash(b"{}")}
+
+
+class TestCatalogWriterFileSystems:
+    """The writer targets any pyarrow filesystem, not just local disk."""
+
+    def test_uri_output_resolves_to_local_filesystem(self, tmp_path):
+        writer = CatalogWriter(tmp_path.as_uri())
+        writer.write_text("a.json", "{}").result()
+        writer.finalize()
+        assert (tmp_path / "a.json").read_text() == "{}"
+
+    def test_catalog_saved_to_non_local_filesystem(self):
+        mock_fs = fs._MockFileSystem()
+        writer = CatalogWriter("bucket/stac", filesystem=mock_fs)
+        writer.save_catalog(
+            _make_release_catalog(),
+            catalog_type=pystac.CatalogType.ABSOLUTE_PUBLISHED,
+            rel_dir="2026-08-05.0",
+        )
+        writer.finalize()
+
+        info = mock_fs.get_file_info("bucket/stac/2026-08-05.0/catalog.json")
+        assert info.type == fs.FileType.File
+        with mock_fs.open_input_stream("bucket/stac/changed-paths.txt") as f:
+            assert b"2026-08-05.0/place/collection.json" in f.read()
+
+    def test_changed_stream_on_object_store_is_reported(self):
+        mock_fs = fs._MockFileSystem()
+
+        def publish(manifest, previous_hashes) -> tuple[bool, list[str]]:
+            writer = CatalogWriter(
+                "bucket/stac", filesystem=mock_fs, previous_hashes=previous_hashes
+            )
+            # Streams go straight to the destination, as on S3
+            writer.is_object_store = True
+            changed = writer.write_json_stream("m.geojson", manifest).result()
+            return changed, writer.finalize(), writer.hashes
+
+        manifest = {"type": "FeatureCollection", "features": []}
+        changed, paths, hashes = publish(manifest, None)
+        assert (changed, paths) == (True, ["m.geojson"])
+        assert publish(manifest, hashes)[:2] == (False, [])
+        manifest["features"].append({"id": 1})
+        assert publish(manifest, hashes)[:2] == (True, ["m.geojson"])
+
+    def test_object_store_is_not_read_back(self):
+        writer = CatalogWriter("bucket/stac", filesystem=fs._MockFileSystem())
+        writer.is_object_store = True
+
+        with patch.object(
+            CatalogWriter, "_existing_hash", side_effect=AssertionError("read back")
+        ):
+            writer.write_text("a.json", "{}").result()
+            writer.write_json_stream("m.geojson", {}).result()
+
+        # Without a previous hash, every file counts as changed
+        assert writer.finalize() == ["a.json", "m.geojson"]
+
+    def test_object_store_output_requires_previous_hashes(self, tmp_path):
+        assert is_object_store_uri("s3://bucket/stac")
+        assert not is_object_store_uri(tmp_path.as_uri())
+        assert not is_object_store_uri(str(tmp_path))
+
+        with pytest.raises(SystemExit) as exit_info:
+            main(["--output", "s3://bucket/stac"])
+        assert exit_info.value.code == 2
+
+    def test_streamed_outputs_round_trip(self, tmp_path):
+        catalog = _make_release_catalog()
+        item = next(catalog.get_items(recursive=True))
+        manifest = {
+            "type": "FeatureCollection",
+            "features": [{"id": i} for i in range(5)],
+        }
+
+        writer = CatalogWriter(tmp_path)
+        assert writer.write_json_stream("r/manifest.geojson", manifest).result()
+        assert writer.write_parquet(
+            "r/collections.parquet",
+            stac_geoparquet.arrow.parse_stac_items_to_arrow([item]),
+        ).result()
+        writer.finalize()
+
+        assert json.loads((tmp_path / "r" / "manifest.geojson").read_text()) == manifest
+        assert (tmp_path / "r" / "collections.parquet").stat().st_size > 0
+        assert not list((tmp_path / "r").glob("*.tmp-*"))
+
+    def test_unchanged_stream_leaves_file_untouched(self, tmp_path):
+        manifest = {"type": "FeatureCollection", "features": []}
+        CatalogWriter(tmp_path).write_json_stream("m.geojson", manifest).result()
+        mtime = (tmp_path / "m.geojson").stat().st_mtime_ns
+
+        writer = CatalogWriter(tmp_path)
+        assert writer.write_json_stream("m.geojson", manifest).result() is False
+        assert (tmp_path / "m.geojson").stat().st_mtime_ns == mtime
+        assert not list(tmp_path.glob("*.tmp-*"))
+
+    def test_compressed_ndjson_stream(self, tmp_path):
+        records = [{"id": i} for i in range(3)]
+        writer = CatalogWriter(tmp_path)
+        assert writer.write_ndjson_stream(
+            "r.ndjson.zst", iter(records), "zstd"
+        ).result()
+        writer.flush()
+
+        with pa.input_stream(str(tmp_path / "r.ndjson.zst"), compression="zstd") as f:
+            lines = f.read().decode().splitlines()
+        assert [json.loads(line) for line in lines] == records
+        # The hash is of the stored, compressed bytes
+        assert writer.hashes["r.ndjson.zst"] == content_hash(
+            (tmp_path / "r.ndjson.zst").read_bytes()
+        )
+        rewrite = CatalogWriter(tmp_path)
+        assert rewrite.write_ndjson_stream(
+            "r.ndjson.zst", records, "zstd"
+        ).result() is (False)
+
+    def test_write_errors_surface_on_flush(self, tmp_path):
+        (tmp_path / "blocker").write_text("not a directory")
+        writer = CatalogWriter(tmp_path)
+        writer.write_text("blocker/x.json", "{}")
+        with pytest.raises(OSError):
+            writer.flush()
+
+
+class TestPrecompressedSidecars:
+    def test_json_outputs_get_gzip_and_brotli_sidecars(self, tmp_path):
+        text = json.dumps({"storage:schemes": {"aws": "x" * 200}})
+        writer = CatalogWriter(tmp_path, precompress=("gzip", "br"))
+        writer.write_text("item.json", text).result()
+
+        assert gzip.decompress((tmp_path / "item.json.gz").read_bytes()) == (
+            text.encode()
+        )
+        assert (
+            pa.decompress(
+                (tmp_path / "item.json.br").read_bytes(),
+                decompressed_size=len(text),
+                codec="brotli",
+                asbytes=True,
+            )
+            == text.encode()
+        )
+        assert sorted(writer.finalize()) == [
+            "item.json",
+            "item.json.br",
+            "item.json.gz",
+        ]
+
+    def test_streamed_json_gets_sidecars(self, tmp_path):
+        manifest = {"type": "FeatureCollection", "features": [{"id": 1}] * 100}
+        writer = CatalogWriter(tmp_path, precompress=("gzip",))
+        writer.write_json_stream("m.geojson", manifest).result()
+        assert json.loads(
+            gzip.decompress((tmp_path / "m.geojson.gz").read_bytes())
+        ) == (manifest)
+
+    def test_parquet_and_text_outputs_are_not_precompressed(self, tmp_path):
+        writer = CatalogWriter(tmp_path, precompress=("gzip",))
+        writer.write_text("notes.txt", "hello").result()
+        assert not (tmp_path / "notes.txt.gz").exists()
+
+    def test_unchanged_sidecars_are_not_reported(self, tmp_path):
+        for _ in range(2):
+            writer = CatalogWriter(tmp_path, precompress=("gzip", "br"))
+            writer.write_text("item.json", '{"a": 1}')
+            writer.write_json_stream("m.geojson", {"features": []})
+            changed = writer.finalize()
+        assert changed == []
+
+    def test_sidecars_carry_content_encoding_on_object_stores(self):
+        mock_fs = fs._MockFileSystem()
+        writer = CatalogWriter("bucket/stac", filesystem=mock_fs, precompress=("br",))
+        writer.write_text("catalog.json", "{}").result()
+        with mock_fs.open_input_stream("bucket/stac/catalog.json.br") as f:
+            metadata = f.metadata()
+        assert metadata["Content-Encoding"] == b"br"
+        assert metadata["Content-Type"] == b"application/json"
+
+    def test_unknown_encoding_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            CatalogWriter(tmp_path, precompress=("lzma",))